@@ -0,0 +1,85 @@
+"""Benchmark of the memory allocated to sample the files, a batch of files is
+validated once with a buffer pool that keeps no buffer, so the head and the
+tail of every file are read into a new buffer, and once with the shared buffer
+pool, and the bytes that tracemalloc sees allocated while every file is
+validated are added together.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.buffer_pool --number 10000
+"""
+import argparse
+import os
+import tracemalloc
+
+from file_validator.buffer_pool import BufferPool, set_buffer_pool
+from file_validator.constants import FILETYPE, NATIVE
+from file_validator.validators import FileValidator
+
+FILES_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "files",
+)
+SAMPLE_FILES: dict = {
+    "test.png": "image/png",
+    "test.jpg": "image/jpeg",
+    "test.mp4": "video/mp4",
+}
+
+
+def validate_files(number: int):
+    """Validates the sample files number times in turn."""
+    files = [
+        (os.path.join(FILES_DIRECTORY, file_name), file_mime)
+        for file_name, file_mime in SAMPLE_FILES.items()
+    ]
+    for index in range(number):
+        file_path, file_mime = files[index % len(files)]
+        FileValidator(
+            file_path=file_path,
+            libraries=[FILETYPE, NATIVE],
+            acceptable_mimes=[file_mime],
+        ).run_validation()
+
+
+def measure(buffer_pool: BufferPool, number: int) -> tuple:
+    """Returns the bytes allocated while the files are validated and the
+    number of buffers that the pool created."""
+    set_buffer_pool(buffer_pool)
+    # One batch before measuring, so the libraries are imported.
+    validate_files(len(SAMPLE_FILES))
+    buffer_pool.buffers_created = 0
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(number):
+        current, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        validate_files(1)
+        _current, peak = tracemalloc.get_traced_memory()
+        allocated += peak - current
+    tracemalloc.stop()
+    return allocated, buffer_pool.buffers_created
+
+
+def main():
+    """Prints the memory allocated to sample the files with and without
+    reusing the buffers."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10000)
+    arguments = parser.parse_args()
+    results = (
+        ("new", *measure(BufferPool(max_buffers=0), arguments.number)),
+        ("pooled", *measure(BufferPool(), arguments.number)),
+    )
+    print(f"{'buffers':<10}{'allocated (MB)':>16}{'per file (B)':>16}{'created':>10}")
+    for name, allocated, created in results:
+        print(
+            f"{name:<10}{allocated / 1e6:>16.1f}"
+            f"{allocated / arguments.number:>16.0f}{created:>10}",
+        )
+    print(f"pooled buffers allocate {results[1][1] / results[0][1]:.0%} of the bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark of the import time of file validator, every import runs in a new
+interpreter, the time of an empty interpreter is subtracted, and the libraries
+that are loaded by the import are listed, with --max-ms the benchmark fails if
+the import is slower, so it can guard the import time in CI.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.import_time --repeat 20 --max-ms 60
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIRECTORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES: list = [
+    "file_validator.validators",
+    "file_validator.batch",
+    "file_validator.models",
+]
+LAZY_MODULES: list = [
+    "django",
+    "magic",
+    "puremagic",
+    "filetype",
+    "dotenv",
+    "humanize",
+    "termcolor",
+]
+
+
+def run_python(code: str) -> float:
+    """Runs the code in a new interpreter and returns the seconds it took."""
+    environment = dict(os.environ)
+    environment.pop("DJANGO_SETTINGS_MODULE", None)
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        cwd=PROJECT_DIRECTORY,
+        env=environment,
+    )
+    return time.perf_counter() - start
+
+
+def get_loaded_libraries(module: str) -> list:
+    """Returns the libraries that are loaded when the module is imported."""
+    completed_process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\nimport {module}\n"
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=PROJECT_DIRECTORY,
+        text=True,
+    )
+    return [name for name in completed_process.stdout.strip().split(",") if name]
+
+
+def main():
+    """Prints the median import time of every module."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None)
+    arguments = parser.parse_args()
+    empty = statistics.median(run_python("pass") for _ in range(arguments.repeat))
+    print(f"{'module':<28}{'median (ms)':>14}  libraries loaded")
+    is_too_slow = False
+    for module in MODULES:
+        seconds = statistics.median(
+            run_python(f"import {module}") for _ in range(arguments.repeat)
+        )
+        milliseconds = max(seconds - empty, 0) * 1000
+        libraries = ", ".join(get_loaded_libraries(module)) or "-"
+        print(f"{module:<28}{milliseconds:>14.1f}  {libraries}")
+        if (
+            module == MODULES[0]
+            and arguments.max_ms is not None
+            and milliseconds > arguments.max_ms
+        ):
+            is_too_slow = True
+    if is_too_slow:
+        print(f"{MODULES[0]} is slower than {arguments.max_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark of the native detection engine, the same files are validated with
+libraries=["native"] and with validate, which runs filetype, mimetypes,
+puremagic and python-magic, the content is in memory so only the detection is
+measured.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.native_detection --number 2000
+"""
+import argparse
+import os
+import timeit
+
+from file_validator.constants import NATIVE
+from file_validator.validators import FileValidator
+
+FILES_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "files",
+)
+# The files that every library of validate accepts with a single mime.
+FILES: dict = {
+    "test.png": "image/png",
+    "test.jpg": "image/jpeg",
+    "test.mp4": "video/mp4",
+}
+
+
+def validate_with_native(data: bytes, file_name: str, mime: str):
+    """Validates the content with the native detection engine."""
+    FileValidator.from_bytes(
+        data,
+        file_name=file_name,
+        libraries=[NATIVE],
+        acceptable_mimes=[mime],
+    ).run_validation()
+
+
+def validate_with_all_libraries(data: bytes, file_name: str, mime: str):
+    """Validates the content with all the libraries."""
+    FileValidator.from_bytes(
+        data,
+        file_name=file_name,
+        acceptable_mimes=[mime],
+    ).validate()
+
+
+def main():
+    """Prints the time of one validation with both modes and the speedup."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    arguments = parser.parse_args()
+    print(f"{'file':<12}{'validate (us)':>16}{'native (us)':>16}{'speedup':>10}")
+    for file_name, mime in FILES.items():
+        with open(os.path.join(FILES_DIRECTORY, file_name), "rb") as file:
+            data = file.read()
+        timings = []
+        for validate_file in (validate_with_all_libraries, validate_with_native):
+            validate_file(data, file_name, mime)
+            seconds = timeit.timeit(
+                lambda: validate_file(data, file_name, mime),  # noqa: B023
+                number=arguments.number,
+            )
+            timings.append(seconds / arguments.number * 1e6)
+        print(
+            f"{file_name:<12}{timings[0]:>16.1f}{timings[1]:>16.1f}"
+            f"{timings[0] / timings[1]:>9.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
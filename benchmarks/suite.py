@@ -0,0 +1,357 @@
+"""Benchmark suite of file validator, every library of FileValidator, validate,
+validate_type, validate_size and the Django paths DjangoFileValidator and
+ValidatedFileField.clean are timed on the sample files of tests/files and on
+synthetic files from 1 KB to 1 GB, for every case the throughput, the p50 and
+p99 latency and the bytes read from the disk per file are reported, and with
+--json the results are written as json, so two releases can be compared with
+--compare.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.suite --sizes 1KB,1MB,100MB,1GB --json results.json
+    python -m benchmarks.suite --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from file_validator import __version__
+from file_validator.constants import FILETYPE, MIMETYPES, PURE_MAGIC, PYTHON_MAGIC
+from file_validator.validators import FileValidator
+
+FILES_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests",
+    "files",
+)
+# Every mime that one of the libraries guesses for the file is acceptable, so
+# the path of a valid file is measured.
+SAMPLE_FILES: dict = {
+    "test.png": (["image/png"], "image"),
+    "test.jpg": (["image/jpeg"], "image"),
+    "test.mp3": (["audio/mpeg", "application/octet-stream"], "audio"),
+    "test.mp4": (["video/mp4"], "video"),
+    "test.ttf": (["font/ttf", "font/sfnt", "application/font-sfnt"], "font"),
+    "test.zip": (
+        [
+            "application/zip",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        ],
+        "archive",
+    ),
+}
+# The synthetic files are a png header padded with zeros, the padding is a
+# hole in a sparse file, so even the 1 GB file takes no space on the disk.
+SYNTHETIC_HEADER_FILE: str = "test.png"
+SIZE_UNITS: dict = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+DEFAULT_SIZES: str = "1KB,1MB,100MB,1GB"
+VALIDATOR_TARGETS: dict = {
+    FILETYPE: "filetype",
+    MIMETYPES: "mimetypes",
+    PURE_MAGIC: "pure_magic",
+    PYTHON_MAGIC: "python_magic",
+    "validate": "validate",
+    "validate_type": "validate_type",
+    "validate_size": "validate_size",
+}
+DJANGO_TARGETS: list = ["django_file_validator", "validated_file_field"]
+# pure_magic finds the font but not its mime, so every target that runs
+# pure_magic rejects it, these cases are skipped instead of measuring the
+# rejection, the other cases must validate or the run fails.
+SKIPPED_CASES: dict = {
+    "test.ttf": {
+        PURE_MAGIC: "pure_magic finds no mime for the font",
+        "validate": "validate runs pure_magic, which finds no mime for the font",
+        "django_file_validator": "all runs pure_magic, which finds no font mime",
+        "validated_file_field": "all runs pure_magic, which finds no font mime",
+    },
+}
+
+
+def parse_size(size: str) -> int:
+    """Returns the number of bytes of a size such as 1KB or 100MB."""
+    size = size.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * SIZE_UNITS[unit])
+    return int(size)
+
+
+def get_bytes_read():
+    """Returns the number of bytes this process has read with system calls,
+    or None if the platform does not report it."""
+    try:
+        with open("/proc/self/io", encoding="utf-8") as io_file:
+            for line in io_file:
+                if line.startswith("rchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def percentile(latencies: list, fraction: float) -> float:
+    """Returns the percentile of the sorted latencies with the nearest-rank
+    method."""
+    index = max(0, min(len(latencies) - 1, round(fraction * len(latencies)) - 1))
+    return latencies[index]
+
+
+def create_synthetic_files(directory: str, sizes: list) -> list:
+    """Creates the synthetic files of the sizes, such as 1KB, and returns
+    their name, path, size, mimes and type."""
+    with open(os.path.join(FILES_DIRECTORY, SYNTHETIC_HEADER_FILE), "rb") as file:
+        header = file.read()
+    mimes, file_type = SAMPLE_FILES[SYNTHETIC_HEADER_FILE]
+    files = []
+    for label in sizes:
+        size = parse_size(label)
+        file_name = f"synthetic-{label.strip().upper()}.png"
+        file_path = os.path.join(directory, file_name)
+        with open(file_path, "wb") as file:
+            file.write(header[:size])
+            file.truncate(size)
+        files.append((file_name, file_path, size, mimes, file_type))
+    return files
+
+
+def get_sample_files() -> list:
+    """Returns the name, path, size, mimes and type of the sample files."""
+    files = []
+    for file_name, (mimes, file_type) in SAMPLE_FILES.items():
+        file_path = os.path.join(FILES_DIRECTORY, file_name)
+        files.append(
+            (file_name, file_path, os.path.getsize(file_path), mimes, file_type),
+        )
+    return files
+
+
+def get_validator_case(target: str, file_path: str, size: int, mimes, file_type):
+    """Returns a function that runs one method of a new file validator."""
+    method_name = VALIDATOR_TARGETS[target]
+    settings = {
+        "file_path": file_path,
+        "acceptable_mimes": mimes,
+        "acceptable_types": [file_type],
+        "max_upload_file_size": size,
+    }
+
+    def run_case():
+        getattr(FileValidator(**settings), method_name)()
+
+    return run_case
+
+
+def setup_django():
+    """Configures django with the minimal settings if it is not configured,
+    returns False if django is not installed."""
+    # pylint: disable=import-outside-toplevel
+    try:
+        import django
+        from django.conf import settings
+    except ImportError:
+        return False
+    if not settings.configured:
+        settings.configure(USE_TZ=True)
+    django.setup()
+    return True
+
+
+def get_django_case(target: str, file_path: str, size: int, mimes, file_type):
+    """Returns a function that validates an uploaded file the way django does
+    for a model field, the file is opened once and rewound for every run."""
+    # pylint: disable=import-outside-toplevel
+    from django.core.files.uploadedfile import UploadedFile
+    from django.db.models.fields.files import FieldFile
+
+    from file_validator.models import DjangoFileValidator, ValidatedFileField
+
+    settings = {
+        "acceptable_mimes": mimes,
+        "acceptable_types": [file_type],
+        "max_upload_file_size": size,
+    }
+    field = ValidatedFileField(**settings)
+    field.name = "benchmark_file"
+    validator = DjangoFileValidator(**settings)
+    file = open(file_path, "rb")  # pylint: disable=consider-using-with
+    uploaded_file = UploadedFile(
+        file=file,
+        name=os.path.basename(file_path),
+        content_type=mimes[0],
+        size=size,
+    )
+    field_file = FieldFile(None, field, uploaded_file.name)
+    field_file.file = uploaded_file
+    field_file._committed = False  # pylint: disable=protected-access
+
+    def run_case():
+        file.seek(0)
+        if target == "django_file_validator":
+            validator(field_file)
+        else:
+            field.clean(field_file, None)
+
+    run_case.close = file.close
+    return run_case
+
+
+def measure(run_case, size: int, min_time: float, min_runs: int, max_runs: int):
+    """Runs the case until it ran for min_time seconds or max_runs times, and
+    at least min_runs times, and returns its statistics, an error of the case
+    is raised."""
+    latencies = []
+    bytes_before = get_bytes_read()
+    started_at = time.perf_counter()
+    while len(latencies) < max_runs and (
+        len(latencies) < min_runs or time.perf_counter() - started_at < min_time
+    ):
+        run_started_at = time.perf_counter()
+        run_case()
+        latencies.append(time.perf_counter() - run_started_at)
+    total = sum(latencies)
+    bytes_after = get_bytes_read()
+    latencies.sort()
+    return {
+        "runs": len(latencies),
+        "files_per_second": len(latencies) / total,
+        "mb_per_second": size * len(latencies) / total / 1e6,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "bytes_read": (bytes_after - bytes_before) // len(latencies)
+        if bytes_before is not None and bytes_after is not None
+        else None,
+    }
+
+
+def run_suite(arguments) -> list:
+    """Runs every target on every file and returns the results, a case that
+    does not validate fails the run."""
+    targets = arguments.targets or list(VALIDATOR_TARGETS) + DJANGO_TARGETS
+    if any(target in DJANGO_TARGETS for target in targets) and not setup_django():
+        print("django is not installed, the django targets are skipped")
+        targets = [target for target in targets if target not in DJANGO_TARGETS]
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        files = get_sample_files() if not arguments.no_samples else []
+        files += create_synthetic_files(
+            directory,
+            [size for size in arguments.sizes.split(",") if size],
+        )
+        for file_name, file_path, size, mimes, file_type in files:
+            for target in targets:
+                reason = SKIPPED_CASES.get(file_name, {}).get(target)
+                if reason is not None:
+                    print_skipped(target, file_name, reason)
+                    continue
+                get_case = (
+                    get_django_case if target in DJANGO_TARGETS else get_validator_case
+                )
+                run_case = get_case(target, file_path, size, mimes, file_type)
+                try:
+                    # One run before measuring, so the libraries are imported
+                    # and the file is in the page cache.
+                    run_case()
+                    result = measure(
+                        run_case,
+                        size,
+                        arguments.min_time,
+                        arguments.min_runs,
+                        arguments.max_runs,
+                    )
+                except Exception as error:
+                    raise RuntimeError(
+                        f"{target} does not validate {file_name}: {error}",
+                    ) from error
+                finally:
+                    getattr(run_case, "close", lambda: None)()
+                result.update({"target": target, "file": file_name, "size": size})
+                results.append(result)
+                print_result(result)
+    return results
+
+
+def print_header():
+    """Prints the header of the table."""
+    print(
+        f"{'target':<24}{'file':<26}{'files/s':>11}{'MB/s':>11}"
+        f"{'p50 (ms)':>11}{'p99 (ms)':>11}{'bytes read':>14}",
+    )
+
+
+def print_result(result: dict):
+    """Prints a row of the table."""
+    bytes_read = result["bytes_read"] if result["bytes_read"] is not None else "-"
+    print(
+        f"{result['target']:<24}{result['file']:<26}"
+        f"{result['files_per_second']:>11.1f}{result['mb_per_second']:>11.1f}"
+        f"{result['p50_ms']:>11.3f}{result['p99_ms']:>11.3f}{bytes_read:>14}",
+    )
+
+
+def print_skipped(target: str, file_name: str, reason: str):
+    """Prints a row of the table for a case that is skipped and why."""
+    print(f"{target:<24}{file_name:<26}  SKIPPED, {reason}")
+
+
+def compare(results: list, baseline_path: str):
+    """Prints the p50 latency of every case against the same case of a
+    previous json output."""
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    baseline_results = {
+        (result["target"], result["file"]): result for result in baseline["results"]
+    }
+    print(f"\ncompared with {baseline['version']} ({baseline_path})")
+    print(f"{'target':<24}{'file':<26}{'p50 before':>12}{'p50 now':>12}{'change':>9}")
+    for result in results:
+        before = baseline_results.get((result["target"], result["file"]))
+        if before is None:
+            continue
+        print(
+            f"{result['target']:<24}{result['file']:<26}"
+            f"{before['p50_ms']:>12.3f}{result['p50_ms']:>12.3f}"
+            f"{result['p50_ms'] / before['p50_ms'] - 1:>+9.0%}",
+        )
+
+
+def main():
+    """Runs the suite and writes or compares the json output."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--targets",
+        nargs="*",
+        choices=list(VALIDATOR_TARGETS) + DJANGO_TARGETS,
+    )
+    parser.add_argument("--no-samples", action="store_true")
+    parser.add_argument("--min-time", type=float, default=0.5)
+    parser.add_argument("--min-runs", type=int, default=3)
+    parser.add_argument("--max-runs", type=int, default=1000)
+    parser.add_argument("--json", help="The path of the json output")
+    parser.add_argument("--compare", help="The path of a previous json output")
+    arguments = parser.parse_args()
+    print_header()
+    results = run_suite(arguments)
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as json_file:
+            json.dump(
+                {
+                    "version": __version__,
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                json_file,
+                indent=2,
+            )
+    if arguments.compare:
+        compare(results, arguments.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""In this module, there is the batch validation of many files, the files are
+validated in a pool of threads or processes and the result of every file is
+returned as soon as it is ready, a file that is not valid does not stop the
+other files."""
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from file_validator.constants import (
+    BATCH_WINDOW_PER_WORKER,
+    EXECUTOR_IS_NOT_SUPPORTED,
+    EXECUTORS,
+    PROCESS,
+    STREAM_CAN_NOT_BE_SENT_TO_PROCESS,
+    THREAD,
+)
+from file_validator.exceptions import BatchValidationException
+from file_validator.magic_pool import get_magic_pool
+from file_validator.policy import ValidationPolicy
+from file_validator.validators import FileValidator
+
+
+class BatchResult:
+    """The result of the validation of one file of the batch."""
+
+    __slots__ = ("index", "file_name", "result_of_validation", "error")
+
+    def __init__(
+        self,
+        index: int,
+        file_name: str,
+        result_of_validation: dict = None,
+        error: Exception = None,
+    ):
+        self.index = index
+        self.file_name = file_name
+        self.result_of_validation = result_of_validation
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"BatchResult(index={self.index}, file_name={self.file_name!r}, "
+            f"is_valid={self.is_valid})"
+        )
+
+    @property
+    def is_valid(self) -> bool:
+        """Returns True if the file is valid."""
+        return self.error is None
+
+
+def is_stream(file) -> bool:
+    """Returns True if the file is a file-like object."""
+    return hasattr(file, "read")
+
+
+def is_stored_file(file) -> bool:
+    """Returns True if the file is in a Django storage, such as the FieldFile
+    of a model field."""
+    return getattr(file, "storage", None) is not None and isinstance(
+        getattr(file, "name", None),
+        str,
+    )
+
+
+def get_file_validator(file, policy: dict) -> FileValidator:
+    """Returns the file validator of a file of the batch, the file can be a
+    path, the content of the file, a file-like object, a file of a Django
+    storage or a tuple of the name of the file and its content or file-like
+    object."""
+    if is_stored_file(file):
+        return FileValidator.from_storage(file.storage, file.name, **policy)
+    file_name = None
+    if isinstance(file, tuple):
+        file_name, file = file
+    if isinstance(file, (bytes, bytearray, memoryview)):
+        return FileValidator.from_bytes(file, file_name=file_name, **policy)
+    if is_stream(file):
+        return FileValidator.from_stream(file, file_name=file_name, **policy)
+    return FileValidator(file_path=os.fspath(file), **policy)
+
+
+def validate_file(index: int, file, policy: dict) -> BatchResult:
+    """Validates one file of the batch, any error is kept in the result so
+    the other files are still validated."""
+    file_name = None
+    try:
+        file_validator = get_file_validator(file, policy)
+        file_name = file_validator.file_path
+        result_of_validation = file_validator.run_validation()
+    except Exception as error:  # pylint: disable=broad-except
+        return BatchResult(index, file_name, error=error)
+    return BatchResult(index, file_name, result_of_validation)
+
+
+def warm_up_worker():
+    """Opens the python-magic handle of the worker before the first file, the
+    handle is then reused for every file of the worker."""
+    get_magic_pool().get_handle()
+
+
+def validate_many(
+    files,
+    policy: dict = None,
+    executor: str = THREAD,
+    max_workers: int = None,
+    ordered: bool = False,
+):
+    """Validates many files in a pool of threads or processes and yields the
+    result of every file.
+
+    :param files: The files, every file can be a path, bytes, a file-
+    like object, a file of a Django storage, such as a FieldFile, or a
+    tuple of a file name and bytes or a file-like object, with the
+    process executor, file-like objects are not supported :type policy:
+    dict, ValidationPolicy, optional :param policy: The arguments of
+    FileValidator, such as libraries, acceptable_mimes, acceptable_types
+    and max_upload_file_size, or a ValidationPolicy :type executor: str
+    :param executor: thread or process :type max_workers: int, optional
+    :param max_workers: The number of workers, defaults to the number of
+    CPUs :type ordered: bool :param ordered: If it is True, the results
+    are yielded in the order of the files, otherwise as soon as they are
+    ready :return: A generator of BatchResult
+    """
+    if executor not in EXECUTORS:
+        raise BatchValidationException(
+            EXECUTOR_IS_NOT_SUPPORTED.format(executor=executor, executors=EXECUTORS),
+        )
+    if isinstance(policy, ValidationPolicy):
+        policy = {"policy": policy}
+    policy = policy or {}
+    max_workers = max_workers or os.cpu_count() or 1
+    window = max_workers * BATCH_WINDOW_PER_WORKER
+    executor_class = ProcessPoolExecutor if executor == PROCESS else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers, initializer=warm_up_worker) as pool:
+        pending = deque() if ordered else set()
+        for index, file in enumerate(files):
+            content = file[1] if isinstance(file, tuple) else file
+            if (
+                executor == PROCESS
+                and is_stream(content)
+                and not is_stored_file(content)
+            ):
+                raise BatchValidationException(STREAM_CAN_NOT_BE_SENT_TO_PROCESS)
+            future = pool.submit(validate_file, index, file, policy)
+            if ordered:
+                pending.append(future)
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future_done in done:
+                        yield future_done.result()
+        while pending:
+            if ordered:
+                yield pending.popleft().result()
+            else:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future_done in done:
+                    yield future_done.result()
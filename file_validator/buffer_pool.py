@@ -0,0 +1,75 @@
+"""In this module, there is a pool of the buffers that the head and the tail of
+the files are read into, a buffer is taken from the pool for every sample and
+given back when the validation is over, so validating many files does not
+allocate a new head and tail for every file."""
+import threading
+
+from file_validator.constants import BUFFER_POOL_MAX_BUFFERS
+
+
+class BufferPool:
+    """Pool of bytearray buffers, the buffers are kept by size, so a buffer is
+    only reused for samples with the same head_size and tail_size."""
+
+    def __init__(self, max_buffers: int = BUFFER_POOL_MAX_BUFFERS):
+        """:type max_buffers: int :param max_buffers: The maximum number of
+        free buffers that are kept, a buffer that is given back when the pool
+        is full is left to the garbage collector."""
+        self.max_buffers = max_buffers
+        self.buffers_created = 0
+        self.buffers_reused = 0
+        self._buffers = {}
+        self._free_buffers = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._free_buffers
+
+    def acquire(self, size: int) -> bytearray:
+        """Returns a free buffer of size bytes, a new buffer is created if
+        there is no free buffer of that size."""
+        with self._lock:
+            buffers = self._buffers.get(size)
+            if buffers:
+                self._free_buffers -= 1
+                self.buffers_reused += 1
+                return buffers.pop()
+            self.buffers_created += 1
+        return bytearray(size)
+
+    def release(self, buffer: bytearray):
+        """Gives the buffer back to the pool, no view of the buffer can be
+        used after that."""
+        with self._lock:
+            if self._free_buffers >= self.max_buffers:
+                return
+            self._buffers.setdefault(len(buffer), []).append(buffer)
+            self._free_buffers += 1
+
+    def clear(self):
+        """Removes all the free buffers."""
+        with self._lock:
+            self._buffers.clear()
+            self._free_buffers = 0
+
+
+_BUFFER_POOL = None
+_BUFFER_POOL_LOCK = threading.Lock()
+
+
+def get_buffer_pool() -> BufferPool:
+    """Returns the shared pool of buffers."""
+    global _BUFFER_POOL  # pylint: disable=global-statement
+    if _BUFFER_POOL is None:
+        with _BUFFER_POOL_LOCK:
+            if _BUFFER_POOL is None:
+                _BUFFER_POOL = BufferPool()
+    return _BUFFER_POOL
+
+
+def set_buffer_pool(buffer_pool: BufferPool):
+    """Replaces the shared pool, with a pool of max_buffers=0 no buffer is
+    reused."""
+    global _BUFFER_POOL  # pylint: disable=global-statement
+    with _BUFFER_POOL_LOCK:
+        _BUFFER_POOL = buffer_pool
@@ -0,0 +1,414 @@
+"""In this module, there is a cache for the verdicts of the file validator, a
+verdict is the result of the validation or the error that was raised, and it
+is kept under a digest of the content of the file and the validation settings,
+so a file that is uploaded again is not validated again."""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+
+from file_validator.constants import (
+    CONTENT_DIGEST,
+    DEFAULT_CACHE_ALIAS,
+    HEAD_TAIL_SIZE,
+    VERDICT_CACHE_KEY_MODE_IS_NOT_SUPPORTED,
+    VERDICT_CACHE_KEY_MODES,
+    VERDICT_CACHE_KEY_PREFIX,
+    VERDICT_CACHE_MAX_BYTES,
+    VERDICT_CACHE_MAX_ENTRIES,
+)
+from file_validator.exceptions import (
+    FileValidationException,
+    FileValidatorException,
+    SizeValidationException,
+    VerdictCacheException,
+)
+
+CACHED_EXCEPTIONS: dict = {
+    exception.__name__: exception
+    for exception in (FileValidationException, SizeValidationException)
+}
+
+
+def get_policy_fingerprint(file_validator) -> str:
+    """Returns a digest of the settings of the file validator that change the
+    verdict, the mime that mimetypes guesses from the name of the file and the
+    mime guessed by django are part of it because the mimetypes and django
+    libraries only look at them, mimetypes looks at more than the last suffix,
+    such as .tar.gz, and the suffix is part of it only if the extension is
+    validated."""
+    import mimetypes  # pylint: disable=import-outside-toplevel
+
+    policy = [
+        file_validator.policy.fingerprint,
+        file_validator.file_mime_guessed_by_django,
+        mimetypes.guess_type(file_validator.file_path)[0],
+        Path(file_validator.file_path).suffix
+        if file_validator.policy.acceptable_extensions is not None
+        else None,
+    ]
+    return hashlib.sha256(json.dumps(policy, default=str).encode()).hexdigest()
+
+
+def get_cache_key(file_validator, key_mode: str = CONTENT_DIGEST) -> str:
+    """Returns the key of the verdict of the file validator, with the
+    content_digest mode the whole file is hashed, with the head_tail_size mode
+    only the head, the tail and the size of the file are hashed, which is
+    cheaper for very large files."""
+    sample = file_validator.sample
+    if key_mode == HEAD_TAIL_SIZE:
+        digest = hashlib.sha256(sample.head)
+        digest.update(sample.tail)
+        digest.update(str(sample.size).encode())
+        content_digest = digest.hexdigest()
+    else:
+        content_digest = sample.content_digest()
+    return f"{key_mode}:{content_digest}:{get_policy_fingerprint(file_validator)}"
+
+
+class Verdict:
+    """The result of the validation of a file or the error that was raised,
+    the details of the error are kept, so the error is created again with the
+    name of the current file."""
+
+    __slots__ = (
+        "file_name",
+        "result_of_validation",
+        "error_name",
+        "error_message",
+        "error_details",
+    )
+
+    def __init__(
+        self,
+        file_name: str,
+        result_of_validation: dict = None,
+        error: Exception = None,
+    ):
+        self.file_name = file_name
+        self.result_of_validation = result_of_validation
+        self.error_name = type(error).__name__ if error is not None else None
+        self.error_message = None
+        self.error_details = None
+        if isinstance(error, FileValidatorException):
+            self.error_message = error.render()
+            self.error_details = error.get_details()
+        elif error is not None:
+            self.error_message = str(error)
+
+    def restore(self, file_validator) -> dict:
+        """Puts the result of the validation on the file validator with the
+        name and the extension of the current file, or raises the error
+        again."""
+        current_file = Path(file_validator.file_path)
+        names = {"file_name": current_file.name, "file_extension": current_file.suffix}
+        if self.error_name is not None:
+            if self.error_details is None:
+                raise CACHED_EXCEPTIONS[self.error_name](self.error_message)
+            error_details = dict(self.error_details)
+            for key, value in names.items():
+                if error_details[key] is not None:
+                    error_details[key] = value
+            raise CACHED_EXCEPTIONS[self.error_name](**error_details)
+        result_of_validation = deepcopy(self.result_of_validation)
+        for information in result_of_validation.values():
+            if not isinstance(information, dict):
+                continue
+            for key, value in names.items():
+                if key in information:
+                    information[key] = value
+        file_validator.result_of_validation.update(result_of_validation)
+        return file_validator.result_of_validation
+
+    def serialize(self) -> bytes:
+        """Returns the verdict as compact json."""
+        return json.dumps(
+            [
+                self.file_name,
+                self.result_of_validation,
+                self.error_name,
+                self.error_message,
+                self.error_details,
+            ],
+            separators=(",", ":"),
+            default=str,
+        ).encode()
+
+    @classmethod
+    def deserialize(cls, data: bytes):
+        """Creates a verdict from the value returned by serialize."""
+        verdict = cls.__new__(cls)
+        values = json.loads(data)
+        # The verdicts of the previous versions have no details of the error.
+        values += [None] * (5 - len(values))
+        (
+            verdict.file_name,
+            verdict.result_of_validation,
+            verdict.error_name,
+            verdict.error_message,
+            verdict.error_details,
+        ) = values
+        return verdict
+
+
+class BaseVerdictCache:
+    """Interface of the verdict caches, a cache returns the verdict of a key
+    with get_verdict and keeps a verdict with set, the number of hits and
+    misses is counted for every cache."""
+
+    def __init__(self, key_mode: str = CONTENT_DIGEST):
+        """:type key_mode: str :param key_mode: content_digest or
+        head_tail_size."""
+        if key_mode not in VERDICT_CACHE_KEY_MODES:
+            raise VerdictCacheException(
+                VERDICT_CACHE_KEY_MODE_IS_NOT_SUPPORTED.format(
+                    key_mode=key_mode,
+                    key_modes=VERDICT_CACHE_KEY_MODES,
+                ),
+            )
+        self.key_mode = key_mode
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get_key(self, file_validator) -> str:
+        """Returns the key of the verdict of the file validator."""
+        return get_cache_key(file_validator, key_mode=self.key_mode)
+
+    def get(self, key: str):
+        """Returns the verdict of the key or None if there is no verdict or
+        the verdict is expired."""
+        verdict = self.get_verdict(key)
+        with self._counter_lock:
+            if verdict is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return verdict
+
+    def stats(self) -> dict:
+        """Returns the number of hits and misses."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def get_verdict(self, key: str):
+        """Returns the verdict of the key without counting hits and
+        misses."""
+        raise NotImplementedError(
+            "subclasses of BaseVerdictCache must provide a get_verdict() method",
+        )
+
+    def set(self, key: str, verdict: Verdict):
+        """Keeps the verdict under the key."""
+        raise NotImplementedError(
+            "subclasses of BaseVerdictCache must provide a set() method",
+        )
+
+    def clear(self):
+        """Removes all the verdicts."""
+        raise NotImplementedError(
+            "subclasses of BaseVerdictCache must provide a clear() method",
+        )
+
+
+class VerdictCache(BaseVerdictCache):
+    """In-process cache of verdicts, bounded by the number of entries and the
+    size of the serialized verdicts, the least recently used verdicts are
+    removed first and verdicts older than ttl seconds are ignored."""
+
+    def __init__(
+        self,
+        max_entries: int = VERDICT_CACHE_MAX_ENTRIES,
+        max_bytes: int = VERDICT_CACHE_MAX_BYTES,
+        ttl: float = None,
+        key_mode: str = CONTENT_DIGEST,
+    ):
+        """:type max_entries: int :param max_entries: The maximum number of
+        verdicts :type max_bytes: int :param max_bytes: The maximum size of
+        all the verdicts in bytes :type ttl: float, optional :param ttl: The
+        number of seconds a verdict is kept, if it is not set, verdicts do not
+        expire :type key_mode: str :param key_mode: content_digest or
+        head_tail_size."""
+        super().__init__(key_mode=key_mode)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_verdict(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            verdict, _size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return verdict
+
+    def set(self, key: str, verdict: Verdict):
+        """Keeps the verdict and removes the least recently used verdicts if
+        the cache is full."""
+        size = len(verdict.serialize())
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (verdict, size, expires_at)
+            self.current_bytes += size
+            while (
+                len(self._entries) > self.max_entries
+                or self.current_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: str):
+        _verdict, size, _expires_at = self._entries.pop(key)
+        self.current_bytes -= size
+
+
+class DjangoVerdictCache(BaseVerdictCache):
+    """Verdict cache on top of the Django cache framework, so the verdicts are
+    shared by all the workers that use the same cache, such as memcached,
+    redis or the file based cache."""
+
+    def __init__(
+        self,
+        alias: str = DEFAULT_CACHE_ALIAS,
+        ttl: float = None,
+        key_prefix: str = VERDICT_CACHE_KEY_PREFIX,
+        key_mode: str = CONTENT_DIGEST,
+    ):
+        """:type alias: str :param alias: The name of the cache in the CACHES
+        setting :type ttl: float, optional :param ttl: The number of seconds a
+        verdict is kept, if it is not set, the timeout of the cache is used
+        :type key_prefix: str :param key_prefix: The prefix of the keys of the
+        verdicts."""
+        super().__init__(key_mode=key_mode)
+        self.alias = alias
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        """The django cache of the current thread."""
+        from django.core.cache import caches  # pylint: disable=import-outside-toplevel
+
+        return caches[self.alias]
+
+    def get_key(self, file_validator) -> str:
+        key = super().get_key(file_validator)
+        return f"{self.key_prefix}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+    def get_verdict(self, key: str):
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        return Verdict.deserialize(data)
+
+    def set(self, key: str, verdict: Verdict):
+        if self.ttl is None:
+            self.cache.set(key, verdict.serialize())
+        else:
+            self.cache.set(key, verdict.serialize(), timeout=self.ttl)
+
+
+class SQLiteVerdictCache(BaseVerdictCache):
+    """Verdict cache in a SQLite file, so the verdicts are shared by all the
+    processes on the same machine without Django or any other service."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = None,
+        key_mode: str = CONTENT_DIGEST,
+    ):
+        """:type path: str :param path: The path of the SQLite file, it is
+        created if it does not exist :type ttl: float, optional :param ttl: The
+        number of seconds a verdict is kept, if it is not set, verdicts do not
+        expire."""
+        super().__init__(key_mode=key_mode)
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """The connection of the current thread and process, a connection is
+        never shared after a fork."""
+        import sqlite3  # pylint: disable=import-outside-toplevel
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_validator_verdicts "
+                "(key TEXT PRIMARY KEY, verdict BLOB NOT NULL, expires_at REAL)",
+            )
+            connection.commit()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def __len__(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM file_validator_verdicts",
+        ).fetchone()[0]
+
+    def get_verdict(self, key: str):
+        row = self.connection.execute(
+            "SELECT verdict, expires_at FROM file_validator_verdicts WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        data, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return Verdict.deserialize(data)
+
+    def set(self, key: str, verdict: Verdict):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self.connection as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO file_validator_verdicts "
+                "(key, verdict, expires_at) VALUES (?, ?, ?)",
+                (key, verdict.serialize(), expires_at),
+            )
+
+    def clear(self):
+        with self.connection as connection:
+            connection.execute("DELETE FROM file_validator_verdicts")
+
+    def remove_expired(self):
+        """Removes the verdicts that are expired."""
+        with self.connection as connection:
+            connection.execute(
+                "DELETE FROM file_validator_verdicts WHERE expires_at <= ?",
+                (time.time(),),
+            )
+
+
+def get_verdict_cache(verdict_cache):
+    """Returns the verdict cache, if the name of a Django cache is given, a
+    verdict cache on top of that cache is returned."""
+    if isinstance(verdict_cache, str):
+        return DjangoVerdictCache(alias=verdict_cache)
+    return verdict_cache
@@ -6,7 +6,15 @@ MIMETYPES: str = "mimetypes"
 FILETYPE: str = "filetype"
 DEFAULT: str = "default"
 DJANGO: str = "django"
+NATIVE: str = "native"
+FAST: str = "fast"
+QUORUM: str = "quorum"
+TIERS: str = "tiers"
 SIZE: str = "size"
+TYPE: str = "type"
+EXTENSION: str = "extension"
+CACHE: str = "cache"
+VALIDATION: str = "validation"
 ALL: str = "all"
 ALL_SUPPORTED_LIBRARIES: list = [
     PYTHON_MAGIC,
@@ -14,9 +22,106 @@ ALL_SUPPORTED_LIBRARIES: list = [
     FILETYPE,
     MIMETYPES,
     DJANGO,
+    NATIVE,
+    FAST,
+    QUORUM,
     ALL,
 ]
+HEADER_ONLY_LIBRARIES: list = [
+    FILETYPE,
+    MIMETYPES,
+    PYTHON_MAGIC,
+    DJANGO,
+    NATIVE,
+]
+# The libraries of the all library that only read the head, native is not one
+# of them, because the all library does not run it.
+ALL_HEADER_ONLY_LIBRARIES: list = [FILETYPE, MIMETYPES, PYTHON_MAGIC, DJANGO]
 SELECTING_ALL_SUPPORTED_LIBRARIES: str = "all"
+SAMPLE_HEAD_SIZE: int = 65536
+SAMPLE_TAIL_SIZE: int = 4096
+PYTHON_MAGIC_SAMPLE_SIZE: int = 2048
+TYPE_SAMPLE_SIZE: int = 8192
+DIGEST_CHUNK_SIZE: int = 1048576
+BUFFER_POOL_MAX_BUFFERS: int = 32
+CONTENT_DIGEST: str = "content_digest"
+HEAD_TAIL_SIZE: str = "head_tail_size"
+VERDICT_CACHE_KEY_MODES: list = [CONTENT_DIGEST, HEAD_TAIL_SIZE]
+VERDICT_CACHE_MAX_ENTRIES: int = 1024
+VERDICT_CACHE_MAX_BYTES: int = 16777216
+VERDICT_CACHE_KEY_PREFIX: str = "file_validator"
+DEFAULT_CACHE_ALIAS: str = "default"
+THREAD: str = "thread"
+PROCESS: str = "process"
+EXECUTORS: list = [THREAD, PROCESS]
+BATCH_WINDOW_PER_WORKER: int = 4
+REVALIDATION_CHUNK_SIZE: int = 500
+REVALIDATION_REPORT_PATH: str = "revalidation-report.jsonl"
+REVALIDATION_CHECKPOINT_PATH: str = "revalidation-checkpoint.json"
+# The key of the checkpoint that keeps the size of the report, the keys of the
+# fields always have a dot, so they never clash with it.
+REVALIDATION_REPORT_SIZE: str = "report_size"
+CONCURRENT_LIBRARIES_MAX_WORKERS: int = 8
+VALIDATION_POLICY_CACHE_SIZE: int = 256
+METRICS_NAMESPACE: str = "file_validator"
+METRICS_DIRECTORY_ENVIRONMENT_VARIABLE: str = "FILE_VALIDATOR_METRICS_DIR"
+METRICS_FLUSH_INTERVAL: float = 1.0
+METRICS_POLICY_LABEL_SIZE: int = 12
+METRICS_DURATION_BUCKETS: tuple = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PROMETHEUS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+QUORUM_LIBRARIES: list = [
+    NATIVE,
+    FILETYPE,
+    DJANGO,
+    MIMETYPES,
+    PYTHON_MAGIC,
+    PURE_MAGIC,
+]
+QUORUM_WEIGHTS: dict = {
+    NATIVE: 1.0,
+    FILETYPE: 1.0,
+    DJANGO: 0.5,
+    MIMETYPES: 0.5,
+    PYTHON_MAGIC: 2.0,
+    PURE_MAGIC: 1.5,
+}
+QUORUM_THRESHOLD: float = 0.5
+REJECTED: str = "rejected"
+ERROR: str = "error"
+HIT: str = "hit"
+MISS: str = "miss"
+QUORUM_IS_NOT_VALID: str = (
+    "The weights of the quorum are not valid, the libraries must be in this list : "
+    "{libraries}, the weights must not be negative and the threshold must be "
+    "between 0 and 1"
+)
+EXECUTOR_IS_NOT_SUPPORTED: str = (
+    "{executor} is not supported, you can choice executor from this list : {executors}"
+)
+STREAM_CAN_NOT_BE_SENT_TO_PROCESS: str = (
+    "file-like objects can not be sent to a process, "
+    "use the thread executor or pass paths or bytes"
+)
+VERDICT_CACHE_KEY_MODE_IS_NOT_SUPPORTED: str = (
+    "{key_mode} is not supported, you can choice key mode from this list : {key_modes}"
+)
 ZERO: int = 0
 MIMES_EMPTY: str = "The args value is empty, please pass the value (file MIME)."
 MIME_NOT_VALID: str = "mime is not a valid"
@@ -74,3 +179,7 @@ PARAMETERS_ARE_EMPTY: str = (
     "you must fill at least one acceptable_mimes or acceptable_types parameter"
 )
 FILE_EXTENSION_NOT_VALID: str = "{file_extension} is not valid"
+READ_BUDGET_EXCEEDED: str = (
+    "{bytes_read} bytes were requested from the file, "
+    "the read budget is {budget} bytes"
+)
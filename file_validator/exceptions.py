@@ -1,60 +1,235 @@
 """This file is for customizing errors and anything related to errors."""
-from django.conf import settings
-from django.core.exceptions import ImproperlyConfigured
+import os
+from functools import lru_cache
 
 from file_validator.constants import DEFAULT_ERROR_MESSAGE, DEFAULT_FILE_NAME
 
-try:
-    # Get Error Message From Django Setting
-    CUSTOM_ERROR_MESSAGE = settings.FILE_VALIDATOR_ERROR_MESSAGE
-except (AttributeError, ImproperlyConfigured):
-    CUSTOM_ERROR_MESSAGE = DEFAULT_ERROR_MESSAGE
 
+@lru_cache(maxsize=None)
+def get_custom_error_message() -> str:
+    """Returns the error message of the FILE_VALIDATOR_ERROR_MESSAGE django
+    setting, django is imported only the first time an error message is
+    needed, and if django is not installed or not configured, the default
+    error message is returned."""
+    # pylint: disable=import-outside-toplevel
+    try:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+    except ImportError:
+        return DEFAULT_ERROR_MESSAGE
+    try:
+        # Get Error Message From Django Setting
+        return settings.FILE_VALIDATOR_ERROR_MESSAGE
+    except (AttributeError, ImproperlyConfigured):
+        return DEFAULT_ERROR_MESSAGE
 
-class FileValidationException(Exception):
+
+def __getattr__(name):
+    if name == "CUSTOM_ERROR_MESSAGE":
+        return get_custom_error_message()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def is_colored() -> bool:
+    """Returns True if the error messages are colored, coloring is enabled
+    with the FILE_VALIDATOR_COLORED_ERRORS django setting or environment
+    variable, and it is read only the first time a message is rendered."""
+    # pylint: disable=import-outside-toplevel
+    colored_errors = os.environ.get("FILE_VALIDATOR_COLORED_ERRORS", "")
+    colored_errors = colored_errors.lower() in ("1", "true", "yes")
+    try:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+    except ImportError:
+        return colored_errors
+    try:
+        return bool(getattr(settings, "FILE_VALIDATOR_COLORED_ERRORS", colored_errors))
+    except ImproperlyConfigured:
+        return colored_errors
+
+
+def colored(text: str, color: str) -> str:
+    """Colors the text with termcolor, termcolor is imported the first time a
+    message is colored."""
+    # pylint: disable=import-outside-toplevel
+    from termcolor import colored as termcolor_colored
+
+    return termcolor_colored(text, color)
+
+
+def format_size(size: int) -> str:
+    """Returns the size in a human-readable form, such as 1.0 MB."""
+    from humanize import naturalsize  # pylint: disable=import-outside-toplevel
+
+    return naturalsize(size) if size is not None else None
+
+
+class FileValidatorException(Exception):
+    """Base of the errors of file validator, an error keeps the details of the
+    file, the settings and the library, and the message is rendered only when
+    the error is turned into a string."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        message: str = None,
+        *,
+        template: str = None,
+        library: str = None,
+        file_name: str = None,
+        file_mime: str = None,
+        file_type: str = None,
+        file_extension: str = None,
+        file_size: int = None,
+        max_file_size: int = None,
+        acceptable_mimes=None,
+        acceptable_types=None,
+        acceptable_extensions=None,
+    ):
+        """:type message: str, optional :param message: The message of the
+        error, if it is not set, the message is rendered from the template and
+        the details :type template: str, optional :param template: The
+        template of the message, defaults to the error message of the
+        settings, the other parameters are the details of the error, the sizes
+        are in bytes."""
+        super().__init__(message)
+        self.message = message
+        self.template = template
+        self.library = library
+        self.file_name = file_name
+        self.file_mime = file_mime
+        self.file_type = file_type
+        self.file_extension = file_extension
+        self.file_size = file_size
+        self.max_file_size = max_file_size
+        self.acceptable_mimes = acceptable_mimes
+        self.acceptable_types = acceptable_types
+        self.acceptable_extensions = acceptable_extensions
+
+    def get_details(self) -> dict:
+        """Returns the message, the template and the details of the error, the
+        same error is created again with type(error)(**details)."""
+        return {
+            "message": self.message,
+            "template": self.template,
+            "library": self.library,
+            "file_name": self.file_name,
+            "file_mime": self.file_mime,
+            "file_type": self.file_type,
+            "file_extension": self.file_extension,
+            "file_size": self.file_size,
+            "max_file_size": self.max_file_size,
+            "acceptable_mimes": self.acceptable_mimes,
+            "acceptable_types": self.acceptable_types,
+            "acceptable_extensions": self.acceptable_extensions,
+        }
+
+    def render(self) -> str:
+        """Returns the message of the error without color."""
+        if self.message is not None:
+            return self.message
+        return error_message(
+            current_file_extension=self.file_extension,
+            current_file_name=(
+                self.file_name if self.file_name is not None else DEFAULT_FILE_NAME
+            ),
+            current_file_size=format_size(self.file_size),
+            current_file_mime=self.file_mime,
+            current_file_type=self.file_type,
+            max_file_size=format_size(self.max_file_size),
+            acceptable_mimes=self.acceptable_mimes,
+            acceptable_types=self.acceptable_types,
+            acceptable_extensions=self.acceptable_extensions,
+            message=self.template,
+        )
+
+    @property
+    def args(self):
+        """The arguments of the error, an error whose message is rendered
+        from the template has the rendered message as its only argument, it is
+        rendered when it is read."""
+        args = BaseException.args.__get__(self)
+        if self.message is None and args == (None,):
+            return (self.render(),)
+        return args
+
+    @args.setter
+    def args(self, args):
+        BaseException.args.__set__(self, args)
+
+    def __str__(self):
+        if is_colored():
+            return colored(self.render(), "red")
+        return self.render()
+
+    def __repr__(self):
+        arguments = [repr(self.message)] if self.message is not None else []
+        arguments.extend(
+            f"{name}={value!r}"
+            for name, value in (
+                ("library", self.library),
+                ("file_name", self.file_name),
+            )
+            if value is not None
+        )
+        return f"{type(self).__name__}({', '.join(arguments)})"
+
+
+class FileValidationException(FileValidatorException):
     """Raised when file is not valid."""
 
 
-class SizeValidationException(Exception):
+class SizeValidationException(FileValidatorException):
     """Raised when file size is not valid."""
 
 
-class DjangoFileValidationException(Exception):
+class DjangoFileValidationException(FileValidatorException):
     """Raised when file validation operation for django fails."""
 
 
-class LibraryNotSupportedException(Exception):
+class LibraryNotSupportedException(FileValidatorException):
     """Raised when a library is not supported."""
 
 
-class MimesEmptyException(Exception):
+class MimesEmptyException(FileValidatorException):
     """Raised when the mime list is empty."""
 
 
-class MimesEqualException(Exception):
+class MimesEqualException(FileValidatorException):
     """Raised when the mime list is empty."""
 
 
-class TypeNotSupportedException(Exception):
+class TypeNotSupportedException(FileValidatorException):
     """Raised when the type not supported, supported types: image, audio,
     video, archive, font."""
 
 
-class EmptyParametersException(Exception):
+class EmptyParametersException(FileValidatorException):
     """Raised when the type not supported, supported types: image, audio,
     video, archive, font."""
 
 
+class QuorumNotValidException(FileValidatorException):
+    """Raised when the weights or the threshold of the quorum are not
+    valid."""
+
+
+class VerdictCacheException(FileValidatorException):
+    """Raised when the verdict cache is not configured correctly."""
+
+
+class BatchValidationException(FileValidatorException):
+    """Raised when the batch validation is not configured correctly."""
+
+
+class ReadBudgetException(FileValidatorException):
+    """Raised when more bytes are read from a file than its read budget."""
+
+
 def convert_list_to_readable_string(object_list) -> str:
     """Convert a list of objects to a readable string."""
-    result = ""
-    for value in object_list:
-        if value == object_list[-1]:
-            result += str(value)
-        else:
-            result += str(value)
-            result += ", "
-    return result
+    return ", ".join(str(value) for value in object_list)
 
 
 def error_message(
@@ -86,7 +261,7 @@ def error_message(
     acceptable_extensions = kwargs.get("acceptable_extensions")
 
     if message is None:
-        message = CUSTOM_ERROR_MESSAGE
+        message = get_custom_error_message()
 
     if acceptable_extensions is not None:
         file_extensions = convert_list_to_readable_string(
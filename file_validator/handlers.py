@@ -0,0 +1,148 @@
+"""In this module, there is an upload handler for Django that validates every
+file on its first chunks, so a file that is not valid is rejected before
+Django streams the whole body to memory or to a temporary file."""
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.db.models import FileField
+
+from file_validator.constants import (
+    ALL,
+    ALL_HEADER_ONLY_LIBRARIES,
+    FILE_SIZE_IS_NOT_VALID,
+    HEADER_ONLY_LIBRARIES,
+    SAMPLE_HEAD_SIZE,
+)
+from file_validator.exceptions import FileValidationException, SizeValidationException
+from file_validator.models import (
+    DjangoFileValidator,
+    FileSizeValidator,
+    ValidatedFileField,
+)
+from file_validator.validators import FileValidator
+
+
+def get_field_validators(field) -> list:
+    """Returns the objects that hold the validation settings of a model
+    field, such as acceptable mimes, acceptable types and max upload file
+    size."""
+    if isinstance(field, ValidatedFileField):
+        return [field]
+    if isinstance(field, FileField):
+        return [
+            validator
+            for validator in field.validators
+            if isinstance(validator, (DjangoFileValidator, FileSizeValidator))
+        ]
+    return []
+
+
+def get_header_only_libraries(libraries: list) -> list:
+    """Returns the libraries that only need the head of the file, the other
+    libraries also read the end of the file, so they have to wait for the
+    whole file."""
+    result: list = []
+    for library in libraries:
+        if library == ALL:
+            result.extend(ALL_HEADER_ONLY_LIBRARIES)
+        elif library in HEADER_ONLY_LIBRARIES:
+            result.append(library)
+    return result
+
+
+class ValidatedFileUploadHandler(FileUploadHandler):
+    """Upload handler that validates a file with the settings of its field as
+    soon as the first chunks arrive and stops the upload if the file is not
+    valid or becomes larger than max_upload_file_size."""
+
+    def __init__(self, request=None, fields: dict = None, connection_reset=True):
+        """:param request: The request of the upload :type fields: dict :param
+        fields: The name of the form fields and the objects that hold their
+        validation settings, such as ValidatedFileField or
+        DjangoFileValidator, a field can also have a list of them :type
+        connection_reset: bool :param connection_reset: If it is True, the
+        connection is reset and the rest of the body is not read."""
+        super().__init__(request)
+        self.fields = {}
+        for field_name, validators in (fields or {}).items():
+            if not isinstance(validators, (list, tuple)):
+                validators = [validators]
+            self.fields[field_name] = list(validators)
+        self.connection_reset = connection_reset
+        self.errors = {}
+        self.validators = []
+        self.header = bytearray()
+        self.is_checked = False
+
+    @classmethod
+    def for_model(cls, model, request=None, **kwargs):
+        """Creates an upload handler that validates the files of the model
+        fields with the same settings as the fields, the name of the form
+        fields must be the same as the name of the model fields."""
+        fields = {}
+        for field in model._meta.get_fields():
+            validators = get_field_validators(field)
+            if validators:
+                fields[field.name] = validators
+        return cls(request, fields=fields, **kwargs)
+
+    def new_file(self, field_name, file_name, content_type, content_length, *args):
+        super().new_file(field_name, file_name, content_type, content_length, *args)
+        self.validators = self.fields.get(field_name, [])
+        self.header = bytearray()
+        self.is_checked = False
+        if content_length is not None:
+            self.validate_size(content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.validators:
+            self.validate_size(start + len(raw_data))
+            if not self.is_checked:
+                self.header += raw_data[: SAMPLE_HEAD_SIZE - len(self.header)]
+                if len(self.header) >= SAMPLE_HEAD_SIZE:
+                    self.validate_header(is_complete=False)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.validators and not self.is_checked:
+            self.validate_header(is_complete=True)
+
+    def validate_size(self, file_size: int):
+        """Stops the upload if the number of bytes received is more than the
+        max upload file size of the field."""
+        for validator in self.validators:
+            max_upload_file_size = validator.max_upload_file_size
+            if max_upload_file_size is not None and file_size > max_upload_file_size:
+                self.stop_upload(
+                    SizeValidationException(
+                        template=FILE_SIZE_IS_NOT_VALID,
+                        file_name=self.file_name,
+                        file_size=file_size,
+                        max_file_size=max_upload_file_size,
+                    ),
+                )
+
+    def validate_header(self, is_complete: bool):
+        """Validates the head of the file, if the whole file is in the head,
+        all the libraries are used, otherwise only the libraries that need
+        nothing but the head are used."""
+        self.is_checked = True
+        for validator in self.validators:
+            libraries = getattr(validator, "libraries", [])
+            if not is_complete:
+                libraries = get_header_only_libraries(libraries)
+            file_validator = FileValidator.from_bytes(
+                bytes(self.header),
+                file_name=self.file_name,
+                libraries=libraries,
+                acceptable_mimes=getattr(validator, "acceptable_mimes", None),
+                acceptable_types=getattr(validator, "acceptable_types", None),
+                file_mime_guessed_by_django=self.content_type,
+            )
+            try:
+                file_validator.run_validation()
+            except (FileValidationException, SizeValidationException) as error:
+                self.stop_upload(error)
+
+    def stop_upload(self, error: Exception):
+        """Keeps the error of the field and stops the upload."""
+        self.errors[self.field_name] = str(error)
+        raise StopUpload(connection_reset=self.connection_reset)
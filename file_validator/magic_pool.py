@@ -0,0 +1,89 @@
+"""In this module, there is a pool of python-magic handles, each thread gets its
+own handle that is opened once and reused, so threads can guess mimes in
+parallel without reading the environment or loading the magic database on
+every call, python-magic, which loads libmagic, is imported the first time a
+handle is opened."""
+import os
+import platform
+import threading
+
+
+def get_path_magic_file():
+    """Returns the path of the magic.mgc file, the path is read from the
+    FILE_VALIDATOR_MAGIC_FILE django setting or the path_magic_file
+    environment variable and is only used on Windows."""
+    # pylint: disable=import-outside-toplevel
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    path_magic_file = os.environ.get("path_magic_file")
+    try:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+    except ImportError:
+        settings = None
+    if settings is not None:
+        try:
+            path_magic_file = getattr(
+                settings,
+                "FILE_VALIDATOR_MAGIC_FILE",
+                path_magic_file,
+            )
+        except ImproperlyConfigured:
+            pass
+    if path_magic_file and platform.system() == "Windows":
+        return path_magic_file
+    return None
+
+
+class MagicPool:
+    """Pool of python-magic handles, one handle per thread."""
+
+    def __init__(self, magic_file: str = None):
+        """:type magic_file: str, optional :param magic_file: The path of the
+        magic.mgc file, if it is not set, the default database is used."""
+        self.magic_file = magic_file
+        self.handles_created = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def get_handle(self):
+        """Returns the handle of the current thread, the handle is opened the
+        first time the thread asks for it."""
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            import magic  # pylint: disable=import-outside-toplevel
+
+            handle = magic.Magic(mime=True, magic_file=self.magic_file)
+            self._local.handle = handle
+            with self._lock:
+                self.handles_created += 1
+        return handle
+
+    def from_buffer(self, buffer: bytes) -> str:
+        """Guess the mime of the buffer with the handle of the current
+        thread, libmagic only takes bytes, so a memoryview is copied."""
+        return self.get_handle().from_buffer(bytes(buffer))
+
+
+_MAGIC_POOL = None
+_MAGIC_POOL_LOCK = threading.Lock()
+
+
+def get_magic_pool() -> MagicPool:
+    """Returns the shared pool, the pool is configured from the settings and
+    the environment only the first time it is used."""
+    global _MAGIC_POOL  # pylint: disable=global-statement
+    if _MAGIC_POOL is None:
+        with _MAGIC_POOL_LOCK:
+            if _MAGIC_POOL is None:
+                _MAGIC_POOL = MagicPool(magic_file=get_path_magic_file())
+    return _MAGIC_POOL
+
+
+def reset_magic_pool():
+    """Drops the shared pool, the next call to get_magic_pool configures a new
+    pool, this is useful when the settings or the environment change."""
+    global _MAGIC_POOL  # pylint: disable=global-statement
+    with _MAGIC_POOL_LOCK:
+        _MAGIC_POOL = None
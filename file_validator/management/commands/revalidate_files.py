@@ -0,0 +1,286 @@
+"""In this module, there is the revalidate_files command, it validates the files
+that are already stored in the fields of the models with the current settings
+of the fields, so the files that became invalid when the settings were
+tightened are found, the progress is kept in a checkpoint file, so a command
+that was stopped continues where it stopped."""
+import json
+import os
+import tempfile
+import time
+from collections import deque
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import FileField
+
+from file_validator.batch import validate_many
+from file_validator.constants import (
+    EXECUTORS,
+    REJECTED,
+    REVALIDATION_CHECKPOINT_PATH,
+    REVALIDATION_CHUNK_SIZE,
+    REVALIDATION_REPORT_PATH,
+    REVALIDATION_REPORT_SIZE,
+    THREAD,
+)
+from file_validator.models import DjangoFileValidator, ValidatedFileField
+from file_validator.observers import get_outcome
+
+
+def get_models(labels: list = None) -> list:
+    """Returns the models of the labels, a label is the label of an app, such
+    as blog, or of a model, such as blog.Post, without labels all the models
+    are returned."""
+    if not labels:
+        return list(apps.get_models())
+    models = []
+    try:
+        for label in labels:
+            if "." in label:
+                models.append(apps.get_model(label))
+            else:
+                models.extend(apps.get_app_config(label).get_models())
+    except (LookupError, ValueError) as error:
+        raise CommandError(str(error)) from error
+    return models
+
+
+def get_validated_fields(labels: list = None) -> list:
+    """Returns the key, the model, the name of the field and the validation
+    policy of every file field that is validated with ValidatedFileField or
+    DjangoFileValidator, a field with many DjangoFileValidator is validated
+    once for every validator."""
+    validated_fields = []
+    for model in get_models(labels):
+        options = model._meta  # pylint: disable=protected-access
+        if options.proxy:
+            continue
+        for field in options.get_fields():
+            if not isinstance(field, FileField):
+                continue
+            if isinstance(field, ValidatedFileField):
+                policies = [field.policy]
+            else:
+                policies = [
+                    validator.policy
+                    for validator in field.validators
+                    if isinstance(validator, DjangoFileValidator)
+                ]
+            for index, policy in enumerate(policies):
+                key = f"{options.label}.{field.name}"
+                if index:
+                    key = f"{key}:{index}"
+                validated_fields.append((key, model, field.name, policy))
+    return validated_fields
+
+
+def get_queryset(model, field_name: str, last_pk=None):
+    """Returns the rows of the model that have a file in the field, in the
+    order of their primary key, after last_pk if it is set."""
+    queryset = (
+        model._default_manager.exclude(  # pylint: disable=protected-access
+            **{f"{field_name}__isnull": True},
+        )
+        .exclude(**{field_name: ""})
+        .only(field_name)
+        .order_by("pk")
+    )
+    if last_pk is not None:
+        queryset = queryset.filter(pk__gt=last_pk)
+    return queryset
+
+
+def load_checkpoint(path: str) -> dict:
+    """Returns the progress that was kept in the checkpoint file, or an empty
+    progress if there is no checkpoint file."""
+    try:
+        with open(path, encoding="utf-8") as checkpoint_file:
+            return json.load(checkpoint_file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_checkpoint(path: str, checkpoint: dict):
+    """Writes the progress to the checkpoint file, the file is replaced at
+    once, so a command that is stopped never leaves half of it."""
+    directory = os.path.dirname(os.path.abspath(path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(file_descriptor, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file, default=str)
+    os.replace(temporary_path, path)
+
+
+class Command(BaseCommand):
+    """Validates the stored files of the models again."""
+
+    help = (
+        "Validates the files that are stored in the fields with "
+        "ValidatedFileField or DjangoFileValidator again with the current "
+        "settings of the fields and reports the files that are not valid."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "labels",
+            nargs="*",
+            help="The apps or models to validate, such as blog or blog.Post.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=REVALIDATION_CHUNK_SIZE,
+            help="The number of rows that are fetched from the database at once.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="The number of workers, defaults to the number of CPUs.",
+        )
+        parser.add_argument("--executor", choices=EXECUTORS, default=THREAD)
+        parser.add_argument(
+            "--report",
+            default=REVALIDATION_REPORT_PATH,
+            help="The JSON lines file of the files that are not valid.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=REVALIDATION_CHECKPOINT_PATH,
+            help="The file that keeps the progress of the command.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint and validate all the files again.",
+        )
+
+    def handle(self, *args, **options):
+        checkpoint_path = options["checkpoint"]
+        checkpoint = {} if options["restart"] else load_checkpoint(checkpoint_path)
+        report_mode = "a" if checkpoint else "w"
+        started_at = time.perf_counter()
+        total_files = 0
+        with open(options["report"], report_mode, encoding="utf-8") as report_file:
+            report_size = checkpoint.get(REVALIDATION_REPORT_SIZE)
+            if report_size is not None:
+                # The rows that were written after the last checkpoint are
+                # validated again, so they are removed from the report.
+                report_file.truncate(report_size)
+            for key, model, field_name, policy in get_validated_fields(
+                options["labels"],
+            ):
+                progress = checkpoint.setdefault(
+                    key,
+                    {
+                        "last_pk": None,
+                        "files": 0,
+                        "rejected": 0,
+                        "errors": 0,
+                        "done": False,
+                    },
+                )
+                if progress["done"]:
+                    continue
+                field_started_at = time.perf_counter()
+                files = self.revalidate_field(
+                    key,
+                    model,
+                    field_name,
+                    policy,
+                    progress,
+                    report_file,
+                    checkpoint,
+                    options,
+                )
+                progress["done"] = True
+                self.save_progress(report_file, checkpoint, checkpoint_path)
+                total_files += files
+                self.write_stats(key, files, progress, field_started_at)
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(
+            f"{total_files} files in {elapsed:.1f}s "
+            f"({total_files / elapsed if elapsed else 0:.1f} files/s), "
+            f"the report is in {options['report']}",
+        )
+
+    def revalidate_field(
+        self,
+        key: str,
+        model,
+        field_name: str,
+        policy,
+        progress: dict,
+        report_file,
+        checkpoint: dict,
+        options: dict,
+    ) -> int:
+        """Validates the files of a field, writes the files that are not valid
+        to the report and keeps the progress in the checkpoint after every
+        chunk, the results are in the order of the rows, so every row up to
+        the last primary key of the checkpoint is done."""
+        chunk_size = options["chunk_size"]
+        primary_keys = deque()
+
+        def get_files():
+            queryset = get_queryset(model, field_name, progress["last_pk"])
+            for instance in queryset.iterator(chunk_size=chunk_size):
+                primary_keys.append(instance.pk)
+                yield getattr(instance, field_name)
+
+        files = 0
+        for result in validate_many(
+            get_files(),
+            policy=policy,
+            executor=options["executor"],
+            max_workers=options["workers"],
+            ordered=True,
+        ):
+            primary_key = primary_keys.popleft()
+            files += 1
+            progress["files"] += 1
+            if not result.is_valid:
+                status = get_outcome(result.error)
+                progress[REJECTED if status == REJECTED else "errors"] += 1
+                report_file.write(
+                    json.dumps(
+                        {
+                            "field": key,
+                            "pk": primary_key,
+                            "file_name": result.file_name,
+                            "status": status,
+                            "error": type(result.error).__name__,
+                            "message": str(result.error),
+                        },
+                        default=str,
+                    )
+                    + "\n",
+                )
+            progress["last_pk"] = primary_key
+            if files % chunk_size == 0:
+                self.save_progress(report_file, checkpoint, options["checkpoint"])
+                self.write_stats(key, files, progress, None)
+        return files
+
+    @staticmethod
+    def save_progress(report_file, checkpoint: dict, checkpoint_path: str):
+        """Writes the report to the disk and keeps its size in the checkpoint,
+        so a command that is stopped after this point removes the rows that
+        it wrote later and does not report them twice."""
+        report_file.flush()
+        checkpoint[REVALIDATION_REPORT_SIZE] = os.fstat(report_file.fileno()).st_size
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    def write_stats(self, key: str, files: int, progress: dict, started_at):
+        """Writes the number of files that were validated and, at the end of
+        a field, the throughput of the field."""
+        line = (
+            f"{key}: {progress['files']} files, {progress['rejected']} rejected, "
+            f"{progress['errors']} errors"
+        )
+        if started_at is not None:
+            elapsed = time.perf_counter() - started_at
+            line += (
+                f", {files} files in {elapsed:.1f}s "
+                f"({files / elapsed if elapsed else 0:.1f} files/s)"
+            )
+        self.stdout.write(line)
@@ -0,0 +1,399 @@
+"""In this module, there are the metrics of file validator, a metrics collector
+is an observer that counts the stages, the validations, the hits and misses of
+the verdict cache and the bytes read, and keeps histograms of the time of every
+stage, per library and per policy, the metrics are rendered in the text format
+of Prometheus, and with a directory, every process keeps its metrics in a file
+of that directory, so all the workers of a server such as gunicorn are
+aggregated without any other service."""
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from file_validator.constants import (
+    CACHE,
+    METRICS_DIRECTORY_ENVIRONMENT_VARIABLE,
+    METRICS_DURATION_BUCKETS,
+    METRICS_FLUSH_INTERVAL,
+    METRICS_NAMESPACE,
+    METRICS_POLICY_LABEL_SIZE,
+    VALIDATION,
+)
+from file_validator.observers import register_observer, unregister_observer
+
+COUNTER: str = "counter"
+HISTOGRAM: str = "histogram"
+# The name, type and help of every metric.
+METRICS: dict = {
+    "stages_total": (COUNTER, "The stages that ran, by stage, policy and outcome."),
+    "stage_duration_seconds": (HISTOGRAM, "The time of the stages in seconds."),
+    "bytes_read_total": (COUNTER, "The bytes of the files read by the stages."),
+    "seeks_total": (COUNTER, "The seeks of the files by the stages."),
+    "validations_total": (COUNTER, "The validations, by policy and outcome."),
+    "cache_requests_total": (COUNTER, "The lookups of the verdict cache."),
+}
+
+
+def get_policy_label(policy) -> str:
+    """Returns the label of a policy, the start of its fingerprint."""
+    if policy is None:
+        return "none"
+    return policy.fingerprint[:METRICS_POLICY_LABEL_SIZE]
+
+
+def escape_label_value(value) -> str:
+    """Escapes the value of a label for the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels) -> str:
+    """Returns the labels in the text format, such as {stage="filetype"}."""
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels)
+        + "}"
+    )
+
+
+def format_value(value) -> str:
+    """Returns a number or +Inf in the text format."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def merge_snapshots(snapshots) -> dict:
+    """Returns the sum of the snapshots of many collectors."""
+    counters = {}
+    histograms = {}
+    buckets = METRICS_DURATION_BUCKETS
+    for snapshot in snapshots:
+        buckets = tuple(snapshot.get("buckets", buckets))
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, bucket_counts, total, count in snapshot["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, [[0] * len(bucket_counts), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], bucket_counts)]
+            merged[1] += total
+            merged[2] += count
+    return {
+        "buckets": list(buckets),
+        "counters": [
+            [name, labels, value] for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [name, labels, bucket_counts, total, count]
+            for (name, labels), (bucket_counts, total, count) in histograms.items()
+        ],
+    }
+
+
+def render_snapshot(snapshot: dict) -> str:
+    """Returns the metrics of a snapshot in the text format of Prometheus."""
+    samples = {name: [] for name in METRICS}
+    buckets = snapshot.get("buckets", METRICS_DURATION_BUCKETS)
+    for name, labels, value in sorted(snapshot["counters"]):
+        samples[name].append(
+            f"{METRICS_NAMESPACE}_{name}{format_labels(labels)} {format_value(value)}",
+        )
+    for name, labels, bucket_counts, total, count in sorted(snapshot["histograms"]):
+        metric_name = f"{METRICS_NAMESPACE}_{name}"
+        cumulative = 0
+        for upper_bound, bucket_count in zip(
+            list(buckets) + ["+Inf"],
+            bucket_counts,
+        ):
+            cumulative += bucket_count
+            bucket_labels = list(labels) + [["le", format_value(upper_bound)]]
+            samples[name].append(
+                f"{metric_name}_bucket{format_labels(bucket_labels)} {cumulative}",
+            )
+        samples[name].append(
+            f"{metric_name}_sum{format_labels(labels)} {format_value(total)}",
+        )
+        samples[name].append(f"{metric_name}_count{format_labels(labels)} {count}")
+    lines = []
+    for name, (metric_type, description) in METRICS.items():
+        if not samples[name]:
+            continue
+        lines.append(f"# HELP {METRICS_NAMESPACE}_{name} {description}")
+        lines.append(f"# TYPE {METRICS_NAMESPACE}_{name} {metric_type}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class MetricsCollector:
+    """In-process metrics of the validations, the collector is an observer,
+    so it is enabled with enable_metrics or register_observer."""
+
+    def __init__(self, buckets: tuple = METRICS_DURATION_BUCKETS):
+        """:type buckets: tuple :param buckets: The upper bounds of the
+        buckets of the histograms in seconds."""
+        self.buckets = tuple(buckets)
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        self.observe(event)
+
+    def increment(self, name: str, labels: tuple, value: float = 1):
+        """Adds the value to a counter."""
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe_duration(self, name: str, labels: tuple, value: float):
+        """Adds the value to a histogram."""
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self.histograms[(name, labels)] = histogram
+        histogram[0][bisect_left(self.buckets, value)] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+    def observe(self, event):
+        """Updates the metrics with the StageEvent of a stage."""
+        policy = get_policy_label(event.policy)
+        stage_labels = (("stage", event.stage), ("policy", policy))
+        with self._lock:
+            self.increment(
+                "stages_total",
+                stage_labels + (("outcome", event.outcome),),
+            )
+            self.observe_duration(
+                "stage_duration_seconds",
+                stage_labels,
+                event.duration,
+            )
+            if event.bytes_read:
+                self.increment("bytes_read_total", stage_labels, event.bytes_read)
+            if event.seeks:
+                self.increment("seeks_total", stage_labels, event.seeks)
+            if event.stage == VALIDATION:
+                self.increment(
+                    "validations_total",
+                    (("policy", policy), ("outcome", event.outcome)),
+                )
+            elif event.stage == CACHE:
+                self.increment(
+                    "cache_requests_total",
+                    (("policy", policy), ("result", event.outcome)),
+                )
+
+    def snapshot(self) -> dict:
+        """Returns the metrics as a dict that can be turned into json."""
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "counters": [
+                    [name, [list(label) for label in labels], value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                "histograms": [
+                    [
+                        name,
+                        [list(label) for label in labels],
+                        list(counts),
+                        total,
+                        count,
+                    ]
+                    for (name, labels), (
+                        counts,
+                        total,
+                        count,
+                    ) in self.histograms.items()
+                ],
+            }
+
+    def collect(self) -> dict:
+        """Returns the snapshot that is rendered."""
+        return merge_snapshots([self.snapshot()])
+
+    def render(self) -> str:
+        """Returns the metrics in the text format of Prometheus."""
+        return render_snapshot(self.collect())
+
+    def clear(self):
+        """Removes all the metrics."""
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def close(self):
+        """Stops the collector, it is called when the metrics are disabled,
+        the metrics are kept in memory."""
+
+
+class MultiprocessMetricsCollector(MetricsCollector):
+    """Metrics of many processes, every process writes its metrics to its own
+    file in the directory at most every flush_interval seconds, and the
+    metrics of all the files are added together when they are rendered, the
+    metrics that are not written yet are written by a timer when the process
+    goes idle and when the process exits, the files of the processes that
+    exited are kept, so their counts are not lost."""
+
+    def __init__(
+        self,
+        directory: str,
+        flush_interval: float = METRICS_FLUSH_INTERVAL,
+        buckets: tuple = METRICS_DURATION_BUCKETS,
+    ):
+        """:type directory: str :param directory: The directory of the files
+        of the processes, it must be empty when the server starts :type
+        flush_interval: float :param flush_interval: The seconds between two
+        writes of the file of a process, with 0 the file is written after
+        every stage."""
+        super().__init__(buckets=buckets)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.flushed_at = 0.0
+        self.pending = False
+        self._timer = None
+        self._flush_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush_pending)
+
+    @property
+    def path(self) -> str:
+        """The file of the current process."""
+        return os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+
+    def observe(self, event):
+        if self.pid != os.getpid():
+            # The metrics of the parent process are in the file of the parent,
+            # a forked worker starts from zero.
+            # The timer and the lock of the parent are not in the worker.
+            self.clear()
+            self.pid = os.getpid()
+            self.flushed_at = 0.0
+            self.pending = False
+            self._timer = None
+            self._flush_lock = threading.Lock()
+        super().observe(event)
+        self.pending = True
+        delay = self.flush_interval - (time.monotonic() - self.flushed_at)
+        if delay <= 0:
+            self.flush()
+        else:
+            self.schedule_flush(delay)
+
+    def schedule_flush(self, delay: float):
+        """Starts a timer that writes the file after delay seconds, unless a
+        timer is already started, so the last metrics of a process that goes
+        idle are written too."""
+        with self._flush_lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(delay, self.flush_pending)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush_pending(self):
+        """Writes the file if some metrics of the current process are not
+        written yet, it runs when the timer ends and when the process exits, a
+        forked worker that observed nothing does not write the metrics of its
+        parent."""
+        if self.pending and self.pid == os.getpid():
+            self.flush()
+
+    def flush(self):
+        """Writes the metrics of the current process to its file, the file is
+        replaced at once, so a reader never sees half of it."""
+        with self._flush_lock:
+            self.pending = False
+            self._timer = None
+            snapshot = self.snapshot()
+            file_descriptor, temporary_path = tempfile.mkstemp(
+                dir=self.directory,
+                suffix=".tmp",
+            )
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file, separators=(",", ":"))
+            os.replace(temporary_path, self.path)
+            self.flushed_at = time.monotonic()
+
+    def close(self):
+        """Writes the metrics that are not written yet and stops the timer,
+        the file is no longer written at exit."""
+        with self._flush_lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+        self.flush_pending()
+        atexit.unregister(self.flush_pending)
+
+    def collect(self) -> dict:
+        """Returns the metrics of all the processes."""
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path, encoding="utf-8") as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+        return merge_snapshots(snapshots)
+
+
+_METRICS_COLLECTOR = None
+_METRICS_COLLECTOR_LOCK = threading.Lock()
+
+
+def enable_metrics(
+    directory: str = None,
+    flush_interval: float = METRICS_FLUSH_INTERVAL,
+) -> MetricsCollector:
+    """Starts collecting the metrics of the validations and returns the
+    collector, if a directory is given or the FILE_VALIDATOR_METRICS_DIR
+    environment variable is set, the metrics of all the processes that use
+    that directory are aggregated."""
+    global _METRICS_COLLECTOR  # pylint: disable=global-statement
+    directory = directory or os.environ.get(METRICS_DIRECTORY_ENVIRONMENT_VARIABLE)
+    with _METRICS_COLLECTOR_LOCK:
+        if _METRICS_COLLECTOR is not None:
+            unregister_observer(_METRICS_COLLECTOR)
+            _METRICS_COLLECTOR.close()
+        if directory:
+            _METRICS_COLLECTOR = MultiprocessMetricsCollector(
+                directory,
+                flush_interval=flush_interval,
+            )
+        else:
+            _METRICS_COLLECTOR = MetricsCollector()
+        register_observer(_METRICS_COLLECTOR)
+        return _METRICS_COLLECTOR
+
+
+def disable_metrics():
+    """Stops collecting the metrics."""
+    global _METRICS_COLLECTOR  # pylint: disable=global-statement
+    with _METRICS_COLLECTOR_LOCK:
+        if _METRICS_COLLECTOR is not None:
+            unregister_observer(_METRICS_COLLECTOR)
+            _METRICS_COLLECTOR.close()
+        _METRICS_COLLECTOR = None
+
+
+def get_metrics_collector() -> MetricsCollector:
+    """Returns the collector of the metrics, or None if the metrics are not
+    enabled."""
+    return _METRICS_COLLECTOR
+
+
+def render_metrics() -> str:
+    """Returns the metrics in the text format of Prometheus, or an empty
+    string if the metrics are not enabled."""
+    collector = get_metrics_collector()
+    return collector.render() if collector is not None else ""
@@ -7,37 +7,46 @@ libraries It is called safe mode
 """
 
 from django.core.exceptions import ValidationError
-from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.db.models import FileField
 from django.utils.deconstruct import deconstructible
 from humanize import naturalsize
-from termcolor import colored
-
-from file_validator.constants import (
-    ALL,
-    FILE_SIZE_IS_NOT_VALID,
-    FILETYPE,
-    MAX_UPLOAD_SIZE_IS_EMPTY,
-    MIMETYPES,
-    PURE_MAGIC,
-    PYTHON_MAGIC,
-)
+
+from file_validator.cache import get_verdict_cache
+from file_validator.constants import FILE_SIZE_IS_NOT_VALID, MAX_UPLOAD_SIZE_IS_EMPTY
 from file_validator.exceptions import (
     error_message,
     FileValidationException,
     SizeValidationException,
 )
-from file_validator.utils import (
-    all_mimes_is_equal,
-    is_library_supported,
-    is_type_supported,
-    parameters_are_empty,
-    set_the_acceptable_mimes,
-    set_the_library,
-)
+from file_validator.policy import compile_validation_policy, get_validation_policy
+from file_validator.signals import get_started_at, send_file_validated
+from file_validator.utils import set_the_acceptable_mimes
 from file_validator.validators import FileValidator
 
 
+def get_file_validator(uploaded_file, file_size: int = None, **kwargs):
+    """Returns a file validator for an uploaded file, if the file was written
+    to a temporary file, the temporary file is validated, otherwise the file
+    is validated from memory, so small uploads never have to touch the disk.
+
+    :param uploaded_file: The file of the field, such as
+    TemporaryUploadedFile or InMemoryUploadedFile :type file_size: int,
+    optional :param file_size: The size of the file that is already
+    known by django :return: FileValidator
+    """
+    if hasattr(uploaded_file, "temporary_file_path"):
+        return FileValidator(
+            file_path=uploaded_file.temporary_file_path(),
+            **kwargs,
+        )
+    return FileValidator.from_stream(
+        uploaded_file,
+        file_name=uploaded_file.name,
+        file_size=file_size,
+        **kwargs,
+    )
+
+
 class ValidatedFileField(FileField):
     """:return: If everything is OK, it will return None, otherwise it will
     return a ValidationError."""
@@ -59,6 +68,13 @@ class ValidatedFileField(FileField):
         with django by     default, Supported libraries for validation
         operations:     python_magic, pure_magic, filetype, mimetypes,
         all, default
+        :type verdict_cache: BaseVerdictCache, str, optional :param
+            verdict_cache: The cache of the verdicts, or the name of a
+            django cache in the CACHES setting
+        :type quorum_weights: dict, optional :param quorum_weights: The
+            libraries of the quorum library and their weights
+        :type quorum_threshold: float, optional :param quorum_threshold:
+            The part of the total weight that must accept the file
         :raises ValueError: If the mime list is empty, raised a value error
         :raises ValueError: If the library you entered is not supported,
                 raised a value error, Supported library: filetype,
@@ -69,19 +85,22 @@ class ValidatedFileField(FileField):
         self.acceptable_mimes: list = kwargs.pop("acceptable_mimes", None)
         self.acceptable_types: list = kwargs.pop("acceptable_types", None)
         libraries: list = kwargs.pop("libraries", None)
+        self.quorum_weights: dict = kwargs.pop("quorum_weights", None)
+        self.quorum_threshold: float = kwargs.pop("quorum_threshold", None)
+        self.verdict_cache = get_verdict_cache(kwargs.pop("verdict_cache", None))
 
-        parameters_are_empty(
+        self.policy = compile_validation_policy(
+            libraries=libraries,
             acceptable_mimes=self.acceptable_mimes,
             acceptable_types=self.acceptable_types,
+            max_upload_file_size=self.max_upload_file_size,
+            quorum_weights=self.quorum_weights,
+            quorum_threshold=self.quorum_threshold,
         )
 
-        all_mimes_is_equal(self.acceptable_mimes)
-
         self.acceptable_mimes = set_the_acceptable_mimes(self.acceptable_mimes)
 
-        self.libraries = set_the_library(libraries)
-
-        is_type_supported(acceptable_types=self.acceptable_types)
+        self.libraries = list(self.policy.libraries)
 
         super().__init__(*args, **kwargs)
 
@@ -91,6 +110,10 @@ class ValidatedFileField(FileField):
         kwargs["acceptable_types"] = self.acceptable_types
         kwargs["libraries"] = self.libraries
         kwargs["max_upload_file_size"] = self.max_upload_file_size
+        if self.quorum_weights is not None:
+            kwargs["quorum_weights"] = self.quorum_weights
+        if self.quorum_threshold is not None:
+            kwargs["quorum_threshold"] = self.quorum_threshold
         return name, path, args, kwargs
 
     def clean(self, *args, **kwargs):
@@ -101,35 +124,26 @@ class ValidatedFileField(FileField):
         except AttributeError:
             file_mime_guessed_by_django = None
         file_size = data.size
-        file_path = TemporaryUploadedFile.temporary_file_path(current_file)
+        started_at = get_started_at(type(self))
+        file_validator = None
         try:
-            file_validator = FileValidator(
-                file_path=file_path,
-                libraries=self.libraries,
-                acceptable_mimes=self.acceptable_mimes,
-                acceptable_types=self.acceptable_types,
-                max_upload_file_size=self.max_upload_file_size,
+            file_validator = get_file_validator(
+                current_file,
+                file_size=file_size,
+                policy=self.policy,
                 file_mime_guessed_by_django=file_mime_guessed_by_django,
+                verdict_cache=self.verdict_cache,
             )
-            if self.acceptable_mimes is not None:
-                for library in self.libraries:
-                    if library == ALL:
-                        file_validator.validate()
-                    elif library == PYTHON_MAGIC:
-                        file_validator.python_magic()
-                    elif library == PURE_MAGIC:
-                        file_validator.pure_magic()
-                    elif library == MIMETYPES:
-                        file_validator.mimetypes()
-                    elif library == FILETYPE:
-                        file_validator.filetype()
-                    else:
-                        file_validator.django()
-            if self.acceptable_types is not None:
-                file_validator.validate_type()
-            if self.max_upload_file_size is not None:
-                file_validator.validate_size()
+            file_validator.run_validation()
         except (FileValidationException, SizeValidationException) as error:
+            if started_at is not None:
+                send_file_validated(
+                    type(self),
+                    started_at,
+                    current_file.name,
+                    file_validator,
+                    error=error,
+                )
             raise ValidationError(
                 error_message(
                     acceptable_mimes=self.acceptable_mimes,
@@ -142,6 +156,13 @@ class ValidatedFileField(FileField):
                     else 0,
                 ),
             ) from error
+        if started_at is not None:
+            send_file_validated(
+                type(self),
+                started_at,
+                current_file.name,
+                file_validator,
+            )
         setattr(data, "validation_data", file_validator.result_of_validation)
         return data
 
@@ -156,6 +177,9 @@ class DjangoFileValidator:
         acceptable_mimes: list = None,
         acceptable_types: list = None,
         max_upload_file_size: int = None,
+        verdict_cache=None,
+        quorum_weights: dict = None,
+        quorum_threshold: float = None,
     ):
         """:type acceptable_mimes: list :param acceptable_mimes: The mimes you
         want the file to be checked based on, example: image/png :type
@@ -173,6 +197,13 @@ class DjangoFileValidator:
         with django by     default, Supported libraries for validation
         operations:     python_magic, pure_magic, filetype, mimetypes,
         all, default
+        :type verdict_cache: BaseVerdictCache, str, optional :param
+            verdict_cache: The cache of the verdicts, or the name of a
+            django cache in the CACHES setting
+        :type quorum_weights: dict, optional :param quorum_weights: The
+            libraries of the quorum library and their weights
+        :type quorum_threshold: float, optional :param quorum_threshold:
+            The part of the total weight that must accept the file
         :raises ValueError: If the mime list is empty, raised a value error
         :raises ValueError: If the library you entered is not supported,
                 raised a value error, Supported library: filetype,
@@ -182,59 +213,51 @@ class DjangoFileValidator:
         """
         self.max_upload_file_size = None
         self.acceptable_types: list = acceptable_types
-        self.libraries = set_the_library(libraries)
+        self.verdict_cache = get_verdict_cache(verdict_cache)
 
         if max_upload_file_size is not None:
             self.max_upload_file_size = max_upload_file_size
 
-        parameters_are_empty(
+        self.policy = compile_validation_policy(
+            libraries=libraries,
             acceptable_mimes=acceptable_mimes,
             acceptable_types=acceptable_types,
+            max_upload_file_size=self.max_upload_file_size,
+            quorum_weights=quorum_weights,
+            quorum_threshold=quorum_threshold,
         )
 
-        all_mimes_is_equal(acceptable_mimes)
+        self.libraries = list(self.policy.libraries)
 
         self.acceptable_mimes = set_the_acceptable_mimes(acceptable_mimes)
 
-        is_type_supported(acceptable_types=self.acceptable_types)
-
     def __call__(self, value):
         current_file = value.file
         file_size = value.size
-        file_path = TemporaryUploadedFile.temporary_file_path(current_file)
         try:
             file_mime_guessed_by_django = current_file.content_type
         except AttributeError:
             file_mime_guessed_by_django = None
+        started_at = get_started_at(type(self))
+        file_validator = None
         try:
-            file_validator = FileValidator(
-                file_path=file_path,
-                libraries=self.libraries,
-                acceptable_mimes=self.acceptable_mimes,
-                acceptable_types=self.acceptable_types,
-                max_upload_file_size=self.max_upload_file_size,
+            file_validator = get_file_validator(
+                current_file,
+                file_size=file_size,
+                policy=self.policy,
                 file_mime_guessed_by_django=file_mime_guessed_by_django,
+                verdict_cache=self.verdict_cache,
             )
-            if self.acceptable_mimes is not None:
-                for library in self.libraries:
-                    is_library_supported(library)
-                    if library == ALL:
-                        file_validator.validate()
-                    elif library == PYTHON_MAGIC:
-                        file_validator.python_magic()
-                    elif library == PURE_MAGIC:
-                        file_validator.pure_magic()
-                    elif library == MIMETYPES:
-                        file_validator.mimetypes()
-                    elif library == FILETYPE:
-                        file_validator.filetype()
-                    else:
-                        file_validator.django()
-            if self.acceptable_types is not None:
-                file_validator.validate_type()
-            if self.max_upload_file_size is not None:
-                file_validator.validate_size()
+            file_validator.run_validation()
         except (FileValidationException, SizeValidationException) as error:
+            if started_at is not None:
+                send_file_validated(
+                    type(self),
+                    started_at,
+                    current_file.name,
+                    file_validator,
+                    error=error,
+                )
             raise ValidationError(
                 error_message(
                     acceptable_mimes=self.acceptable_mimes,
@@ -247,6 +270,13 @@ class DjangoFileValidator:
                     else 0,
                 ),
             ) from error
+        if started_at is not None:
+            send_file_validated(
+                type(self),
+                started_at,
+                current_file.name,
+                file_validator,
+            )
 
     def __eq__(self, other):
         return (
@@ -255,6 +285,7 @@ class DjangoFileValidator:
             and self.acceptable_mimes == other.acceptable_mimes
             and self.acceptable_types == other.acceptable_types
             and self.max_upload_file_size == other.max_upload_file_size
+            and self.policy == other.policy
         )
 
     def __hash__(self):
@@ -275,21 +306,32 @@ class FileSizeValidator:
         everything is OK, it will return None, otherwise it will return a
         ValidationError."""
         if max_upload_file_size is None:
-            raise SizeValidationException(colored(MAX_UPLOAD_SIZE_IS_EMPTY, "red"))
+            raise SizeValidationException(MAX_UPLOAD_SIZE_IS_EMPTY)
 
         self.max_upload_file_size = max_upload_file_size
+        self.policy = get_validation_policy(max_upload_file_size=max_upload_file_size)
 
     def __call__(self, value):
         current_file = value.file
         file_size = value.size
-        file_path = TemporaryUploadedFile.temporary_file_path(current_file)
+        started_at = get_started_at(type(self))
+        file_validator = None
         try:
-            file_validator = FileValidator(
-                file_path=file_path,
-                max_upload_file_size=self.max_upload_file_size,
+            file_validator = get_file_validator(
+                current_file,
+                file_size=file_size,
+                policy=self.policy,
             )
             file_validator.validate_size()
         except SizeValidationException as error:
+            if started_at is not None:
+                send_file_validated(
+                    type(self),
+                    started_at,
+                    current_file.name,
+                    file_validator,
+                    error=error,
+                )
             raise ValidationError(
                 error_message(
                     current_file_name=current_file.name,
@@ -298,6 +340,13 @@ class FileSizeValidator:
                     message=FILE_SIZE_IS_NOT_VALID,
                 ),
             ) from error
+        if started_at is not None:
+            send_file_validated(
+                type(self),
+                started_at,
+                current_file.name,
+                file_validator,
+            )
 
     def __eq__(self, other):
         return (
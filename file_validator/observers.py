@@ -0,0 +1,195 @@
+"""In this module, there are the hooks of file validator, an observer is a
+callable that is called with a StageEvent after every stage of a validation,
+such as a library, the type, the extension, the size, the verdict cache and
+the whole validation, so the time of every library can be sent to any tracing
+or metrics system, if no observer is registered, a stage only checks that the
+observers are empty."""
+import logging
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+from file_validator.constants import ERROR, OK, REJECTED
+from file_validator.exceptions import FileValidationException, SizeValidationException
+
+logger = logging.getLogger(__name__)
+
+_OBSERVERS: tuple = ()
+_OBSERVERS_LOCK = threading.Lock()
+
+
+class StageEvent:
+    """What happened in one stage of the validation of a file."""
+
+    __slots__ = (
+        "stage",
+        "file_name",
+        "policy",
+        "duration",
+        "bytes_read",
+        "seeks",
+        "outcome",
+        "file_mime",
+        "error",
+    )
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        stage: str,
+        file_name: str = None,
+        policy=None,
+        duration: float = 0.0,
+        bytes_read: int = 0,
+        seeks: int = 0,
+        outcome: str = OK,
+        file_mime: str = None,
+        error: Exception = None,
+    ):
+        """:type stage: str :param stage: The name of the stage, the name of
+        the library for the libraries, such as python_magic, or type,
+        extension, size, cache and validation :type file_name: str :param
+        file_name: The name of the file :param policy: The ValidationPolicy of
+        the validation :type duration: float :param duration: The seconds the
+        stage took :type bytes_read: int :param bytes_read: The bytes of the
+        file that were read in the stage :type seeks: int :param seeks: The
+        seeks of the file in the stage :type outcome: str :param outcome:
+        ok, rejected or error, and hit or miss for the cache :type file_mime:
+        str, optional :param file_mime: The mime that the stage detected
+        :type error: Exception, optional :param error: The error of the
+        stage."""
+        self.stage = stage
+        self.file_name = file_name
+        self.policy = policy
+        self.duration = duration
+        self.bytes_read = bytes_read
+        self.seeks = seeks
+        self.outcome = outcome
+        self.file_mime = file_mime
+        self.error = error
+
+    def __repr__(self):
+        return (
+            f"StageEvent(stage={self.stage!r}, outcome={self.outcome!r}, "
+            f"duration={self.duration!r})"
+        )
+
+
+def register_observer(observer):
+    """Registers an observer, an observer is a callable that takes a
+    StageEvent, it is called in the thread that ran the stage, so in the
+    concurrent mode it must be thread-safe, it can be used as a decorator."""
+    global _OBSERVERS  # pylint: disable=global-statement
+    with _OBSERVERS_LOCK:
+        if observer not in _OBSERVERS:
+            _OBSERVERS = _OBSERVERS + (observer,)
+    return observer
+
+
+def unregister_observer(observer):
+    """Removes an observer, nothing happens if it is not registered."""
+    global _OBSERVERS  # pylint: disable=global-statement
+    with _OBSERVERS_LOCK:
+        _OBSERVERS = tuple(
+            registered for registered in _OBSERVERS if registered != observer
+        )
+
+
+def get_observers() -> tuple:
+    """Returns the registered observers."""
+    return _OBSERVERS
+
+
+def has_observers() -> bool:
+    """Returns True if an observer is registered."""
+    return bool(_OBSERVERS)
+
+
+def notify_observers(event: StageEvent):
+    """Calls every observer with the event, an error of an observer is logged
+    and never stops the validation."""
+    for observer in _OBSERVERS:
+        try:
+            observer(event)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("observer %r failed on %r", observer, event)
+
+
+def get_outcome(error: Exception) -> str:
+    """Returns rejected if the file is not valid, otherwise error."""
+    if isinstance(error, (FileValidationException, SizeValidationException)):
+        return REJECTED
+    return ERROR
+
+
+def notify_stage(
+    file_validator,
+    stage: str,
+    started_at: float,
+    bytes_read: int,
+    seeks: int = 0,
+    outcome: str = OK,
+    file_mime: str = None,
+    error: Exception = None,
+):
+    """Calls the observers with the event of a stage of the file validator
+    that started at started_at, when the sample had read bytes_read bytes and
+    seeked seeks times."""
+    sample = file_validator.sample
+    notify_observers(
+        StageEvent(
+            stage,
+            file_name=Path(file_validator.file_path).name,
+            policy=file_validator.policy,
+            duration=time.perf_counter() - started_at,
+            bytes_read=sample.bytes_read - bytes_read,
+            seeks=sample.seek_count - seeks,
+            outcome=outcome,
+            file_mime=file_mime,
+            error=error,
+        ),
+    )
+
+
+def observed_stage(stage: str):
+    """Decorates a method of the file validator, so the observers are called
+    after the method with the time, the bytes read and the outcome of the
+    stage."""
+
+    def decorator(method):
+        @wraps(method)
+        def run_stage(file_validator):
+            if not _OBSERVERS:
+                return method(file_validator)
+            sample = file_validator.sample
+            bytes_read = sample.bytes_read
+            seeks = sample.seek_count
+            started_at = time.perf_counter()
+            try:
+                result = method(file_validator)
+            except Exception as error:
+                notify_stage(
+                    file_validator,
+                    stage,
+                    started_at,
+                    bytes_read,
+                    seeks,
+                    outcome=get_outcome(error),
+                    file_mime=getattr(error, "file_mime", None),
+                    error=error,
+                )
+                raise
+            notify_stage(
+                file_validator,
+                stage,
+                started_at,
+                bytes_read,
+                seeks,
+                file_mime=result.get("file_mime") if hasattr(result, "get") else None,
+            )
+            return result
+
+        return run_stage
+
+    return decorator
@@ -0,0 +1,258 @@
+"""In this module, there is the validation policy, which is the settings of a
+validation compiled once, the acceptable mimes, types and extensions are kept
+as frozensets and the methods that run are resolved in advance, identical
+settings share one policy, so the file validator does no configuration work
+for every file."""
+import hashlib
+import json
+from functools import lru_cache
+
+from file_validator.constants import (
+    ALL,
+    FAST,
+    FILETYPE,
+    MIMETYPES,
+    NATIVE,
+    PURE_MAGIC,
+    PYTHON_MAGIC,
+    QUORUM,
+    QUORUM_IS_NOT_VALID,
+    QUORUM_LIBRARIES,
+    QUORUM_THRESHOLD,
+    QUORUM_WEIGHTS,
+    SUPPORTED_TYPES,
+    VALIDATION_POLICY_CACHE_SIZE,
+)
+from file_validator.exceptions import format_size, QuorumNotValidException
+from file_validator.utils import (
+    all_mimes_is_equal,
+    is_type_supported,
+    parameters_are_empty,
+    set_the_library,
+)
+
+LIBRARY_METHODS: dict = {
+    ALL: "validate",
+    PYTHON_MAGIC: "python_magic",
+    PURE_MAGIC: "pure_magic",
+    MIMETYPES: "mimetypes",
+    FILETYPE: "filetype",
+    NATIVE: "native",
+    FAST: "validate_fast",
+    QUORUM: "validate_quorum",
+}
+
+
+def to_tuple(values):
+    """Returns the values as a tuple, or None if there are no values."""
+    return tuple(values) if values is not None else None
+
+
+def get_quorum_weights(quorum_weights: dict = None) -> tuple:
+    """Returns the weights of the quorum as a tuple of library and weight,
+    the cheapest libraries come first so the expensive ones can be
+    skipped."""
+    weights = quorum_weights if quorum_weights is not None else QUORUM_WEIGHTS
+    return tuple(
+        sorted(
+            dict(weights).items(),
+            key=lambda item: QUORUM_LIBRARIES.index(item[0])
+            if item[0] in QUORUM_LIBRARIES
+            else len(QUORUM_LIBRARIES),
+        ),
+    )
+
+
+def is_quorum_valid(quorum_weights: dict = None, quorum_threshold: float = None):
+    """If a library of the quorum is not supported, a weight is negative or
+    the threshold is not between 0 and 1, a QuorumNotValidException error is
+    thrown."""
+    weights = dict(quorum_weights) if quorum_weights is not None else {}
+    threshold = quorum_threshold if quorum_threshold is not None else QUORUM_THRESHOLD
+    if (
+        any(library not in QUORUM_LIBRARIES for library in weights)
+        or any(weight < 0 for weight in weights.values())
+        or not 0 <= threshold < 1
+    ):
+        raise QuorumNotValidException(
+            QUORUM_IS_NOT_VALID.format(libraries=QUORUM_LIBRARIES),
+        )
+
+
+class ValidationPolicy:
+    """The compiled settings of a validation, a policy must not be changed
+    after it is created, it is created with get_validation_policy, so
+    identical settings share one instance."""
+
+    __slots__ = (
+        "libraries",
+        "acceptable_mimes",
+        "acceptable_types",
+        "acceptable_extensions",
+        "max_upload_file_size",
+        "max_upload_file_size_text",
+        "quorum_weights",
+        "quorum_threshold",
+        "mimes",
+        "types",
+        "extensions",
+        "types_are_supported",
+        "plan",
+        "fingerprint",
+    )
+
+    def __init__(
+        self,
+        libraries: tuple = None,
+        acceptable_mimes: tuple = None,
+        acceptable_types: tuple = None,
+        acceptable_extensions: tuple = None,
+        max_upload_file_size: int = None,
+        quorum_weights: tuple = None,
+        quorum_threshold: float = None,
+    ):
+        """:type libraries: tuple, optional :param libraries: The libraries of
+        the validation, if it is not set, all the libraries are used :type
+        acceptable_mimes: tuple, optional :param acceptable_mimes: The mimes
+        that are accepted :type acceptable_types: tuple, optional :param
+        acceptable_types: The types that are accepted, such as image or audio
+        :type acceptable_extensions: tuple, optional :param
+        acceptable_extensions: The extensions that are accepted :type
+        max_upload_file_size: int, optional :param max_upload_file_size: The
+        max size of the file in bytes :type quorum_weights: tuple, optional
+        :param quorum_weights: The libraries of the quorum mode and their
+        weights :type quorum_threshold: float, optional :param
+        quorum_threshold: The part of the total weight that must accept the
+        file in the quorum mode."""
+        self.libraries = libraries if libraries is not None else (ALL,)
+        self.acceptable_mimes = acceptable_mimes
+        self.acceptable_types = acceptable_types
+        self.acceptable_extensions = acceptable_extensions
+        self.max_upload_file_size = max_upload_file_size
+        self.max_upload_file_size_text = (
+            format_size(max_upload_file_size) if max_upload_file_size is not None else 0
+        )
+        self.quorum_weights = (
+            quorum_weights if quorum_weights is not None else get_quorum_weights()
+        )
+        self.quorum_threshold = (
+            quorum_threshold if quorum_threshold is not None else QUORUM_THRESHOLD
+        )
+        self.mimes = frozenset(acceptable_mimes or ())
+        self.types = frozenset(acceptable_types or ())
+        self.extensions = frozenset(acceptable_extensions or ())
+        self.types_are_supported = all(
+            acceptable_type.lower() in SUPPORTED_TYPES
+            for acceptable_type in acceptable_types or ()
+        )
+        self.plan = self.get_plan()
+        self.fingerprint = hashlib.sha256(
+            json.dumps(self.get_key(), default=str).encode(),
+        ).hexdigest()
+
+    def __repr__(self):
+        return f"ValidationPolicy(plan={self.plan!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, ValidationPolicy) and self.get_key() == other.get_key()
+
+    def __hash__(self):
+        return hash(self.get_key())
+
+    def __reduce__(self):
+        return intern_validation_policy, self.get_key()
+
+    def get_key(self) -> tuple:
+        """Returns the settings that identify the policy."""
+        return (
+            self.libraries,
+            self.acceptable_mimes,
+            self.acceptable_types,
+            self.acceptable_extensions,
+            self.max_upload_file_size,
+            self.quorum_weights,
+            self.quorum_threshold,
+        )
+
+    def get_plan(self) -> tuple:
+        """Returns the names of the methods of the file validator that run,
+        in order, the libraries come first, then the type, the extension and
+        the size, a library that is not known is validated with django."""
+        plan = []
+        if self.acceptable_mimes is not None:
+            for library in self.libraries:
+                plan.append(LIBRARY_METHODS.get(library, "django"))
+        if self.acceptable_types is not None:
+            plan.append("validate_type")
+        if self.acceptable_extensions is not None:
+            plan.append("validate_extension")
+        if self.max_upload_file_size is not None:
+            plan.append("validate_size")
+        return tuple(plan)
+
+
+@lru_cache(maxsize=VALIDATION_POLICY_CACHE_SIZE)
+def intern_validation_policy(*key) -> ValidationPolicy:
+    """Returns the policy of the settings, the same instance is returned for
+    the same settings."""
+    return ValidationPolicy(*key)
+
+
+def get_validation_policy(
+    libraries=None,
+    acceptable_mimes=None,
+    acceptable_types=None,
+    acceptable_extensions=None,
+    max_upload_file_size: int = None,
+    quorum_weights: dict = None,
+    quorum_threshold: float = None,
+) -> ValidationPolicy:
+    """Returns the shared policy of the settings, the settings are not
+    checked, use compile_validation_policy for the settings of a field."""
+    return intern_validation_policy(
+        to_tuple(libraries) if libraries is not None else (ALL,),
+        to_tuple(acceptable_mimes),
+        to_tuple(acceptable_types),
+        to_tuple(acceptable_extensions),
+        max_upload_file_size,
+        get_quorum_weights(quorum_weights),
+        quorum_threshold if quorum_threshold is not None else QUORUM_THRESHOLD,
+    )
+
+
+def compile_validation_policy(
+    libraries: list = None,
+    acceptable_mimes: list = None,
+    acceptable_types: list = None,
+    acceptable_extensions: list = None,
+    max_upload_file_size: int = None,
+    quorum_weights: dict = None,
+    quorum_threshold: float = None,
+) -> ValidationPolicy:
+    """Checks the settings of a field or a validator and returns their shared
+    policy.
+
+    :raises EmptyParametersException: If acceptable_mimes and
+    acceptable_types are both empty :raises MimesEqualException: If all
+    the mimes are the same :raises LibraryNotSupportedException: If a
+    library is not supported :raises TypeNotSupportedException: If a
+    type is not supported :raises QuorumNotValidException: If the
+    weights or the threshold of the quorum are not valid
+    """
+    parameters_are_empty(
+        acceptable_mimes=acceptable_mimes,
+        acceptable_types=acceptable_types,
+    )
+    all_mimes_is_equal(acceptable_mimes)
+    libraries = set_the_library(libraries)
+    is_type_supported(acceptable_types=acceptable_types)
+    is_quorum_valid(quorum_weights, quorum_threshold)
+    return get_validation_policy(
+        libraries=libraries,
+        acceptable_mimes=acceptable_mimes,
+        acceptable_types=acceptable_types,
+        acceptable_extensions=acceptable_extensions,
+        max_upload_file_size=max_upload_file_size,
+        quorum_weights=quorum_weights,
+        quorum_threshold=quorum_threshold,
+    )
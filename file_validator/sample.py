@@ -0,0 +1,570 @@
+"""In this module, there is the sample of a file that is shared by all the
+detection libraries, the head and the tail of the file are read only once and
+then the same bytes are given to filetype, puremagic, python-magic and the
+type classifier, every read and seek of the file goes through an accounting
+reader, so no more than the head and the tail can be read, the head and the
+tail of a file are read into a buffer of the buffer pool, which is given back
+to the pool when the validation is over."""
+import hashlib
+import mmap
+import os
+
+from file_validator.buffer_pool import get_buffer_pool
+from file_validator.constants import (
+    DIGEST_CHUNK_SIZE,
+    READ_BUDGET_EXCEEDED,
+    SAMPLE_HEAD_SIZE,
+    SAMPLE_TAIL_SIZE,
+)
+from file_validator.exceptions import ReadBudgetException
+
+
+class AccountingReader:
+    """A file whose reads and seeks are counted, if a budget is set, reading
+    more bytes than the budget raises ReadBudgetException."""
+
+    __slots__ = ("file", "budget", "bytes_read", "seek_count", "offset")
+
+    def __init__(self, file, budget: int = None):
+        """:param file: A binary file-like object :type budget: int, optional
+        :param budget: The maximum number of bytes that can be read."""
+        self.file = file
+        self.budget = budget
+        self.bytes_read = 0
+        self.seek_count = 0
+        self.offset = None
+
+    def check_budget(self, size: int):
+        """Raises ReadBudgetException if reading size more bytes goes over
+        the budget."""
+        if self.budget is not None and self.bytes_read + size > self.budget:
+            raise ReadBudgetException(
+                READ_BUDGET_EXCEEDED.format(
+                    bytes_read=self.bytes_read + size,
+                    budget=self.budget,
+                ),
+            )
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads at most size bytes, or up to the end of the file."""
+        if self.budget is not None:
+            if size is None or size < 0:
+                # One byte more than the budget shows if the file is longer.
+                size = self.budget - self.bytes_read + 1
+            else:
+                self.check_budget(size)
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        if self.offset is not None:
+            self.offset += len(data)
+        self.check_budget(0)
+        return data
+
+    def readinto_at(self, buffer, offset: int, file_descriptor: int = None) -> int:
+        """Reads into the buffer from offset until the buffer is full or the
+        file ends and returns the number of bytes read, with the descriptor of
+        a file the bytes are read with os.preadv, which does not move the
+        position of the file, a read that does not start where the previous
+        read ended is counted as a seek."""
+        view = memoryview(buffer)
+        self.check_budget(view.nbytes)
+        if self.offset is None:
+            self.offset = self.file.tell()
+        if offset != self.offset:
+            if file_descriptor is None:
+                self.seek(offset)
+            else:
+                self.seek_count += 1
+        count = 0
+        while count < view.nbytes:
+            if file_descriptor is None:
+                chunk_count = readinto(self.file, view[count:])
+            else:
+                chunk_count = os.preadv(file_descriptor, [view[count:]], offset + count)
+            if not chunk_count:
+                break
+            count += chunk_count
+        self.bytes_read += count
+        self.offset = offset + count
+        return count
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Moves the position of the file and returns the new position."""
+        self.seek_count += 1
+        self.offset = self.file.seek(offset, whence)
+        return self.offset
+
+    def tell(self) -> int:
+        """Returns the position of the file."""
+        return self.file.tell()
+
+
+def readinto(file, buffer) -> int:
+    """Reads into the buffer with the readinto method of the file, or with
+    read if the file has no readinto method."""
+    readinto_file = getattr(file, "readinto", None)
+    if readinto_file is not None:
+        return readinto_file(buffer) or 0
+    data = file.read(len(buffer))
+    buffer[: len(data)] = data
+    return len(data)
+
+
+def read_head_and_tail_into(
+    reader: AccountingReader,
+    buffer: bytearray,
+    size: int,
+    head_size: int,
+    tail_size: int,
+    file_descriptor: int = None,
+):
+    """Reads the head and the tail of a seekable file into the buffer and
+    returns views of them, the tail is right after the head in the buffer, so
+    the head and the tail together are also one view of the buffer."""
+    view = memoryview(buffer)
+    head_length = reader.readinto_at(
+        view[: min(head_size, size)],
+        0,
+        file_descriptor=file_descriptor,
+    )
+    tail_start = max(head_length, size - tail_size)
+    tail_length = 0
+    if tail_start < size:
+        tail_length = reader.readinto_at(
+            view[head_length : head_length + size - tail_start],
+            tail_start,
+            file_descriptor=file_descriptor,
+        )
+    # The libraries get read-only views, which can also be hashed.
+    return (
+        view[:head_length].toreadonly(),
+        view[head_length : head_length + tail_length].toreadonly(),
+    )
+
+
+def hash_file(file, chunk_size: int = DIGEST_CHUNK_SIZE):
+    """Returns the sha256 of a file from its current position to the end and
+    the number of bytes that were read."""
+    digest = hashlib.sha256()
+    bytes_read = 0
+    chunk = file.read(chunk_size)
+    while chunk:
+        digest.update(chunk)
+        bytes_read += len(chunk)
+        chunk = file.read(chunk_size)
+    return digest.hexdigest(), bytes_read
+
+
+class FileSample:
+    """Head and tail bytes of a file, read once per validation."""
+
+    def __init__(
+        self,
+        file_path: str,
+        head_size: int = SAMPLE_HEAD_SIZE,
+        tail_size: int = SAMPLE_TAIL_SIZE,
+    ):
+        """:type file_path: str :param file_path: The path of the file that is
+        sampled :type head_size: int :param head_size: The number of bytes read
+        from the start of the file :type tail_size: int :param tail_size: The
+        number of bytes read from the end of the file."""
+        self.file_path = file_path
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self.open_count = 0
+        self.bytes_read = 0
+        self.seek_count = 0
+        self._head = None
+        self._tail = None
+        self._size = None
+        self._digest = None
+        self._buffer = None
+
+    @property
+    def read_budget(self) -> int:
+        """The maximum number of bytes that are read for the head and the
+        tail."""
+        return self.head_size + self.tail_size
+
+    def account(self, reader: AccountingReader):
+        """Adds the bytes read and the seeks of the reader to the sample."""
+        self.bytes_read += reader.bytes_read
+        self.seek_count += reader.seek_count
+
+    def read(self):
+        """Returns views of the head and the tail of the file, which are read
+        into a buffer of the pool."""
+        with open(self.file_path, "rb", buffering=0) as file:
+            self.open_count += 1
+            self._size = os.fstat(file.fileno()).st_size
+            reader = AccountingReader(file, budget=self.read_budget)
+            self._buffer = get_buffer_pool().acquire(self.read_budget)
+            try:
+                return read_head_and_tail_into(
+                    reader,
+                    self._buffer,
+                    self._size,
+                    self.head_size,
+                    self.tail_size,
+                    file_descriptor=file.fileno() if hasattr(os, "preadv") else None,
+                )
+            finally:
+                self.account(reader)
+
+    def release(self):
+        """Gives the buffer of the head and the tail back to the pool, the
+        views of the head and the tail must not be used after that, the head
+        and the tail are read again if the sample is used again."""
+        if self._buffer is None:
+            return
+        buffer = self._buffer
+        self._buffer = None
+        self._head = None
+        self._tail = None
+        get_buffer_pool().release(buffer)
+
+    def get_size(self) -> int:
+        """Returns the size of the file without reading the file."""
+        return os.path.getsize(self.file_path)
+
+    def read_digest(self) -> str:
+        """Returns the sha256 of the whole file."""
+        with open(self.file_path, "rb") as file:
+            self.open_count += 1
+            digest, bytes_read = hash_file(file)
+        self.bytes_read += bytes_read
+        return digest
+
+    def content_digest(self) -> str:
+        """Returns the sha256 of the whole content of the file, unlike the
+        head and the tail, the whole file has to be read for the digest."""
+        if self._digest is None:
+            self._digest = self.read_digest()
+        return self._digest
+
+    def load(self):
+        """Reads the head and the tail of the file, the file is read only the
+        first time this method is called."""
+        if self._head is not None:
+            return
+        head, tail = self.read()
+        self._head = head
+        self._tail = tail
+
+    @property
+    def head(self) -> bytes:
+        """The first bytes of the file."""
+        self.load()
+        return self._head
+
+    @property
+    def tail(self) -> bytes:
+        """The last bytes of the file that are not already in the head, if the
+        file is small, the head and the tail together are the whole file."""
+        self.load()
+        return self._tail
+
+    @property
+    def size(self) -> int:
+        """The size of the file in bytes, if the file has not been read yet,
+        the size is taken without reading the file."""
+        if self._size is None:
+            self._size = self.get_size()
+        return self._size
+
+    @property
+    def content(self) -> bytes:
+        """The head and the tail joined together, the start and the end of
+        this value are the same as the start and the end of the file."""
+        head, tail = self.head, self.tail
+        if self._buffer is not None:
+            # puremagic keeps the content in sets, so it needs bytes.
+            return bytes(memoryview(self._buffer)[: len(head) + len(tail)])
+        return head + tail
+
+
+class BytesSample(FileSample):
+    """Head and tail of a file whose content is in memory, such as bytes,
+    bytearray or memoryview."""
+
+    def __init__(
+        self,
+        data,
+        head_size: int = SAMPLE_HEAD_SIZE,
+        tail_size: int = SAMPLE_TAIL_SIZE,
+    ):
+        """:type data: bytes, bytearray, memoryview :param data: The content
+        of the file, a buffer of items larger than a byte, such as an array,
+        is read as its bytes."""
+        super().__init__(None, head_size=head_size, tail_size=tail_size)
+        self.data = memoryview(data).cast("B")
+
+    def read(self):
+        size = self.data.nbytes
+        head = bytes(self.data[: self.head_size])
+        tail = bytes(self.data[max(len(head), size - self.tail_size) :])
+        self.bytes_read += len(head) + len(tail)
+        return head, tail
+
+    def get_size(self) -> int:
+        return self.data.nbytes
+
+    def read_digest(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+
+class StreamSample(FileSample):
+    """Head and tail of a file-like object, if the stream is seekable only the
+    head and the tail are read, otherwise the stream is read to the end, only
+    the last bytes are kept and the digest of the content is taken on the
+    way."""
+
+    def __init__(
+        self,
+        stream,
+        head_size: int = SAMPLE_HEAD_SIZE,
+        tail_size: int = SAMPLE_TAIL_SIZE,
+        size: int = None,
+    ):
+        """:param stream: A binary file-like object with a read method :type
+        size: int, optional :param size: The size of the stream if it is
+        already known, such as the size of an uploaded file."""
+        super().__init__(None, head_size=head_size, tail_size=tail_size)
+        self.stream = stream
+        self._size = size
+
+    def is_seekable(self) -> bool:
+        """Returns True if the stream can be seeked."""
+        seekable = getattr(self.stream, "seekable", None)
+        if seekable is not None:
+            return seekable()
+        return hasattr(self.stream, "seek") and hasattr(self.stream, "tell")
+
+    def read(self):
+        if self.is_seekable():
+            reader = AccountingReader(self.stream, budget=self.read_budget)
+            position = reader.tell()
+            self._size = reader.seek(0, os.SEEK_END)
+            reader.seek(0)
+            self._buffer = get_buffer_pool().acquire(self.read_budget)
+            try:
+                return read_head_and_tail_into(
+                    reader,
+                    self._buffer,
+                    self._size,
+                    self.head_size,
+                    self.tail_size,
+                )
+            finally:
+                reader.seek(position)
+                self.account(reader)
+        # The tail of a stream that can not be seeked is only found at its
+        # end, so the whole stream is read and it has no read budget.
+        reader = AccountingReader(self.stream)
+        try:
+            digest = hashlib.sha256()
+            head = b""
+            while len(head) < self.head_size:
+                chunk = reader.read(self.head_size - len(head))
+                if not chunk:
+                    break
+                head += chunk
+            digest.update(head)
+            tail = b""
+            chunk = reader.read(self.head_size)
+            while chunk:
+                digest.update(chunk)
+                tail = (tail + chunk)[-self.tail_size :] if self.tail_size else b""
+                chunk = reader.read(self.head_size)
+        finally:
+            self.account(reader)
+        self._size = reader.bytes_read
+        self._digest = digest.hexdigest()
+        return head, tail
+
+    def get_size(self) -> int:
+        if self.is_seekable():
+            position = self.stream.tell()
+            size = self.stream.seek(0, os.SEEK_END)
+            self.stream.seek(position)
+            return size
+        self.load()
+        return self._size
+
+    def read_digest(self) -> str:
+        if self.is_seekable():
+            position = self.stream.tell()
+            self.stream.seek(0)
+            try:
+                digest, bytes_read = hash_file(self.stream)
+            finally:
+                self.stream.seek(position)
+            self.bytes_read += bytes_read
+            return digest
+        self.load()
+        return self._digest
+
+
+class StorageSample(StreamSample):
+    """Head and tail of a file in a Django storage, if the storage has a
+    read_range(name, offset, size) method, such as a storage of an object
+    store that sends range requests, only the head and the tail are fetched,
+    otherwise the file is opened with the storage and read as a stream, which
+    only reads the head and the tail if the file of the storage is
+    seekable."""
+
+    def __init__(
+        self,
+        storage,
+        name: str,
+        head_size: int = SAMPLE_HEAD_SIZE,
+        tail_size: int = SAMPLE_TAIL_SIZE,
+    ):
+        """:param storage: A Django storage :type name: str :param name: The
+        name of the file in the storage."""
+        super().__init__(None, head_size=head_size, tail_size=tail_size)
+        self.storage = storage
+        self.name = name
+
+    def read(self):
+        read_range = getattr(self.storage, "read_range", None)
+        if read_range is not None:
+            return self.read_ranges(read_range)
+        with self.storage.open(self.name, "rb") as stream:
+            self.open_count += 1
+            self.stream = stream
+            try:
+                return super().read()
+            finally:
+                self.stream = None
+
+    def read_ranges(self, read_range):
+        """Fetches the head and the tail with the read_range method of the
+        storage."""
+        size = self.size
+        head = read_range(self.name, 0, min(self.head_size, size))
+        tail_start = max(len(head), size - self.tail_size)
+        tail = b""
+        if tail_start < size:
+            tail = read_range(self.name, tail_start, size - tail_start)
+            self.seek_count += 1
+        bytes_read = len(head) + len(tail)
+        self.bytes_read += bytes_read
+        if bytes_read > self.read_budget:
+            raise ReadBudgetException(
+                READ_BUDGET_EXCEEDED.format(
+                    bytes_read=bytes_read,
+                    budget=self.read_budget,
+                ),
+            )
+        return head, tail
+
+    def get_size(self) -> int:
+        return self.storage.size(self.name)
+
+    def read_digest(self) -> str:
+        with self.storage.open(self.name, "rb") as stream:
+            self.open_count += 1
+            digest, bytes_read = hash_file(stream)
+        self.bytes_read += bytes_read
+        return digest
+
+
+class MappedSample(FileSample):
+    """Sample of a file on disk that is mapped into memory, views at any
+    offset of the file are memoryview slices of the map, so a structural
+    check can jump to the end of a large file, such as the end of central
+    directory of a zip or the moov atom of an mp4, without copying or reading
+    the middle of the file, the pages that are not viewed are never read."""
+
+    def __init__(
+        self,
+        file_path: str,
+        head_size: int = SAMPLE_HEAD_SIZE,
+        tail_size: int = SAMPLE_TAIL_SIZE,
+    ):
+        super().__init__(file_path, head_size=head_size, tail_size=tail_size)
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def map(self):
+        """The read-only map of the file, it is created the first time it is
+        used, an empty file has no map and is not opened again."""
+        if self._map is None and self._size != 0:
+            with open(self.file_path, "rb") as file:
+                self.open_count += 1
+                self._size = os.fstat(file.fileno()).st_size
+                if self._size == 0:
+                    return None
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def view(self, offset: int = 0, size: int = None) -> memoryview:
+        """Returns a read-only memoryview of size bytes of the file from
+        offset, a negative offset is counted from the end of the file, the view
+        must be released before the sample is closed."""
+        file_map = self.map
+        if file_map is None:
+            return memoryview(b"")
+        if offset < 0:
+            offset = max(0, len(file_map) + offset)
+        end = len(file_map) if size is None else min(len(file_map), offset + size)
+        view = memoryview(file_map)[offset:end]
+        self.bytes_read += view.nbytes
+        return view
+
+    def rfind(self, sub: bytes, start: int = 0, end: int = None) -> int:
+        """Returns the last offset of sub in the file between start and end,
+        or -1, only the pages of the file that are searched are read."""
+        file_map = self.map
+        if file_map is None:
+            return -1
+        end = len(file_map) if end is None else end
+        return file_map.rfind(sub, max(0, start), end)
+
+    def read(self):
+        size = self.size
+        head = self.view(0, self.head_size)
+        tail_start = max(len(head), size - self.tail_size)
+        tail = self.view(tail_start) if tail_start < size else memoryview(b"")
+        return head, tail
+
+    def read_digest(self) -> str:
+        file_map = self.map
+        if file_map is None:
+            return hashlib.sha256(b"").hexdigest()
+        self.bytes_read += len(file_map)
+        return hashlib.sha256(file_map).hexdigest()
+
+    @property
+    def content(self) -> bytes:
+        # puremagic keeps the content in sets, so it needs bytes.
+        return bytes(self.head) + bytes(self.tail)
+
+    def release(self):
+        """Releases the views of the head and the tail and closes the map of
+        the file, the file is mapped again if the sample is used again, a view
+        that is still used elsewhere keeps the map open until it is freed."""
+        for view in (self._head, self._tail):
+            if view is not None:
+                view.release()
+        self._head = None
+        self._tail = None
+        if self._map is None:
+            return
+        file_map = self._map
+        self._map = None
+        try:
+            file_map.close()
+        except BufferError:
+            pass
+
+    def close(self):
+        """Closes the map of the file."""
+        self.release()
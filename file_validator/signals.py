@@ -0,0 +1,45 @@
+"""In this module, there are the signals of the Django entry points of file
+validator, ValidatedFileField, DjangoFileValidator and FileSizeValidator send
+file_validated after every file, the time is taken only if a receiver is
+connected."""
+import time
+
+from django.dispatch import Signal
+
+from file_validator.constants import OK
+from file_validator.observers import get_outcome
+
+# Sent with file_name, file_validator, duration, outcome, result_of_validation
+# and error, the sender is the class of the field or the validator.
+file_validated = Signal()
+
+
+def get_started_at(sender):
+    """Returns the current time if a receiver of file_validated is connected
+    for the sender, otherwise None, so nothing is timed."""
+    if file_validated.has_listeners(sender):
+        return time.perf_counter()
+    return None
+
+
+def send_file_validated(
+    sender,
+    started_at: float,
+    file_name: str,
+    file_validator=None,
+    error: Exception = None,
+):
+    """Sends file_validated for a file whose validation started at
+    started_at, file_validator is None if the validation failed before the
+    file validator was created."""
+    file_validated.send(
+        sender=sender,
+        file_name=file_name,
+        file_validator=file_validator,
+        duration=time.perf_counter() - started_at,
+        outcome=get_outcome(error) if error is not None else OK,
+        result_of_validation=file_validator.result_of_validation
+        if file_validator is not None and error is None
+        else None,
+        error=error,
+    )
@@ -0,0 +1,205 @@
+"""In this module, there is the native detection engine of file validator, the
+magic numbers of the supported mimes are compiled once into a trie of bytes for
+every offset, so the head of a file is matched against all the signatures in a
+single pass without any third-party library."""
+import threading
+
+from file_validator.constants import ARCHIVE, AUDIO, FONT, IMAGE, VIDEO
+
+
+class Signature:
+    """The magic number of a mime, a signature can have more than one part,
+    such as RIFF at the start and WEBP at the eighth byte."""
+
+    __slots__ = ("mime", "extension", "file_type", "parts", "length")
+
+    def __init__(
+        self,
+        mime: str,
+        extension: str,
+        file_type: str,
+        magic: bytes,
+        offset: int = 0,
+        extra_parts: tuple = (),
+    ):
+        """:type mime: str :param mime: The mime of the files that have this
+        signature :type extension: str :param extension: The usual extension
+        of the files, such as .png :type file_type: str :param file_type: The
+        overall type of the files, such as image or audio :type magic: bytes
+        :param magic: The bytes of the first part :type offset: int :param
+        offset: The position of the first part :type extra_parts: tuple
+        :param extra_parts: The other parts as tuples of offset and bytes."""
+        self.mime = mime
+        self.extension = extension
+        self.file_type = file_type
+        self.parts = ((offset, bytes(magic)),) + tuple(
+            (part_offset, bytes(part_magic)) for part_offset, part_magic in extra_parts
+        )
+        self.length = sum(len(part_magic) for _, part_magic in self.parts)
+
+    def __repr__(self):
+        return f"Signature(mime={self.mime!r}, extension={self.extension!r})"
+
+    def match_extra_parts(self, header) -> bool:
+        """Returns True if the parts after the first part are in the
+        header."""
+        for offset, magic in self.parts[1:]:
+            if header[offset : offset + len(magic)] != magic:
+                return False
+        return True
+
+
+SIGNATURES: list = [
+    # image
+    Signature("image/jpeg", ".jpg", IMAGE, b"\xff\xd8\xff"),
+    Signature("image/png", ".png", IMAGE, b"\x89PNG\r\n\x1a\n"),
+    Signature("image/gif", ".gif", IMAGE, b"GIF87a"),
+    Signature("image/gif", ".gif", IMAGE, b"GIF89a"),
+    Signature("image/webp", ".webp", IMAGE, b"RIFF", extra_parts=((8, b"WEBP"),)),
+    Signature("image/bmp", ".bmp", IMAGE, b"BM"),
+    Signature("image/tiff", ".tif", IMAGE, b"II*\x00"),
+    Signature("image/tiff", ".tif", IMAGE, b"MM\x00*"),
+    Signature("image/x-icon", ".ico", IMAGE, b"\x00\x00\x01\x00"),
+    Signature("image/vnd.adobe.photoshop", ".psd", IMAGE, b"8BPS"),
+    Signature("image/heic", ".heic", IMAGE, b"ftypheic", offset=4),
+    Signature("image/heic", ".heic", IMAGE, b"ftypheix", offset=4),
+    Signature("image/avif", ".avif", IMAGE, b"ftypavif", offset=4),
+    # video
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypmp41", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypmp42", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypisom", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypiso2", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypavc1", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypdash", offset=4),
+    Signature("video/mp4", ".mp4", VIDEO, b"ftypMSNV", offset=4),
+    Signature("video/x-m4v", ".m4v", VIDEO, b"ftypM4V", offset=4),
+    Signature("video/quicktime", ".mov", VIDEO, b"ftypqt  ", offset=4),
+    Signature("video/3gpp", ".3gp", VIDEO, b"ftyp3gp", offset=4),
+    Signature("video/x-matroska", ".mkv", VIDEO, b"\x1aE\xdf\xa3"),
+    Signature("video/x-msvideo", ".avi", VIDEO, b"RIFF", extra_parts=((8, b"AVI "),)),
+    Signature("video/x-flv", ".flv", VIDEO, b"FLV\x01"),
+    Signature("video/mpeg", ".mpg", VIDEO, b"\x00\x00\x01\xba"),
+    Signature("video/mpeg", ".mpg", VIDEO, b"\x00\x00\x01\xb3"),
+    Signature("video/x-ms-wmv", ".wmv", VIDEO, b"0&\xb2u\x8ef\xcf\x11"),
+    # audio
+    Signature("audio/mpeg", ".mp3", AUDIO, b"ID3"),
+    Signature("audio/mpeg", ".mp3", AUDIO, b"\xff\xfb"),
+    Signature("audio/mpeg", ".mp3", AUDIO, b"\xff\xf3"),
+    Signature("audio/mpeg", ".mp3", AUDIO, b"\xff\xf2"),
+    Signature("audio/aac", ".aac", AUDIO, b"\xff\xf1"),
+    Signature("audio/aac", ".aac", AUDIO, b"\xff\xf9"),
+    Signature("audio/mp4", ".m4a", AUDIO, b"ftypM4A", offset=4),
+    Signature("audio/x-wav", ".wav", AUDIO, b"RIFF", extra_parts=((8, b"WAVE"),)),
+    Signature("audio/x-aiff", ".aiff", AUDIO, b"FORM", extra_parts=((8, b"AIFF"),)),
+    Signature("audio/ogg", ".ogg", AUDIO, b"OggS"),
+    Signature("audio/x-flac", ".flac", AUDIO, b"fLaC"),
+    Signature("audio/midi", ".mid", AUDIO, b"MThd"),
+    Signature("audio/amr", ".amr", AUDIO, b"#!AMR"),
+    # font
+    Signature("application/font-sfnt", ".ttf", FONT, b"\x00\x01\x00\x00\x00"),
+    Signature("application/font-sfnt", ".otf", FONT, b"OTTO"),
+    Signature("application/font-woff", ".woff", FONT, b"wOFF"),
+    Signature("application/font-woff", ".woff2", FONT, b"wOF2"),
+    # archive
+    Signature("application/zip", ".zip", ARCHIVE, b"PK\x03\x04"),
+    Signature("application/zip", ".zip", ARCHIVE, b"PK\x05\x06"),
+    Signature("application/zip", ".zip", ARCHIVE, b"PK\x07\x08"),
+    Signature("application/x-rar-compressed", ".rar", ARCHIVE, b"Rar!\x1a\x07"),
+    Signature("application/gzip", ".gz", ARCHIVE, b"\x1f\x8b\x08"),
+    Signature("application/x-bzip2", ".bz2", ARCHIVE, b"BZh"),
+    Signature("application/x-7z-compressed", ".7z", ARCHIVE, b"7z\xbc\xaf'\x1c"),
+    Signature("application/x-xz", ".xz", ARCHIVE, b"\xfd7zXZ\x00"),
+    Signature("application/zstd", ".zst", ARCHIVE, b"(\xb5/\xfd"),
+    Signature("application/x-tar", ".tar", ARCHIVE, b"ustar", offset=257),
+    Signature("application/pdf", ".pdf", ARCHIVE, b"%PDF"),
+    Signature("application/x-msdownload", ".exe", ARCHIVE, b"MZ"),
+    Signature("application/x-sqlite3", ".sqlite", ARCHIVE, b"SQLite format 3\x00"),
+]
+
+
+class TrieNode:
+    """A node of the signature trie, the children are indexed by the next
+    byte and the signatures end at this node."""
+
+    __slots__ = ("children", "signatures")
+
+    def __init__(self):
+        self.children = {}
+        self.signatures = []
+
+
+class SignatureTrie:
+    """The signatures compiled into one trie of bytes for every offset, the
+    first level of a trie is a dispatch table of the first byte."""
+
+    def __init__(self, signatures: list = None):
+        """:type signatures: list, optional :param signatures: The signatures
+        of the trie, if it is not set, the built-in signatures are used."""
+        self.roots = {}
+        self.header_size = 0
+        self._lock = threading.Lock()
+        for signature in SIGNATURES if signatures is None else signatures:
+            self.add(signature)
+
+    def add(self, signature: Signature):
+        """Adds a signature to the trie."""
+        offset, magic = signature.parts[0]
+        with self._lock:
+            node = self.roots.setdefault(offset, TrieNode())
+            for byte in magic:
+                node = node.children.setdefault(byte, TrieNode())
+            node.signatures.append(signature)
+            for part_offset, part_magic in signature.parts:
+                self.header_size = max(
+                    self.header_size,
+                    part_offset + len(part_magic),
+                )
+
+    def match(self, header) -> Signature:
+        """Returns the most specific signature that matches the header, or
+        None if no signature matches, the signature with more known bytes
+        wins, the roots are copied first, so a signature that is added at the
+        same time does not change them during the loop."""
+        result = None
+        for offset, node in tuple(self.roots.items()):
+            for byte in header[offset : offset + self.header_size]:
+                node = node.children.get(byte)
+                if node is None:
+                    break
+                for signature in node.signatures:
+                    if (
+                        result is None or signature.length > result.length
+                    ) and signature.match_extra_parts(header):
+                        result = signature
+        return result
+
+
+_SIGNATURE_TRIE = SignatureTrie()
+
+
+def get_signature_trie() -> SignatureTrie:
+    """Returns the trie of the built-in signatures and the signatures that are
+    registered with register_signature."""
+    return _SIGNATURE_TRIE
+
+
+def register_signature(
+    mime: str,
+    magic: bytes,
+    offset: int = 0,
+    extension: str = None,
+    file_type: str = None,
+    extra_parts: tuple = (),
+) -> Signature:
+    """Adds a signature to the native detection engine, for example, a mime
+    that is used only in your project."""
+    signature = Signature(
+        mime,
+        extension,
+        file_type if file_type is not None else mime.split("/")[0],
+        magic,
+        offset=offset,
+        extra_parts=extra_parts,
+    )
+    get_signature_trie().add(signature)
+    return signature
@@ -1,14 +1,13 @@
 """Utils for file validator."""
+from functools import lru_cache
 from itertools import groupby
 
-from filetype import is_archive, is_audio, is_font, is_image, is_video
-from termcolor import colored
-
 from file_validator.constants import (
     ALL_SUPPORTED_LIBRARIES,
     ARCHIVE,
     AUDIO,
     FONT,
+    HEADER_ONLY_LIBRARIES,
     IMAGE,
     LIBRARY_IS_NOT_SUPPORTED,
     MIMES_IS_EQUAL,
@@ -16,6 +15,7 @@ from file_validator.constants import (
     SELECTING_ALL_SUPPORTED_LIBRARIES,
     SUPPORTED_TYPES,
     TYPE_NOT_SUPPORTED,
+    TYPE_SAMPLE_SIZE,
     VIDEO,
 )
 from file_validator.exceptions import (
@@ -24,6 +24,34 @@ from file_validator.exceptions import (
     MimesEqualException,
     TypeNotSupportedException,
 )
+from file_validator.signatures import get_signature_trie
+
+
+@lru_cache(maxsize=None)
+def get_type_matchers() -> tuple:
+    """Returns the matchers of filetype with their overall type, in the order
+    video, image, audio, font and archive, filetype is imported the first
+    time the matchers are needed."""
+    # pylint: disable=import-outside-toplevel
+    from filetype.match import (
+        archive_matchers,
+        audio_matchers,
+        font_matchers,
+        image_matchers,
+        video_matchers,
+    )
+
+    return tuple(
+        (file_type, matcher)
+        for file_type, matchers in (
+            (VIDEO, video_matchers),
+            (IMAGE, image_matchers),
+            (AUDIO, audio_matchers),
+            (FONT, font_matchers),
+            (ARCHIVE, archive_matchers),
+        )
+        for matcher in matchers
+    )
 
 
 def all_mimes_is_equal(acceptable_mimes: list):
@@ -35,7 +63,7 @@ def all_mimes_is_equal(acceptable_mimes: list):
         group = groupby(acceptable_mimes)
         mimes_is_equal = next(group, True) and not next(group, False)
         if mimes_is_equal:
-            raise MimesEqualException(colored(MIMES_IS_EQUAL, "red"))
+            raise MimesEqualException(MIMES_IS_EQUAL)
     return None
 
 
@@ -50,7 +78,7 @@ def is_library_supported(library: str):
             library=library,
             libraries=ALL_SUPPORTED_LIBRARIES,
         )
-        raise LibraryNotSupportedException(colored(message, "red"))
+        raise LibraryNotSupportedException(message)
 
 
 def generate_information_about_file(
@@ -80,26 +108,35 @@ def generate_information_about_file(
     return result
 
 
-def guess_the_type(file_path: str) -> str:
+def classify_the_type(header: bytes) -> tuple:
+    """Returns the overall type and the mime of a file from its head in one
+    pass, the signatures of the native detection engine are looked up first,
+    and if none of them matches, the matchers of filetype are tried once in
+    the order video, image, audio, font and archive."""
+    signature = get_signature_trie().match(header)
+    if signature is not None and signature.file_type in SUPPORTED_TYPES:
+        return signature.file_type, signature.mime
+    header = bytes(header[:TYPE_SAMPLE_SIZE])
+    for file_type, matcher in get_type_matchers():
+        if matcher.match(header):
+            return file_type, matcher.mime
+    return None, None
+
+
+def guess_the_type(file_path: str = None, header: bytes = None) -> str:
     """This function is used to guess the overall type of file such image,
-    audio, video, font and archive."""
-    if is_video(file_path):
-        return VIDEO
-    if is_image(file_path):
-        return IMAGE
-    if is_audio(file_path):
-        return AUDIO
-    if is_font(file_path):
-        return FONT
-    if is_archive(file_path):
-        return ARCHIVE
-    return None
+    audio, video, font and archive, if the header of the file is given, the
+    file is not read again."""
+    if header is None:
+        with open(file_path, "rb") as file:
+            header = file.read(TYPE_SAMPLE_SIZE)
+    return classify_the_type(header)[0]
 
 
 def parameters_are_empty(acceptable_types: list, acceptable_mimes: list):
     """This function check whether parameters are empty or no?"""
     if acceptable_types is None and acceptable_mimes is None:
-        raise EmptyParametersException(colored(PARAMETERS_ARE_EMPTY, "red"))
+        raise EmptyParametersException(PARAMETERS_ARE_EMPTY)
 
 
 def is_type_supported(acceptable_types: list):
@@ -108,7 +145,7 @@ def is_type_supported(acceptable_types: list):
     if acceptable_types is not None:
         for acceptable_type in acceptable_types:
             if acceptable_type not in SUPPORTED_TYPES:
-                raise TypeNotSupportedException(colored(TYPE_NOT_SUPPORTED, "red"))
+                raise TypeNotSupportedException(TYPE_NOT_SUPPORTED)
 
 
 def set_the_library(libraries: list):
@@ -123,6 +160,14 @@ def set_the_library(libraries: list):
     return result
 
 
+def needs_the_tail(libraries) -> bool:
+    """Returns True if one of the libraries reads the end of the file, the
+    other libraries only read the head, so their sample needs no tail."""
+    if libraries is None:
+        return True
+    return any(library not in HEADER_ONLY_LIBRARIES for library in libraries)
+
+
 def set_the_acceptable_mimes(acceptable_mimes):
     """This function for set the acceptable mimes."""
     if acceptable_mimes is not None:
@@ -1,44 +1,112 @@
 """In this module, there is a file validator for python, and it uses different
 libraries such as filetype, python-magic, mimetypes, and files are validated
 based on mimes, extensions, and magic numbers; The termcolor library is also
-used to color the error messages."""
+used to color the error messages, every library is imported the first time it
+is used, so a validator that only checks the size never loads them."""
 
 import os
-import platform
-from mimetypes import guess_type
+import threading
+import time
+from functools import cached_property
 from pathlib import Path
 
-import magic
-import puremagic
-from dotenv import load_dotenv
-from filetype import guess
-from humanize import naturalsize
-from puremagic import PureError
-from termcolor import colored
-
+from file_validator.cache import Verdict
 from file_validator.constants import (
+    CACHE,
+    CONCURRENT_LIBRARIES_MAX_WORKERS,
+    DEFAULT_FILE_NAME,
     DJANGO,
     ERROR_MESSAGE_FOR_EXTENSION_VALIDATION,
     ERROR_MESSAGE_FOR_MIME_VALIDATION,
     ERROR_MESSAGE_FOR_TYPE_VALIDATION,
+    EXTENSION,
     FILE_SIZE_IS_NOT_VALID,
     FILETYPE,
+    HIT,
     MIME_NOT_VALID,
     MIMETYPES,
+    MISS,
+    NATIVE,
     OK,
     PURE_MAGIC,
     PYTHON_MAGIC,
+    PYTHON_MAGIC_SAMPLE_SIZE,
+    QUORUM,
+    REJECTED,
+    SAMPLE_HEAD_SIZE,
+    SAMPLE_TAIL_SIZE,
     SIZE,
-    SUPPORTED_TYPES,
+    TIERS,
+    TYPE,
     TYPE_NOT_SUPPORTED,
+    VALIDATION,
 )
 from file_validator.exceptions import (
-    error_message,
     FileValidationException,
+    format_size,
     SizeValidationException,
     TypeNotSupportedException,
 )
-from file_validator.utils import generate_information_about_file, guess_the_type
+from file_validator.magic_pool import get_magic_pool
+from file_validator.observers import has_observers, notify_stage, observed_stage
+from file_validator.policy import get_validation_policy, LIBRARY_METHODS
+from file_validator.sample import (
+    BytesSample,
+    FileSample,
+    MappedSample,
+    StorageSample,
+    StreamSample,
+)
+from file_validator.signatures import get_signature_trie
+from file_validator.utils import (
+    classify_the_type,
+    generate_information_about_file,
+    needs_the_tail,
+)
+
+
+def guess_type(file_path: str) -> tuple:
+    """Guesses the mime of the file from its name with the mimetypes library,
+    mimetypes is imported the first time a mime is guessed."""
+    import mimetypes  # pylint: disable=import-outside-toplevel
+
+    return mimetypes.guess_type(file_path)
+
+
+_LIBRARIES_EXECUTOR = None
+_LIBRARIES_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_libraries_executor():
+    """Returns the thread pool that runs the libraries of the concurrent mode,
+    the pool is created the first time it is used and shared by all the file
+    validators."""
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _LIBRARIES_EXECUTOR  # pylint: disable=global-statement
+    if _LIBRARIES_EXECUTOR is None:
+        with _LIBRARIES_EXECUTOR_LOCK:
+            if _LIBRARIES_EXECUTOR is None:
+                _LIBRARIES_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=CONCURRENT_LIBRARIES_MAX_WORKERS,
+                    thread_name_prefix="file_validator",
+                )
+    return _LIBRARIES_EXECUTOR
+
+
+def reset_libraries_executor():
+    """Drops the thread pool of the libraries in a forked process, the threads
+    of the pool of the parent do not exist in the child, so a task sent to
+    that pool would never run."""
+    # pylint: disable=global-statement
+    global _LIBRARIES_EXECUTOR, _LIBRARIES_EXECUTOR_LOCK
+    _LIBRARIES_EXECUTOR = None
+    _LIBRARIES_EXECUTOR_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_libraries_executor)
 
 
 class FileValidator:
@@ -54,30 +122,187 @@ class FileValidator:
         max_upload_file_size: int = None,
         **kwargs,
     ):
+        policy = kwargs.get("policy")
+        if policy is None:
+            policy = get_validation_policy(
+                libraries=libraries,
+                acceptable_mimes=acceptable_mimes,
+                acceptable_types=kwargs.get("acceptable_types"),
+                acceptable_extensions=kwargs.get("acceptable_extensions"),
+                max_upload_file_size=max_upload_file_size,
+                quorum_weights=kwargs.get("quorum_weights"),
+                quorum_threshold=kwargs.get("quorum_threshold"),
+            )
+        self.policy = policy
         self.file_mime_guessed_by_django = kwargs.get("file_mime_guessed_by_django")
-        self.acceptable_extensions = kwargs.get("acceptable_extensions")
+        self.acceptable_extensions = policy.acceptable_extensions
         self.result_of_validation = {}
-        self.max_upload_file_size = max_upload_file_size
-        self.acceptable_mimes = acceptable_mimes
-        self.acceptable_types = kwargs.get("acceptable_types")
+        self.max_upload_file_size = policy.max_upload_file_size
+        self.acceptable_mimes = policy.acceptable_mimes
+        self.acceptable_types = policy.acceptable_types
         self.file_path = file_path
-        self.libraries = libraries
+        self.libraries = policy.libraries
+        self._sample = kwargs.get("sample")
+        self.verdict_cache = kwargs.get("verdict_cache")
+        self.concurrent = kwargs.get("concurrent", False)
+        self.head_size = kwargs.get("head_size", SAMPLE_HEAD_SIZE)
+        self.tail_size = kwargs.get("tail_size", SAMPLE_TAIL_SIZE)
+
+    @classmethod
+    def from_bytes(cls, data, file_name: str = None, **kwargs):
+        """Creates a file validator for a file whose content is in memory, all
+        the libraries use the content directly and nothing is written to disk.
 
+        :type data: bytes, bytearray, memoryview :param data: The
+        content of the file :type file_name: str, optional :param
+        file_name: The name of the file, it is used for the extension
+        and the mimetypes library :return: FileValidator
+        """
+        return cls(
+            file_path=file_name or DEFAULT_FILE_NAME,
+            sample=BytesSample(
+                data,
+                head_size=kwargs.get("head_size", SAMPLE_HEAD_SIZE),
+                tail_size=kwargs.get("tail_size", SAMPLE_TAIL_SIZE),
+            ),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_stream(
+        cls,
+        stream,
+        file_name: str = None,
+        file_size: int = None,
+        **kwargs,
+    ):
+        """Creates a file validator for a file-like object, only the head and
+        the tail of the stream are read if the stream is seekable.
+
+        :param stream: A binary file-like object :type file_name: str,
+        optional :param file_name: The name of the file, if it is not
+        set, the name of the stream is used :type file_size: int,
+        optional :param file_size: The size of the file if it is already
+        known, then the size is not taken from the stream :return:
+        FileValidator
+        """
+        if file_name is None:
+            stream_name = getattr(stream, "name", None)
+            file_name = stream_name if isinstance(stream_name, str) else None
+        return cls(
+            file_path=file_name or DEFAULT_FILE_NAME,
+            sample=StreamSample(
+                stream,
+                head_size=kwargs.get("head_size", SAMPLE_HEAD_SIZE),
+                tail_size=kwargs.get("tail_size", SAMPLE_TAIL_SIZE),
+                size=file_size,
+            ),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_mapped_file(cls, file_path: str, **kwargs):
+        """Creates a file validator for a file on disk that is mapped into
+        memory, the views of the sample at any offset are not copied, so a
+        structural check can read the end of a large file without reading
+        the middle of it.
+
+        :type file_path: str :param file_path: The path of the file
+        :return: FileValidator
+        """
+        return cls(
+            file_path=file_path,
+            sample=MappedSample(
+                file_path,
+                head_size=kwargs.get("head_size", SAMPLE_HEAD_SIZE),
+                tail_size=kwargs.get("tail_size", SAMPLE_TAIL_SIZE),
+            ),
+            **kwargs,
+        )
+
+    @classmethod
+    def from_storage(cls, storage, name: str, **kwargs):
+        """Creates a file validator for a file that is already in a Django
+        storage, a file of a storage on the local disk is read from its path,
+        for other storages only the head and the tail of the file are read
+        with the read_range method of the storage, or with a seekable file
+        of the storage, and the file is streamed only if it is not seekable,
+        if none of the libraries reads the end of the file, no tail is read.
+
+        :param storage: A Django storage, such as default_storage :type
+        name: str :param name: The name of the file in the storage
+        :return: FileValidator
+        """
+        policy = kwargs.get("policy")
+        libraries = policy.libraries if policy is not None else kwargs.get("libraries")
+        if "tail_size" not in kwargs and not needs_the_tail(libraries):
+            kwargs["tail_size"] = 0
+        try:
+            file_path = storage.path(name)
+        except NotImplementedError:
+            file_path = None
+        if file_path is not None:
+            return cls(file_path=file_path, **kwargs)
+        return cls(
+            file_path=name,
+            sample=StorageSample(
+                storage,
+                name,
+                head_size=kwargs.get("head_size", SAMPLE_HEAD_SIZE),
+                tail_size=kwargs.get("tail_size", SAMPLE_TAIL_SIZE),
+            ),
+            **kwargs,
+        )
+
+    @property
+    def sample(self) -> FileSample:
+        """The head and the tail of the file, which are read only once and
+        shared by all the libraries, no more than head_size and tail_size
+        bytes are read."""
+        if self._sample is None:
+            self._sample = FileSample(
+                self.file_path,
+                head_size=self.head_size,
+                tail_size=self.tail_size,
+            )
+        return self._sample
+
+    def get_mime_error(
+        self,
+        library: str,
+        file_mime: str,
+        file_type: str,
+    ) -> FileValidationException:
+        """Returns the error of a mime that is not acceptable."""
+        current_file = Path(self.file_path)
+        return FileValidationException(
+            library=library,
+            file_name=current_file.name,
+            file_mime=file_mime,
+            file_type=file_type,
+            file_extension=current_file.suffix,
+            acceptable_mimes=self.acceptable_mimes,
+            acceptable_types=self.acceptable_types,
+            acceptable_extensions=self.acceptable_extensions,
+        )
+
+    @cached_property
+    def native_signature(self):
+        """The signature of the file found by the native detection engine, the
+        head of the file is matched only once."""
+        return get_signature_trie().match(self.sample.head)
+
+    @observed_stage(EXTENSION)
     def validate_extension(self):
         """This method for validating the extension of file."""
         current_file = Path(self.file_path)
         file_extension = current_file.suffix
-        if file_extension not in self.acceptable_extensions:
+        if file_extension not in self.policy.extensions:
             raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_name=current_file.name,
-                        current_file_extension=file_extension,
-                        acceptable_extensions=self.acceptable_extensions,
-                        message=ERROR_MESSAGE_FOR_EXTENSION_VALIDATION,
-                    ),
-                    "red",
-                ),
+                template=ERROR_MESSAGE_FOR_EXTENSION_VALIDATION,
+                file_name=current_file.name,
+                file_extension=file_extension,
+                acceptable_extensions=self.acceptable_extensions,
             )
         result_of_validation = {
             "file_extension": file_extension,
@@ -85,88 +310,73 @@ class FileValidator:
         self.result_of_validation.update({SIZE: result_of_validation})
         return result_of_validation
 
+    @observed_stage(SIZE)
     def validate_size(self):
-        """This method for validating the size of file."""
-        file_size = os.path.getsize(self.file_path)
-        current_file = Path(self.file_path)
+        """This method for validating the size of file, the max upload file
+        size is formatted once by the policy."""
+        file_size = self.sample.size
         if (
             self.max_upload_file_size is not None
             and file_size > self.max_upload_file_size
         ):
             raise SizeValidationException(
-                error_message(
-                    current_file_size=naturalsize(file_size),
-                    current_file_name=current_file.name,
-                    max_file_size=naturalsize(self.max_upload_file_size),
-                    message=FILE_SIZE_IS_NOT_VALID,
-                ),
+                template=FILE_SIZE_IS_NOT_VALID,
+                file_name=Path(self.file_path).name,
+                file_size=file_size,
+                max_file_size=self.max_upload_file_size,
             )
         result_of_validation = {
-            "file_size": naturalsize(file_size),
-            "max_upload_file_size": naturalsize(self.max_upload_file_size)
-            if self.max_upload_file_size is not None
-            else 0,
+            "file_size": format_size(file_size),
+            "max_upload_file_size": self.policy.max_upload_file_size_text,
         }
         self.result_of_validation.update({SIZE: result_of_validation})
         return result_of_validation
 
+    @observed_stage(TYPE)
     def validate_type(self):
         """This method for validating the type of file."""
         current_file = Path(self.file_path)
-        for acceptable_type in self.acceptable_types:
-            if acceptable_type.lower() not in SUPPORTED_TYPES:
-                raise TypeNotSupportedException(colored(TYPE_NOT_SUPPORTED, "red"))
-        file_type = guess_the_type(self.file_path)
-        if file_type not in self.acceptable_types:
+        if not self.policy.types_are_supported:
+            raise TypeNotSupportedException(TYPE_NOT_SUPPORTED)
+        file_type, file_mime = classify_the_type(self.sample.head)
+        if file_type not in self.policy.types:
             raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_name=current_file.name,
-                        current_file_type=file_type,
-                        acceptable_mimes=self.acceptable_mimes,
-                        message=ERROR_MESSAGE_FOR_TYPE_VALIDATION,
-                    ),
-                    "red",
-                ),
+                template=ERROR_MESSAGE_FOR_TYPE_VALIDATION,
+                library=FILETYPE,
+                file_name=current_file.name,
+                file_mime=file_mime,
+                file_type=file_type,
+                acceptable_mimes=self.acceptable_mimes,
+                acceptable_types=self.acceptable_types,
             )
-        current_file = Path(self.file_path)
         result_of_validation = generate_information_about_file(
             status=OK,
             library=FILETYPE,
             file_name=current_file.name,
             file_type=file_type,
+            file_mime=file_mime,
             file_extension=current_file.suffix,
         )
         return result_of_validation
 
     def validate_mime(self):
         """This method for validating the mime of file."""
-        load_dotenv()
+        # pylint: disable=import-outside-toplevel
+        import puremagic
+        from filetype import guess
+
         current_file = Path(self.file_path)
-        operating_system_name = platform.system()
-        path_magic_file = os.environ.get("path_magic_file")
-        if path_magic_file and operating_system_name == "Windows":
-            with open(self.file_path, "rb") as file:
-                magic.Magic(magic_file=path_magic_file)
-                guessed_mime_by_python_magic = magic.from_buffer(
-                    file.read(2048),
-                    mime=True,
-                )
-        else:
-            with open(self.file_path, "rb") as file:
-                guessed_mime_by_python_magic = magic.from_buffer(
-                    file.read(2048),
-                    mime=True,
-                )
+        guessed_mime_by_python_magic = get_magic_pool().from_buffer(
+            self.sample.head[:PYTHON_MAGIC_SAMPLE_SIZE],
+        )
 
-        with open(self.file_path, "rb") as file:
-            file_signatures = puremagic.magic_stream(file)
-            file_mimes_by_pure_magic = []
-            for file_signature in file_signatures:
-                file_mimes_by_pure_magic.append(file_signature.mime_type)
+        file_signatures = puremagic.magic_string(self.sample.content)
+        file_mimes_by_pure_magic = []
+        for file_signature in file_signatures:
+            file_mimes_by_pure_magic.append(file_signature.mime_type)
         guessed_mime_by_pure_magic = file_mimes_by_pure_magic[0]
         guessed_mime_by_mimetypes = guess_type(self.file_path)[0]
-        guessed_mime_by_filetype = guess(self.file_path).MIME
+        guessed_mime_by_filetype = guess(self.sample.head).MIME
         guessed_mimes = [
             guessed_mime_by_python_magic,
             guessed_mime_by_pure_magic,
@@ -174,74 +384,217 @@ class FileValidator:
             guessed_mime_by_filetype,
         ]
         for file_mime in guessed_mimes:
-            if file_mime not in self.acceptable_mimes:
+            if file_mime not in self.policy.mimes:
                 raise FileValidationException(
-                    colored(
-                        error_message(
-                            current_file_name=current_file.name,
-                            current_file_mime=file_mime,
-                            acceptable_mimes=self.acceptable_mimes,
-                            message=ERROR_MESSAGE_FOR_MIME_VALIDATION,
-                        ),
-                        "red",
-                    ),
+                    template=ERROR_MESSAGE_FOR_MIME_VALIDATION,
+                    file_name=current_file.name,
+                    file_mime=file_mime,
+                    acceptable_mimes=self.acceptable_mimes,
                 )
 
+    @observed_stage(VALIDATION)
+    def run_validation(self):
+        """This method runs all the validation operations that are configured,
+        the mimes are validated with the selected libraries, then the type, the
+        extension and the size of the file are validated, if a verdict cache is
+        set, a file that was already validated with the same settings is not
+        validated again, the buffer of the sample is given back to the pool at
+        the end."""
+        try:
+            if self.verdict_cache is None:
+                return self.run_validation_without_cache()
+            return self.run_validation_with_cache()
+        finally:
+            self.release_sample()
+
+    def release_sample(self):
+        """Gives the buffer of the head and the tail back to the pool, with
+        concurrent libraries, a library that was still running when another
+        library rejected the file may use the sample, so its buffer is not
+        reused."""
+        if self._sample is not None and not self.concurrent:
+            self._sample.release()
+
+    def run_validation_with_cache(self):
+        """This method runs all the validation operations that are configured
+        if the verdict cache has no verdict for the file."""
+        if has_observers():
+            bytes_read = self.sample.bytes_read
+            seeks = self.sample.seek_count
+            started_at = time.perf_counter()
+        key = self.verdict_cache.get_key(self)
+        verdict = self.verdict_cache.get(key)
+        if has_observers():
+            outcome = HIT if verdict is not None else MISS
+            notify_stage(self, CACHE, started_at, bytes_read, seeks, outcome=outcome)
+        if verdict is not None:
+            return verdict.restore(self)
+        file_name = Path(self.file_path).name
+        try:
+            result_of_validation = self.run_validation_without_cache()
+        except (FileValidationException, SizeValidationException) as error:
+            self.verdict_cache.set(key, Verdict(file_name, error=error))
+            raise
+        self.verdict_cache.set(key, Verdict(file_name, result_of_validation))
+        return result_of_validation
+
+    def run_validation_without_cache(self):
+        """This method runs all the validation operations that are configured
+        without looking at the verdict cache, the methods that run are
+        resolved once by the policy."""
+        for method_name in self.policy.plan:
+            getattr(self, method_name)()
+        return self.result_of_validation
+
+    def get_libraries_of_validate(self) -> list:
+        """Returns the name and the method of every library that validate
+        uses, in the order of the sequential mode."""
+        libraries = [
+            (FILETYPE, self.filetype),
+            (MIMETYPES, self.mimetypes),
+            (PURE_MAGIC, self.pure_magic),
+            (PYTHON_MAGIC, self.python_magic),
+        ]
+        if self.file_mime_guessed_by_django is not None:
+            libraries.append((DJANGO, self.django))
+        return libraries
+
     def validate(self):
         """This method for validating file based on mime using all
-        libraries."""
+        libraries, if concurrent is True, the libraries run at the same
+        time."""
+        if self.concurrent:
+            return self.validate_concurrently()
         validation_data = {}
+        for library, validate_with_library in self.get_libraries_of_validate():
+            validation_data.update({library: validate_with_library()})
+        return validation_data
 
-        validation_data_filetype = self.filetype()
-        validation_data.update({FILETYPE: validation_data_filetype})
-
-        validation_data_mimetypes = self.mimetypes()
-        validation_data.update({MIMETYPES: validation_data_mimetypes})
+    def validate_concurrently(self):
+        """This method runs the libraries of validate at the same time on the
+        same sample, as soon as one library rejects the file, the libraries
+        that have not started are cancelled and the error is raised without
+        waiting for the others, the result is the same as validate."""
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import as_completed
 
-        validation_data_pure_magic = self.pure_magic()
-        validation_data.update({PURE_MAGIC: validation_data_pure_magic})
+        libraries = self.get_libraries_of_validate()
+        self.sample.load()
+        executor = get_libraries_executor()
+        futures = {
+            executor.submit(validate_with_library): library
+            for library, validate_with_library in libraries
+        }
+        validation_data = {}
+        try:
+            for future in as_completed(futures):
+                validation_data[futures[future]] = future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+        result_of_validation = {
+            library: validation_data[library] for library, _ in libraries
+        }
+        for library, data in result_of_validation.items():
+            self.result_of_validation.pop(library, None)
+            self.result_of_validation[library] = data
+        return result_of_validation
 
-        validation_data_python_magic = self.python_magic()
-        validation_data.update({PYTHON_MAGIC: validation_data_python_magic})
+    def is_clear_mime(self, file_mime: str) -> bool:
+        """Returns True if the mime is acceptable and agrees with the mime of
+        the extension and the mime guessed by django, if they are known."""
+        if file_mime is None or file_mime not in self.policy.mimes:
+            return False
+        extension_mime = guess_type(self.file_path)[0]
+        if extension_mime is not None and extension_mime != file_mime:
+            return False
+        return self.file_mime_guessed_by_django in (None, file_mime)
 
-        if self.file_mime_guessed_by_django is not None:
-            validation_data_django = self.django()
-            validation_data.update({DJANGO: validation_data_django})
+    def validate_fast(self):
+        """This method validates the file with the native detection engine,
+        which only reads the head of the file, the file is validated with
+        pure-magic and python-magic only if the native engine does not find
+        the mime, the mime is not acceptable, or it does not agree with the
+        extension or the mime guessed by django, the libraries that ran are
+        kept in the tiers of the result."""
+        signature = self.native_signature
+        if signature is not None and self.is_clear_mime(signature.mime):
+            tiers = [NATIVE]
+            validation_data = {NATIVE: self.native()}
+        else:
+            tiers = [NATIVE, PURE_MAGIC, PYTHON_MAGIC]
+            validation_data = {
+                PURE_MAGIC: self.pure_magic(),
+                PYTHON_MAGIC: self.python_magic(),
+            }
+        self.result_of_validation.update({TIERS: tiers})
+        return validation_data
 
+    def validate_quorum(self):
+        """This method validates the file with the libraries of the quorum,
+        every library has a weight, the file is valid if the libraries that
+        accept it have more than the threshold of the total weight, the
+        cheapest libraries run first and the others are skipped as soon as
+        the verdict can not change."""
+        weights = [
+            (library, weight)
+            for library, weight in self.policy.quorum_weights
+            if library != DJANGO or self.file_mime_guessed_by_django is not None
+        ]
+        remaining_weight = sum(weight for _, weight in weights)
+        required_weight = remaining_weight * self.policy.quorum_threshold
+        accepted_weight = 0
+        rejected_weight = 0
+        votes = {}
+        validation_data = {}
+        error = FileValidationException(MIME_NOT_VALID)
+        for library, weight in weights:
+            if (
+                accepted_weight > required_weight
+                or accepted_weight + remaining_weight <= required_weight
+            ):
+                break
+            remaining_weight -= weight
+            try:
+                validation_data[library] = getattr(
+                    self,
+                    LIBRARY_METHODS.get(library, DJANGO),
+                )()
+            except FileValidationException as library_error:
+                error = library_error
+                rejected_weight += weight
+                votes[library] = REJECTED
+            else:
+                accepted_weight += weight
+                votes[library] = OK
+        is_accepted = accepted_weight > required_weight
+        self.result_of_validation.update(
+            {
+                QUORUM: {
+                    "status": OK if is_accepted else REJECTED,
+                    "accepted_weight": accepted_weight,
+                    "rejected_weight": rejected_weight,
+                    "votes": votes,
+                },
+            },
+        )
+        if not is_accepted:
+            raise error
         return validation_data
 
+    @observed_stage(PYTHON_MAGIC)
     def python_magic(self):
         """This method for validating file based on mime using python-magic
         library."""
-        load_dotenv()
-        operating_system_name = platform.system()
-        path_magic_file = os.environ.get("path_magic_file")
         current_file = Path(self.file_path)
         file_name = current_file.name
         file_extension = current_file.suffix
-        if path_magic_file and operating_system_name == "Windows":
-            with open(self.file_path, "rb") as file:
-                magic.Magic(magic_file=path_magic_file)
-                file_mime = magic.from_buffer(file.read(2048), mime=True)
-        else:
-            with open(self.file_path, "rb") as file:
-                file_mime = magic.from_buffer(file.read(2048), mime=True)
+        file_mime = get_magic_pool().from_buffer(
+            self.sample.head[:PYTHON_MAGIC_SAMPLE_SIZE],
+        )
         file_type = file_mime.split("/")[0]
-        if file_mime not in self.acceptable_mimes:
-            raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_extension=current_file.suffix,
-                        current_file_name=current_file.name,
-                        current_file_mime=file_mime,
-                        current_file_type=file_type,
-                        acceptable_mimes=self.acceptable_mimes,
-                        acceptable_types=self.acceptable_types,
-                        acceptable_extensions=self.acceptable_extensions,
-                    ),
-                    "red",
-                ),
-            )
+        if file_mime not in self.policy.mimes:
+            raise self.get_mime_error(PYTHON_MAGIC, file_mime, file_type)
 
         result_of_validation = generate_information_about_file(
             status=OK,
@@ -254,36 +607,27 @@ class FileValidator:
         self.result_of_validation.update({PYTHON_MAGIC: result_of_validation})
         return result_of_validation
 
+    @observed_stage(PURE_MAGIC)
     def pure_magic(self):
         """This method for validating file based on mime using the pure-magic
         library."""
+        # pylint: disable=import-outside-toplevel
+        import puremagic
+        from puremagic import PureError
+
         current_file = Path(self.file_path)
         try:
-            with open(self.file_path, "rb") as file:
-                file_signatures = puremagic.magic_stream(file)
-                file_mimes = []
-                for file_signature in file_signatures:
-                    file_mimes.append(file_signature.mime_type)
-        except PureError as error:
-            raise FileValidationException(colored(MIME_NOT_VALID, "red")) from error
+            file_signatures = puremagic.magic_string(self.sample.content)
+            file_mimes = []
+            for file_signature in file_signatures:
+                file_mimes.append(file_signature.mime_type)
+        except (PureError, ValueError) as error:
+            raise FileValidationException(MIME_NOT_VALID) from error
 
         file_mime = file_mimes[0]
         file_type = file_mime.split("/")[0]
-        if file_mime not in self.acceptable_mimes:
-            raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_extension=current_file.suffix,
-                        current_file_name=current_file.name,
-                        current_file_mime=file_mime,
-                        current_file_type=file_type,
-                        acceptable_mimes=self.acceptable_mimes,
-                        acceptable_types=self.acceptable_types,
-                        acceptable_extensions=self.acceptable_extensions,
-                    ),
-                    "red",
-                ),
-            )
+        if file_mime not in self.policy.mimes:
+            raise self.get_mime_error(PURE_MAGIC, file_mime, file_type)
 
         result_of_validation = generate_information_about_file(
             status=OK,
@@ -296,30 +640,18 @@ class FileValidator:
         self.result_of_validation.update({PURE_MAGIC: result_of_validation})
         return result_of_validation
 
+    @observed_stage(MIMETYPES)
     def mimetypes(self):
         """This method for validating file based on mime using the mimetypes
         library."""
         current_file = Path(self.file_path)
         file_mime = guess_type(self.file_path)[0]
         if file_mime is None:
-            raise FileValidationException(colored(MIME_NOT_VALID, "red"))
+            raise FileValidationException(MIME_NOT_VALID)
         file_type = file_mime.split("/")[0]
 
-        if file_mime not in self.acceptable_mimes:
-            raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_extension=current_file.suffix,
-                        current_file_name=current_file.name,
-                        current_file_mime=file_mime,
-                        current_file_type=file_type,
-                        acceptable_mimes=self.acceptable_mimes,
-                        acceptable_types=self.acceptable_types,
-                        acceptable_extensions=self.acceptable_extensions,
-                    ),
-                    "red",
-                ),
-            )
+        if file_mime not in self.policy.mimes:
+            raise self.get_mime_error(MIMETYPES, file_mime, file_type)
 
         result_of_validation = generate_information_about_file(
             status=OK,
@@ -332,32 +664,22 @@ class FileValidator:
         self.result_of_validation.update({MIMETYPES: result_of_validation})
         return result_of_validation
 
+    @observed_stage(FILETYPE)
     def filetype(self):
         """This method for validating file based on mime using the filetype
         library."""
+        from filetype import guess  # pylint: disable=import-outside-toplevel
+
         current_file = Path(self.file_path)
 
         try:
-            file_mime = guess(self.file_path).MIME
+            file_mime = guess(self.sample.head).MIME
             file_type = file_mime.split("/")[0]
         except AttributeError as error:
-            raise FileValidationException(colored(MIME_NOT_VALID, "red")) from error
+            raise FileValidationException(MIME_NOT_VALID) from error
 
-        if file_mime not in self.acceptable_mimes:
-            raise FileValidationException(
-                colored(
-                    error_message(
-                        current_file_extension=current_file.suffix,
-                        current_file_name=current_file.name,
-                        current_file_mime=file_mime,
-                        current_file_type=file_type,
-                        acceptable_mimes=self.acceptable_mimes,
-                        acceptable_types=self.acceptable_types,
-                        acceptable_extensions=self.acceptable_extensions,
-                    ),
-                    "red",
-                ),
-            )
+        if file_mime not in self.policy.mimes:
+            raise self.get_mime_error(FILETYPE, file_mime, file_type)
 
         result_of_validation = generate_information_about_file(
             status=OK,
@@ -370,26 +692,43 @@ class FileValidator:
         self.result_of_validation.update({FILETYPE: result_of_validation})
         return result_of_validation
 
+    @observed_stage(NATIVE)
+    def native(self):
+        """This method for validating file based on mime using the native
+        detection engine of file validator."""
+        current_file = Path(self.file_path)
+        signature = self.native_signature
+        if signature is None:
+            raise FileValidationException(MIME_NOT_VALID)
+        file_mime = signature.mime
+        file_type = file_mime.split("/")[0]
+
+        if file_mime not in self.policy.mimes:
+            raise self.get_mime_error(NATIVE, file_mime, file_type)
+
+        result_of_validation = generate_information_about_file(
+            status=OK,
+            library=NATIVE,
+            file_name=current_file.name,
+            file_mime=file_mime,
+            file_type=file_type,
+            file_extension=current_file.suffix,
+        )
+        self.result_of_validation.update({NATIVE: result_of_validation})
+        return result_of_validation
+
+    @observed_stage(DJANGO)
     def django(self):
         """This method for validating file based on mime using data from
         django."""
         try:
             current_file = Path(self.file_path)
             file_type = self.file_mime_guessed_by_django.split("/")[0]
-            if self.file_mime_guessed_by_django not in self.acceptable_mimes:
-                raise FileValidationException(
-                    colored(
-                        error_message(
-                            current_file_extension=current_file.suffix,
-                            current_file_name=current_file.name,
-                            current_file_mime=self.file_mime_guessed_by_django,
-                            current_file_type=file_type,
-                            acceptable_mimes=self.acceptable_mimes,
-                            acceptable_types=self.acceptable_types,
-                            acceptable_extensions=self.acceptable_extensions,
-                        ),
-                        "red",
-                    ),
+            if self.file_mime_guessed_by_django not in self.policy.mimes:
+                raise self.get_mime_error(
+                    DJANGO,
+                    self.file_mime_guessed_by_django,
+                    file_type,
                 )
             result_of_validation = generate_information_about_file(
                 status=OK,
@@ -0,0 +1,12 @@
+"""Views for django."""
+
+from django.http import HttpResponse
+
+from file_validator.constants import PROMETHEUS_CONTENT_TYPE
+from file_validator.metrics import render_metrics
+
+
+def metrics_view(request):  # pylint: disable=unused-argument
+    """Returns the metrics of file validator in the text format of
+    Prometheus, the metrics are collected after enable_metrics is called."""
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
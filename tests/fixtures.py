@@ -1,7 +1,8 @@
 """This file is related to fixtures and constants required for tests."""
+import io
 import os
 
-from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
 
 FAIL: str = "Fail"
 NOT_FOUND: str = "NOT_FOUND"
@@ -94,3 +95,19 @@ def get_tmp_file(file_name, file_path, file_mime_type):
         tmp_file.file = file
         tmp_file.size = os.fstat(tmp_file.fileno()).st_size
         return tmp_file
+
+
+def get_in_memory_file(file_name, file_path, file_mime_type):
+    """:param file_name: The name of the test file :param file_path: The path
+    of the test file :param file_mime_type: The mime of the test file :return:
+    The test file as an uploaded file that is kept in memory."""
+    with open(file_path, "rb") as file:
+        content = file.read()
+    return InMemoryUploadedFile(
+        io.BytesIO(content),
+        "test_file",
+        file_name,
+        file_mime_type,
+        len(content),
+        None,
+    )
@@ -198,6 +198,18 @@ class ModelWithDjangoFileValidatorWithAcceptableType(models.Model):
     )
 
 
+class ModelWithDjangoFileValidatorAndVerdictCache(models.Model):
+    test_file = models.FileField(
+        validators=[
+            DjangoFileValidator(
+                libraries=[ALL],
+                acceptable_mimes=[PNG_OBJECT["mime"], MP3_OBJECT["mime"]],
+                verdict_cache="default",
+            ),
+        ],
+    )
+
+
 # FileSizeValidator
 class ModelWithFileSizeValidator(models.Model):
     test_file = models.FileField(
@@ -0,0 +1,133 @@
+"""Tests for batch.py."""
+import io
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from file_validator.batch import validate_many
+from file_validator.constants import PROCESS, PYTHON_MAGIC, THREAD
+from file_validator.exceptions import BatchValidationException, FileValidationException
+
+from tests.fixtures import (
+    BAD_FILE,
+    JPEG_FILE,
+    MIME,
+    MP3_FILE,
+    NAME,
+    PNG_FILE,
+    PNG_OBJECT,
+)
+
+POLICY: dict = {
+    "libraries": [PYTHON_MAGIC],
+    "acceptable_mimes": [PNG_OBJECT[MIME]],
+}
+
+
+# The parent validates files in the concurrent mode before it forks the pool
+# of processes, so the children inherit the thread pool of the libraries.
+CONCURRENT_VALIDATION_IN_PROCESSES: str = textwrap.dedent(
+    """
+    import time
+
+    from file_validator.batch import validate_many
+    from file_validator.validators import FileValidator
+    from tests.fixtures import PNG_FILE
+
+    policy = {"acceptable_mimes": ["image/png"], "concurrent": True}
+    for _ in range(5):
+        FileValidator(file_path=PNG_FILE, **policy).validate()
+    time.sleep(0.2)
+    results = validate_many(
+        [PNG_FILE] * 4,
+        policy=policy,
+        executor="process",
+        max_workers=2,
+    )
+    print(all(result.is_valid for result in results))
+    """,
+)
+
+
+def read_file(file_path) -> bytes:
+    """Returns the content of the test file."""
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+class TestValidateMany:
+    """Tests for validate_many function."""
+
+    @staticmethod
+    def test_validate_many_when_executor_is_thread_and_ordered():
+        """Test the results are in the order of the files and a file that is
+        not valid does not stop the batch."""
+        files = [PNG_FILE, JPEG_FILE, BAD_FILE, PNG_FILE, "missing.png"]
+        results = list(
+            validate_many(files, POLICY, executor=THREAD, max_workers=2, ordered=True),
+        )
+        assert [result.index for result in results] == list(range(len(files)))
+        assert [result.is_valid for result in results] == [
+            True,
+            False,
+            False,
+            True,
+            False,
+        ]
+        assert isinstance(results[1].error, FileValidationException)
+        assert isinstance(results[4].error, FileNotFoundError)
+        assert results[0].result_of_validation[PYTHON_MAGIC]["status"] == "ok"
+
+    @staticmethod
+    def test_validate_many_when_executor_is_process():
+        """Test the files are validated in a pool of processes."""
+        files = [PNG_FILE, MP3_FILE, (PNG_OBJECT[NAME], read_file(PNG_FILE))]
+        results = sorted(
+            validate_many(files, POLICY, executor=PROCESS, max_workers=2),
+            key=lambda result: result.index,
+        )
+        assert [result.is_valid for result in results] == [True, False, True]
+        assert results[2].file_name == PNG_OBJECT[NAME]
+
+    @staticmethod
+    def test_concurrent_validation_in_forked_processes():
+        """Test the libraries of the concurrent mode run in the processes of
+        the pool after the parent used its thread pool."""
+        completed = subprocess.run(
+            [sys.executable, "-c", CONCURRENT_VALIDATION_IN_PROCESSES],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            check=True,
+            text=True,
+            timeout=60,
+        )
+        assert completed.stdout.strip() == "True"
+
+    @staticmethod
+    def test_validate_many_with_bytes_and_streams():
+        """Test bytes and file-like objects are validated in memory."""
+        files = [read_file(PNG_FILE), io.BytesIO(read_file(JPEG_FILE))] * 10
+        results = list(validate_many(files, POLICY, max_workers=3))
+        assert len(results) == len(files)
+        assert sum(result.is_valid for result in results) == 10
+
+    @staticmethod
+    def test_validate_many_when_executor_is_not_supported():
+        """Test the executor must be thread or process."""
+        with pytest.raises(BatchValidationException):
+            list(validate_many([PNG_FILE], POLICY, executor="bad_executor"))
+
+    @staticmethod
+    def test_validate_many_when_stream_is_sent_to_process():
+        """Test file-like objects are not sent to processes."""
+        with pytest.raises(BatchValidationException):
+            list(
+                validate_many(
+                    [io.BytesIO(read_file(PNG_FILE))],
+                    POLICY,
+                    executor=PROCESS,
+                ),
+            )
@@ -0,0 +1,129 @@
+"""Tests for buffer_pool.py."""
+import io
+
+from file_validator.buffer_pool import BufferPool, get_buffer_pool, set_buffer_pool
+from file_validator.constants import FILETYPE, PURE_MAGIC
+from file_validator.sample import AccountingReader, FileSample, StreamSample
+from file_validator.validators import FileValidator
+
+from tests.fixtures import MIME, MP3_FILE, MP3_OBJECT, PNG_FILE, PNG_OBJECT
+
+
+class TestBufferPool:
+    """Tests for BufferPool."""
+
+    @staticmethod
+    def test_buffer_is_reused_after_it_is_released():
+        """Test a buffer that is given back is handed out again for the same
+        size, and a new buffer is created for another size."""
+        buffer_pool = BufferPool()
+        buffer = buffer_pool.acquire(1024)
+        buffer_pool.release(buffer)
+        assert buffer_pool.acquire(1024) is buffer
+        assert buffer_pool.acquire(2048) is not buffer
+        assert buffer_pool.buffers_created == 2
+        assert buffer_pool.buffers_reused == 1
+
+    @staticmethod
+    def test_pool_keeps_at_most_max_buffers():
+        """Test the buffers given back to a full pool are not kept."""
+        buffer_pool = BufferPool(max_buffers=1)
+        buffer_pool.release(bytearray(8))
+        buffer_pool.release(bytearray(8))
+        assert len(buffer_pool) == 1
+        buffer_pool.clear()
+        assert len(buffer_pool) == 0
+
+
+class TestPooledSample:
+    """Tests for the samples that read into the buffers of the pool."""
+
+    @staticmethod
+    def test_file_sample_reads_into_a_buffer_of_the_pool(png=PNG_FILE):
+        """Test the head and the tail are views of one buffer, and the buffer
+        is given back when the sample is released."""
+        previous_buffer_pool = get_buffer_pool()
+        buffer_pool = BufferPool()
+        set_buffer_pool(buffer_pool)
+        try:
+            with open(png, "rb") as file:
+                content = file.read()
+            sample = FileSample(png, head_size=64, tail_size=32)
+            assert isinstance(sample.head, memoryview)
+            assert sample.head == content[:64]
+            assert sample.tail == content[-32:]
+            assert sample.head.readonly
+            assert sample.content == content[:64] + content[-32:]
+            sample.release()
+            assert len(buffer_pool) == 1
+            assert sample.head == content[:64]
+            assert buffer_pool.buffers_reused == 1
+        finally:
+            set_buffer_pool(previous_buffer_pool)
+
+    @staticmethod
+    def test_stream_sample_reads_into_a_buffer_of_the_pool():
+        """Test a seekable stream is read into a buffer with readinto."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        sample = StreamSample(io.BytesIO(content), head_size=10, tail_size=10)
+        assert isinstance(sample.head, memoryview)
+        assert sample.content == b"a" * 10 + b"c" * 10
+        sample.release()
+
+    @staticmethod
+    def test_positional_read_is_counted_as_a_seek():
+        """Test a read at another offset than the end of the previous read
+        is counted as a seek."""
+        reader = AccountingReader(io.BytesIO(b"0123456789"), budget=6)
+        buffer = bytearray(6)
+        assert reader.readinto_at(memoryview(buffer)[:3], 0) == 3
+        assert reader.readinto_at(memoryview(buffer)[3:], 7) == 3
+        assert buffer == b"012789"
+        assert reader.bytes_read == 6
+        assert reader.seek_count == 1
+
+    @staticmethod
+    def test_run_validation_gives_the_buffer_back(png=PNG_FILE):
+        """Test the buffer of the sample is given back to the pool at the end
+        of the validation, so the next file reuses it."""
+        previous_buffer_pool = get_buffer_pool()
+        buffer_pool = BufferPool()
+        set_buffer_pool(buffer_pool)
+        try:
+            for _ in range(3):
+                FileValidator(
+                    file_path=png,
+                    libraries=[FILETYPE],
+                    acceptable_mimes=[PNG_OBJECT[MIME]],
+                ).run_validation()
+            assert buffer_pool.buffers_created == 1
+            assert buffer_pool.buffers_reused == 2
+        finally:
+            set_buffer_pool(previous_buffer_pool)
+
+    @staticmethod
+    def test_pure_magic_accepts_a_pooled_sample(mp3=MP3_FILE):
+        """Test pure-magic, which keeps the content in sets, gets content it
+        can use from a sample of the pool."""
+        acceptable_mimes = [MP3_OBJECT[MIME], PNG_OBJECT[MIME]]
+        file_validator = FileValidator(
+            file_path=mp3,
+            libraries=[PURE_MAGIC],
+            acceptable_mimes=acceptable_mimes,
+        )
+        result_of_validation = file_validator.run_validation()
+        assert result_of_validation[PURE_MAGIC]["file_mime"] == MP3_OBJECT[MIME]
+
+    @staticmethod
+    def test_validate_mime_accepts_a_pooled_sample(mp3=MP3_FILE):
+        """Test validate_mime with every library on a sample of the pool."""
+        file_validator = FileValidator(
+            file_path=mp3,
+            acceptable_mimes=[
+                MP3_OBJECT[MIME],
+                PNG_OBJECT[MIME],
+                "application/octet-stream",
+            ],
+        )
+        file_validator.validate_mime()
+        assert isinstance(file_validator.sample.head, memoryview)
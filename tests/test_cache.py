@@ -0,0 +1,308 @@
+"""Tests for cache.py."""
+import shutil
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from file_validator.cache import (
+    DjangoVerdictCache,
+    SQLiteVerdictCache,
+    Verdict,
+    VerdictCache,
+)
+from file_validator.constants import FILETYPE, HEAD_TAIL_SIZE, IMAGE, PYTHON_MAGIC
+from file_validator.exceptions import FileValidationException, VerdictCacheException
+from file_validator.validators import FileValidator
+
+from tests.fixtures import get_tmp_file, JPEG_FILE, MIME, NAME, PNG_FILE, PNG_OBJECT
+from tests.project.app.models import ModelWithDjangoFileValidatorAndVerdictCache
+
+
+def get_file_validator(file_path, verdict_cache, **kwargs):
+    """Returns a file validator for png files with the verdict cache."""
+    return FileValidator(
+        file_path=file_path,
+        acceptable_mimes=[PNG_OBJECT[MIME]],
+        acceptable_types=[IMAGE],
+        verdict_cache=verdict_cache,
+        **kwargs,
+    )
+
+
+class TestVerdictCache:
+    """Tests for VerdictCache."""
+
+    @staticmethod
+    def test_verdict_cache_when_file_is_valid_returns_the_result_without_libraries():
+        """Test the second validation of the same file does not run the
+        libraries."""
+        verdict_cache = VerdictCache()
+        result_of_validation = get_file_validator(
+            PNG_FILE,
+            verdict_cache,
+        ).run_validation()
+        with mock.patch.object(FileValidator, "validate", side_effect=AssertionError):
+            file_validator = get_file_validator(PNG_FILE, verdict_cache)
+            assert file_validator.run_validation() == result_of_validation
+        assert file_validator.sample.open_count == 1
+        assert verdict_cache.hits == 1
+        assert verdict_cache.misses == 1
+
+    @staticmethod
+    def test_verdict_cache_when_file_is_not_valid_raises_the_error_again():
+        """Test the error of a file that is not valid is raised again without
+        running the libraries."""
+        verdict_cache = VerdictCache()
+        with pytest.raises(FileValidationException):
+            get_file_validator(JPEG_FILE, verdict_cache).run_validation()
+        with mock.patch.object(FileValidator, "validate", side_effect=AssertionError):
+            with pytest.raises(FileValidationException):
+                get_file_validator(JPEG_FILE, verdict_cache).run_validation()
+        assert verdict_cache.hits == 1
+
+    @staticmethod
+    def test_verdict_cache_uses_the_name_of_the_current_file():
+        """Test a copy of a file with another name gets its own name and
+        extension in the result."""
+        verdict_cache = VerdictCache()
+        get_file_validator(PNG_FILE, verdict_cache).run_validation()
+        with TemporaryDirectory() as directory:
+            copy_of_file = shutil.copy(PNG_FILE, f"{directory}/copy.PNG")
+            result_of_validation = get_file_validator(
+                copy_of_file,
+                verdict_cache,
+            ).run_validation()
+        assert verdict_cache.hits == 1
+        assert result_of_validation[FILETYPE]["file_name"] == "copy.PNG"
+        assert result_of_validation[FILETYPE]["file_extension"] == ".PNG"
+
+    @staticmethod
+    def test_verdict_cache_creates_the_error_again_with_the_current_name():
+        """Test the error of a file that is not valid is created again with
+        the name of the current file and the same details, a name that is part
+        of other words of the message does not change them."""
+        verdict_cache = VerdictCache()
+        with open(JPEG_FILE, "rb") as file:
+            content = file.read()
+        with pytest.raises(FileValidationException):
+            FileValidator.from_bytes(
+                content,
+                file_name="file",
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                verdict_cache=verdict_cache,
+            ).run_validation()
+        with pytest.raises(FileValidationException) as error:
+            FileValidator.from_bytes(
+                content,
+                file_name="upload",
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                verdict_cache=verdict_cache,
+            ).run_validation()
+        assert verdict_cache.hits == 1
+        assert error.value.file_name == "upload"
+        assert error.value.library == FILETYPE
+        assert error.value.file_mime == "image/jpeg"
+        assert str(error.value).startswith("upload")
+        assert "your file mime" in str(error.value)
+        assert "your upload" not in str(error.value)
+
+    @staticmethod
+    def test_verdict_cache_key_uses_the_mime_of_the_name():
+        """Test the key uses the mime that mimetypes guesses from the whole
+        name, so names with the same last suffix but other mimes do not share
+        a verdict, and names with the same mime do."""
+        verdict_cache = VerdictCache()
+        with open(PNG_FILE, "rb") as file:
+            content = file.read()
+
+        def get_key(file_name, **kwargs):
+            return verdict_cache.get_key(
+                FileValidator.from_bytes(
+                    content,
+                    file_name=file_name,
+                    libraries=[FILETYPE],
+                    acceptable_mimes=[PNG_OBJECT[MIME]],
+                    verdict_cache=verdict_cache,
+                    **kwargs,
+                ),
+            )
+
+        assert get_key("archive.tar.gz") != get_key("archive.gz")
+        assert get_key("photo.jpg") == get_key("photo.jpeg")
+        assert get_key(
+            "photo.jpg",
+            acceptable_extensions=[".jpg"],
+        ) != get_key("photo.jpeg", acceptable_extensions=[".jpg"])
+
+    @staticmethod
+    def test_verdict_cache_when_settings_are_different():
+        """Test the verdict of other settings is not used."""
+        verdict_cache = VerdictCache()
+        get_file_validator(PNG_FILE, verdict_cache).run_validation()
+        get_file_validator(
+            PNG_FILE,
+            verdict_cache,
+            libraries=[PYTHON_MAGIC],
+        ).run_validation()
+        assert verdict_cache.hits == 0
+        assert len(verdict_cache) == 2
+
+    @staticmethod
+    def test_verdict_cache_with_head_tail_size_key_mode():
+        """Test the head, the tail and the size are enough for the key."""
+        verdict_cache = VerdictCache(key_mode=HEAD_TAIL_SIZE)
+        get_file_validator(PNG_FILE, verdict_cache).run_validation()
+        get_file_validator(PNG_FILE, verdict_cache).run_validation()
+        assert verdict_cache.hits == 1
+
+    @staticmethod
+    def test_verdict_cache_removes_the_least_recently_used_verdict():
+        """Test the cache keeps at most max_entries verdicts."""
+        verdict_cache = VerdictCache(max_entries=2)
+        verdict = Verdict(PNG_OBJECT[NAME], {})
+        verdict_cache.set("first", verdict)
+        verdict_cache.set("second", verdict)
+        assert verdict_cache.get("first") is verdict
+        verdict_cache.set("third", verdict)
+        assert verdict_cache.get("second") is None
+        assert verdict_cache.get("first") is verdict
+        assert len(verdict_cache) == 2
+
+    @staticmethod
+    def test_verdict_cache_keeps_at_most_max_bytes():
+        """Test the cache removes verdicts when it is larger than
+        max_bytes."""
+        verdict = Verdict(PNG_OBJECT[NAME], {})
+        verdict_cache = VerdictCache(max_bytes=len(verdict.serialize()) * 2)
+        for key in ("first", "second", "third"):
+            verdict_cache.set(key, verdict)
+        assert len(verdict_cache) == 2
+        assert verdict_cache.current_bytes <= verdict_cache.max_bytes
+
+    @staticmethod
+    @mock.patch("file_validator.cache.time.monotonic")
+    def test_verdict_cache_when_verdict_is_expired(monotonic):
+        """Test a verdict older than ttl is not used."""
+        verdict_cache = VerdictCache(ttl=10)
+        monotonic.return_value = 100
+        verdict_cache.set("key", Verdict(PNG_OBJECT[NAME], {}))
+        monotonic.return_value = 105
+        assert verdict_cache.get("key") is not None
+        monotonic.return_value = 111
+        assert verdict_cache.get("key") is None
+        assert len(verdict_cache) == 0
+
+    @staticmethod
+    def test_verdict_cache_when_key_mode_is_not_supported():
+        """Test the key mode must be supported."""
+        with pytest.raises(VerdictCacheException):
+            VerdictCache(key_mode="bad_key_mode")
+
+
+class TestVerdict:
+    """Tests for Verdict."""
+
+    @staticmethod
+    def test_verdict_serialize_and_deserialize():
+        """Test the verdict is the same after it is serialized."""
+        verdict = Verdict(
+            PNG_OBJECT[NAME],
+            error=FileValidationException(f"{PNG_OBJECT[NAME]} is not valid"),
+        )
+        restored_verdict = Verdict.deserialize(verdict.serialize())
+        assert restored_verdict.error_name == verdict.error_name
+        assert restored_verdict.error_message == verdict.error_message
+        assert restored_verdict.file_name == verdict.file_name
+
+    @staticmethod
+    def test_verdict_keeps_the_details_of_the_error():
+        """Test the details of the error are kept when the verdict is
+        serialized."""
+        error = FileValidationException(
+            library=FILETYPE,
+            file_name=PNG_OBJECT[NAME],
+            file_mime=PNG_OBJECT[MIME],
+            acceptable_mimes=["image/jpeg"],
+        )
+        verdict = Verdict.deserialize(
+            Verdict(PNG_OBJECT[NAME], error=error).serialize(),
+        )
+        assert verdict.error_details == error.get_details()
+
+
+class TestDjangoVerdictCache:
+    """Tests for DjangoVerdictCache."""
+
+    @staticmethod
+    def test_django_verdict_cache_shares_the_verdicts_of_the_django_cache():
+        """Test two verdict caches on the same django cache share the
+        verdicts."""
+        cache.clear()
+        get_file_validator(PNG_FILE, DjangoVerdictCache()).run_validation()
+        verdict_cache = DjangoVerdictCache()
+        with mock.patch.object(FileValidator, "validate", side_effect=AssertionError):
+            get_file_validator(PNG_FILE, verdict_cache).run_validation()
+        assert verdict_cache.stats() == {"hits": 1, "misses": 0}
+
+    @staticmethod
+    def test_django_file_validator_with_the_name_of_a_django_cache():
+        """Test DjangoFileValidator uses the django cache that is named."""
+        cache.clear()
+        for _ in range(2):
+            new_instance = ModelWithDjangoFileValidatorAndVerdictCache(
+                test_file=get_tmp_file(
+                    file_name=PNG_OBJECT[NAME],
+                    file_path=PNG_FILE,
+                    file_mime_type=PNG_OBJECT[MIME],
+                ),
+            )
+            new_instance.full_clean()
+        validator = ModelWithDjangoFileValidatorAndVerdictCache._meta.get_field(
+            "test_file",
+        ).validators[0]
+        assert isinstance(validator.verdict_cache, DjangoVerdictCache)
+        assert validator.verdict_cache.hits == 1
+
+
+class TestSQLiteVerdictCache:
+    """Tests for SQLiteVerdictCache."""
+
+    @staticmethod
+    def test_sqlite_verdict_cache_shares_the_verdicts_of_the_file():
+        """Test two verdict caches on the same file share the verdicts."""
+        with TemporaryDirectory() as directory:
+            path = f"{directory}/verdicts.sqlite3"
+            with pytest.raises(FileValidationException):
+                get_file_validator(
+                    JPEG_FILE,
+                    SQLiteVerdictCache(path),
+                ).run_validation()
+            verdict_cache = SQLiteVerdictCache(path)
+            with mock.patch.object(
+                FileValidator,
+                "validate",
+                side_effect=AssertionError,
+            ):
+                with pytest.raises(FileValidationException):
+                    get_file_validator(JPEG_FILE, verdict_cache).run_validation()
+            assert verdict_cache.hits == 1
+            assert len(verdict_cache) == 1
+            verdict_cache.clear()
+            assert len(verdict_cache) == 0
+
+    @staticmethod
+    @mock.patch("file_validator.cache.time.time")
+    def test_sqlite_verdict_cache_when_verdict_is_expired(time):
+        """Test a verdict older than ttl is not used and is removed."""
+        with TemporaryDirectory() as directory:
+            verdict_cache = SQLiteVerdictCache(f"{directory}/verdicts", ttl=10)
+            time.return_value = 100
+            verdict_cache.set("key", Verdict(PNG_OBJECT[NAME], {}))
+            time.return_value = 111
+            assert verdict_cache.get("key") is None
+            verdict_cache.remove_expired()
+            assert len(verdict_cache) == 0
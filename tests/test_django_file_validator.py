@@ -13,6 +13,7 @@ from file_validator.models import DjangoFileValidator
 
 from tests.fixtures import (
     BAD_OBJECT,
+    get_in_memory_file,
     get_tmp_file,
     JPEG_FILE,
     JPEG_OBJECT,
@@ -258,3 +259,35 @@ class TestDjangoFileValidator:
 
         del new_instance.test_file.file.content_type
         new_instance.full_clean()
+
+
+class TestDjangoFileValidatorInMemory:
+    """Test DjangoFileValidator with files that are kept in memory."""
+
+    @staticmethod
+    def test_django_file_validator_when_in_memory_file_is_valid():
+        """Test an in memory upload is validated without a temporary file."""
+        new_instance = ModelWithDjangoFileValidator(
+            test_file=get_in_memory_file(
+                file_name=PNG_OBJECT[NAME],
+                file_path=PNG_FILE,
+                file_mime_type=PNG_OBJECT[MIME],
+            ),
+        )
+
+        new_instance.full_clean()
+
+    @staticmethod
+    def test_django_file_validator_when_in_memory_file_is_not_valid():
+        """Test an in memory upload that is not valid raises validation
+        error."""
+        new_instance = ModelWithDjangoFileValidator(
+            test_file=get_in_memory_file(
+                file_name=JPEG_OBJECT[NAME],
+                file_path=JPEG_FILE,
+                file_mime_type=JPEG_OBJECT[MIME],
+            ),
+        )
+
+        with pytest.raises(ValidationError):
+            new_instance.full_clean()
@@ -1,5 +1,14 @@
 """Tests for exception."""
-from file_validator.exceptions import error_message
+import pickle
+
+from file_validator.constants import FILETYPE
+from file_validator.exceptions import (
+    convert_list_to_readable_string,
+    error_message,
+    FileValidationException,
+    is_colored,
+    SizeValidationException,
+)
 
 from tests.fixtures import (
     EXPECTED_MESSAGE,
@@ -27,3 +36,114 @@ class TestException:
             message=TEMPLATE_EXPECTED_MESSAGE,
         )
         assert EXPECTED_MESSAGE in message
+
+
+class TestStructuredException:
+    """Tests for the details of the errors and the rendering of their
+    messages."""
+
+    @staticmethod
+    def test_error_keeps_the_details():
+        """Test the details of the file are kept on the error."""
+        error = SizeValidationException(
+            template=TEMPLATE_EXPECTED_MESSAGE,
+            file_name=PNG_OBJECT[NAME],
+            file_size=20000000,
+            max_file_size=10000000,
+        )
+        assert error.file_name == PNG_OBJECT[NAME]
+        assert error.file_size == 20000000
+        assert error.max_file_size == 10000000
+
+    @staticmethod
+    def test_message_is_rendered_without_color_by_default(monkeypatch):
+        """Test the message is rendered from the details and is not
+        colored."""
+        monkeypatch.delenv("FILE_VALIDATOR_COLORED_ERRORS", raising=False)
+        is_colored.cache_clear()
+        error = FileValidationException(
+            template=TEMPLATE_EXPECTED_MESSAGE,
+            file_name=PNG_OBJECT[NAME],
+            file_mime=PNG_OBJECT[MIME],
+            file_size=20000000,
+            max_file_size=10000000,
+            acceptable_mimes=["image/png", "audio/mpeg"],
+            acceptable_types=["image", "audio"],
+        )
+        assert str(error) == error_message(
+            current_file_name=PNG_OBJECT[NAME],
+            current_file_size="20.0 MB",
+            current_file_mime=PNG_OBJECT[MIME],
+            acceptable_mimes=["image/png", "audio/mpeg"],
+            acceptable_types=["image", "audio"],
+            max_file_size="10.0 MB",
+            message=TEMPLATE_EXPECTED_MESSAGE,
+        )
+        assert "\x1b[" not in str(error)
+
+    @staticmethod
+    def test_message_is_colored_when_it_is_enabled(monkeypatch):
+        """Test the message is colored with the FILE_VALIDATOR_COLORED_ERRORS
+        environment variable."""
+        monkeypatch.setenv("FILE_VALIDATOR_COLORED_ERRORS", "1")
+        monkeypatch.setenv("FORCE_COLOR", "1")
+        monkeypatch.delenv("NO_COLOR", raising=False)
+        monkeypatch.setattr(
+            "django.conf.settings.FILE_VALIDATOR_COLORED_ERRORS",
+            True,
+            raising=False,
+        )
+        is_colored.cache_clear()
+        try:
+            assert str(FileValidationException("not valid")).startswith("\x1b[")
+        finally:
+            is_colored.cache_clear()
+
+    @staticmethod
+    def test_error_can_be_pickled():
+        """Test the error and its details survive pickling."""
+        error = pickle.loads(
+            pickle.dumps(FileValidationException("not valid", file_mime="image/png")),
+        )
+        assert str(error) == "not valid"
+        error = pickle.loads(
+            pickle.dumps(
+                FileValidationException(
+                    template="{current_file_name} {current_file_mime}",
+                    library=FILETYPE,
+                    file_name="test.png",
+                    file_mime="image/png",
+                ),
+            ),
+        )
+        assert error.get_details()["template"] == (
+            "{current_file_name} {current_file_mime}"
+        )
+        assert error.library == FILETYPE
+        assert error.file_mime == "image/png"
+        assert error.args == ("test.png image/png",)
+        assert str(error) == "test.png image/png"
+
+    @staticmethod
+    def test_error_of_template_has_its_message_in_args():
+        """Test an error rendered from a template has the message as its
+        argument and shows the library and the file in its repr."""
+        error = FileValidationException(
+            template="{current_file_name} is not valid",
+            library=FILETYPE,
+            file_name="test.png",
+        )
+        assert error.args[0] == "test.png is not valid"
+        assert repr(error) == (
+            "FileValidationException(library='filetype', file_name='test.png')"
+        )
+        assert repr(FileValidationException("not valid")) == (
+            "FileValidationException('not valid')"
+        )
+
+    @staticmethod
+    def test_convert_list_to_readable_string():
+        """Test the values are joined with commas."""
+        assert convert_list_to_readable_string(["image", "audio", 1]) == (
+            "image, audio, 1"
+        )
@@ -7,7 +7,14 @@ from file_validator.exceptions import SizeValidationException
 from file_validator.models import FileSizeValidator
 from file_validator.validators import FileValidator
 
-from tests.fixtures import get_tmp_file, MIME, NAME, PNG_FILE, PNG_OBJECT
+from tests.fixtures import (
+    get_in_memory_file,
+    get_tmp_file,
+    MIME,
+    NAME,
+    PNG_FILE,
+    PNG_OBJECT,
+)
 from tests.project.app.models import (
     ModelWithFileSizeValidator,
     ModelWithFileSizeValidatorAndNotValidSize,
@@ -73,3 +80,34 @@ class TestFileSizeValidator:
         with pytest.raises(SizeValidationException):
             file_validator = FileValidator(max_upload_file_size=1, file_path=PNG_FILE)
             file_validator.validate_size()
+
+
+class TestFileSizeValidatorInMemory:
+    """Test FileSizeValidator with files that are kept in memory."""
+
+    @staticmethod
+    def test_file_size_is_valid_when_file_is_in_memory():
+        """Test the size of an in memory upload is valid."""
+        new_instance = ModelWithFileSizeValidator(
+            test_file=get_in_memory_file(
+                file_name=PNG_OBJECT[NAME],
+                file_path=PNG_FILE,
+                file_mime_type=PNG_OBJECT[MIME],
+            ),
+        )
+
+        new_instance.full_clean()
+
+    @staticmethod
+    def test_file_size_is_not_valid_when_file_is_in_memory():
+        """Test the size of an in memory upload is not valid."""
+        new_instance = ModelWithFileSizeValidatorAndNotValidSize(
+            test_file=get_in_memory_file(
+                file_name=PNG_OBJECT[NAME],
+                file_path=PNG_FILE,
+                file_mime_type=PNG_OBJECT[MIME],
+            ),
+        )
+
+        with pytest.raises(ValidationError):
+            new_instance.full_clean()
@@ -1,11 +1,30 @@
 """Module is related to tests."""
+import io
 import os
+import threading
 from unittest import mock
 
 import pytest
 
-from file_validator.constants import AUDIO, FILETYPE, IMAGE, OK, VIDEO
-from file_validator.exceptions import FileValidationException, TypeNotSupportedException
+from file_validator.constants import (
+    AUDIO,
+    FAST,
+    FILETYPE,
+    IMAGE,
+    MIMETYPES,
+    NATIVE,
+    OK,
+    PURE_MAGIC,
+    PYTHON_MAGIC,
+    QUORUM,
+    TIERS,
+    VIDEO,
+)
+from file_validator.exceptions import (
+    FileValidationException,
+    SizeValidationException,
+    TypeNotSupportedException,
+)
 from file_validator.validators import FileValidator
 
 from tests.fixtures import (
@@ -354,3 +373,297 @@ class TestFileMimeValidator:
             acceptable_mimes=[PNG_OBJECT[MIME]],
         )
         file_validator.validate_mime()
+
+
+class TestFileValidatorSample:
+    """Test the sample shared by all the libraries."""
+
+    @staticmethod
+    def test_file_is_opened_once_when_validate_all_libraries():
+        """Test validate, validate_type and validate_size open the file only
+        once."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            acceptable_types=[IMAGE],
+            max_upload_file_size=1000000,
+        )
+        file_validator.validate()
+        file_validator.validate_type()
+        file_validator.validate_size()
+        file_validator.validate_mime()
+        assert file_validator.sample.open_count == 1
+
+
+class TestFileValidatorInMemory:
+    """Test from_bytes and from_stream methods."""
+
+    @staticmethod
+    def test_file_validator_from_bytes_when_file_is_valid():
+        """Test all the libraries validate the content without a path."""
+        with open(PNG_FILE, "rb") as file:
+            content = file.read()
+        file_validator = FileValidator.from_bytes(
+            content,
+            file_name=PNG_OBJECT[NAME],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            acceptable_types=[IMAGE],
+            max_upload_file_size=1000000,
+        )
+        result_of_validation = file_validator.validate()
+        file_validator.validate_type()
+        file_validator.validate_size()
+        file_validator.validate_mime()
+        assert result_of_validation[FILETYPE]["file_name"] == PNG_OBJECT[NAME]
+        assert result_of_validation[FILETYPE]["file_mime"] == PNG_OBJECT[MIME]
+        assert file_validator.sample.open_count == 0
+
+    @staticmethod
+    def test_file_validator_from_bytes_when_file_is_not_valid():
+        """Test the content of a jpeg file is not a valid png file."""
+        with open(JPEG_FILE, "rb") as file:
+            content = file.read()
+        with pytest.raises(FileValidationException):
+            file_validator = FileValidator.from_bytes(
+                memoryview(content),
+                file_name=PNG_OBJECT[NAME],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            )
+            file_validator.python_magic()
+
+    @staticmethod
+    def test_file_validator_from_bytes_when_size_is_not_valid():
+        """Test the size is taken from the content."""
+        with pytest.raises(SizeValidationException):
+            file_validator = FileValidator.from_bytes(
+                b"0" * 100,
+                max_upload_file_size=10,
+            )
+            file_validator.validate_size()
+
+    @staticmethod
+    def test_file_validator_from_stream_when_file_is_valid():
+        """Test the name of the stream is used when the name is not set."""
+        with open(JPEG_FILE, "rb") as file:
+            file_validator = FileValidator.from_stream(
+                file,
+                acceptable_mimes=[JPEG_OBJECT[MIME]],
+            )
+            result_of_validation = file_validator.validate()
+        assert result_of_validation[MIMETYPES]["file_name"] == JPEG_OBJECT[NAME]
+        assert result_of_validation[PURE_MAGIC]["file_mime"] == JPEG_OBJECT[MIME]
+
+    @staticmethod
+    def test_file_validator_from_stream_when_stream_has_no_name():
+        """Test a stream without a name is validated by its content."""
+        with open(PNG_FILE, "rb") as file:
+            stream = io.BytesIO(file.read())
+        file_validator = FileValidator.from_stream(
+            stream,
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        )
+        result_of_validation = file_validator.python_magic()
+        assert result_of_validation["file_mime"] == PNG_OBJECT[MIME]
+
+
+class TestRunValidation:
+    """Test run_validation method."""
+
+    @staticmethod
+    def test_run_validation_when_file_is_valid():
+        """Test all the configured validations are run."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            acceptable_types=[IMAGE],
+            acceptable_extensions=[PNG_OBJECT[EXTENSION]],
+            max_upload_file_size=1000000,
+        )
+        result_of_validation = file_validator.run_validation()
+        assert result_of_validation[FILETYPE]["status"] == OK
+        assert result_of_validation[PURE_MAGIC]["status"] == OK
+
+    @staticmethod
+    def test_run_validation_when_extension_is_not_valid():
+        """Test the extension is validated when acceptable extensions are
+        set."""
+        with pytest.raises(FileValidationException):
+            file_validator = FileValidator(
+                file_path=PNG_FILE,
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                acceptable_extensions=[JPEG_OBJECT[EXTENSION]],
+            )
+            file_validator.run_validation()
+
+
+class TestConcurrentValidation:
+    """Test the concurrent mode of validate method."""
+
+    @staticmethod
+    def test_concurrent_validation_has_same_result():
+        """Test the concurrent mode returns the same result as the sequential
+        mode."""
+        sequential_file_validator = FileValidator(
+            file_path=PNG_FILE,
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            file_mime_guessed_by_django=PNG_OBJECT[MIME],
+        )
+        concurrent_file_validator = FileValidator(
+            file_path=PNG_FILE,
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            file_mime_guessed_by_django=PNG_OBJECT[MIME],
+            concurrent=True,
+        )
+        result_of_validation = concurrent_file_validator.validate()
+        assert result_of_validation == sequential_file_validator.validate()
+        assert list(concurrent_file_validator.result_of_validation) == list(
+            sequential_file_validator.result_of_validation,
+        )
+        assert concurrent_file_validator.sample.open_count == 1
+
+    @staticmethod
+    def test_concurrent_validation_fails_fast():
+        """Test the error of a library is raised without waiting for the
+        libraries that are still running."""
+        release = threading.Event()
+
+        def slow_python_magic():
+            release.wait(5)
+            return {}
+
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            acceptable_mimes=[JPEG_OBJECT[MIME]],
+            concurrent=True,
+        )
+        with mock.patch.object(
+            FileValidator,
+            "python_magic",
+            side_effect=slow_python_magic,
+        ):
+            try:
+                with pytest.raises(FileValidationException):
+                    file_validator.validate()
+                assert not release.is_set()
+            finally:
+                release.set()
+
+
+class TestFastMode:
+    """Test the tiered fast mode."""
+
+    @staticmethod
+    def test_fast_mode_uses_only_the_native_engine_for_a_clear_file():
+        """Test the expensive libraries do not run if the native engine gives
+        an acceptable mime that agrees with the extension and django."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[FAST],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            file_mime_guessed_by_django=PNG_OBJECT[MIME],
+        )
+        with mock.patch.object(FileValidator, "pure_magic") as pure_magic:
+            result_of_validation = file_validator.run_validation()
+        pure_magic.assert_not_called()
+        assert result_of_validation[TIERS] == [NATIVE]
+        assert result_of_validation[NATIVE]["status"] == OK
+
+    @staticmethod
+    def test_fast_mode_escalates_when_django_does_not_agree():
+        """Test the expensive libraries run if the mime guessed by django is
+        not the mime of the native engine."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[FAST],
+            acceptable_mimes=[PNG_OBJECT[MIME], JPEG_OBJECT[MIME]],
+            file_mime_guessed_by_django=JPEG_OBJECT[MIME],
+        )
+        result_of_validation = file_validator.run_validation()
+        assert result_of_validation[TIERS] == [NATIVE, PURE_MAGIC, PYTHON_MAGIC]
+        assert result_of_validation[PURE_MAGIC]["status"] == OK
+        assert result_of_validation[PYTHON_MAGIC]["status"] == OK
+
+    @staticmethod
+    def test_fast_mode_escalates_when_mime_is_not_acceptable():
+        """Test the expensive libraries decide when the mime of the native
+        engine is not acceptable."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[FAST],
+            acceptable_mimes=[JPEG_OBJECT[MIME]],
+        )
+        with mock.patch.object(
+            FileValidator,
+            "pure_magic",
+            side_effect=FileValidationException,
+        ) as pure_magic:
+            with pytest.raises(FileValidationException):
+                file_validator.run_validation()
+        pure_magic.assert_called_once()
+
+    @staticmethod
+    def test_fast_mode_without_extension():
+        """Test a file without an extension is not escalated."""
+        with open(PNG_FILE, "rb") as file:
+            data = file.read()
+        file_validator = FileValidator.from_bytes(
+            data,
+            libraries=[FAST],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        )
+        assert file_validator.run_validation()[TIERS] == [NATIVE]
+
+
+class TestQuorumMode:
+    """Test the weighted quorum mode."""
+
+    @staticmethod
+    def test_quorum_mode_skips_libraries_when_file_is_accepted():
+        """Test the libraries that can not change the verdict are skipped."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[QUORUM],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            quorum_weights={NATIVE: 1, FILETYPE: 1, PURE_MAGIC: 1},
+        )
+        with mock.patch.object(FileValidator, "pure_magic") as pure_magic:
+            result_of_validation = file_validator.run_validation()
+        pure_magic.assert_not_called()
+        assert result_of_validation[QUORUM]["status"] == OK
+        assert result_of_validation[QUORUM]["votes"] == {NATIVE: OK, FILETYPE: OK}
+        assert result_of_validation[NATIVE]["status"] == OK
+
+    @staticmethod
+    def test_quorum_mode_outvotes_a_library():
+        """Test the file is valid if the libraries that accept it have more
+        weight than the library that rejects it."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[QUORUM],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            quorum_weights={FILETYPE: 1, PYTHON_MAGIC: 1, PURE_MAGIC: 1},
+        )
+        with mock.patch.object(
+            FileValidator,
+            "filetype",
+            side_effect=FileValidationException,
+        ):
+            result_of_validation = file_validator.run_validation()
+        assert result_of_validation[QUORUM]["accepted_weight"] == 2
+        assert result_of_validation[QUORUM]["rejected_weight"] == 1
+
+    @staticmethod
+    def test_quorum_mode_rejects_as_soon_as_verdict_is_certain():
+        """Test the file is rejected without running the libraries that can
+        not change the verdict."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[QUORUM],
+            acceptable_mimes=[JPEG_OBJECT[MIME]],
+            quorum_weights={NATIVE: 3, PURE_MAGIC: 1},
+        )
+        with mock.patch.object(FileValidator, "pure_magic") as pure_magic:
+            with pytest.raises(FileValidationException):
+                file_validator.run_validation()
+        pure_magic.assert_not_called()
+        assert file_validator.result_of_validation[QUORUM]["status"] == "rejected"
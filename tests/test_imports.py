@@ -0,0 +1,80 @@
+"""Tests for the lazy imports of file validator."""
+import os
+import subprocess
+import sys
+
+from tests.fixtures import PNG_FILE
+
+PROJECT_DIRECTORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY_MODULES: list = [
+    "django",
+    "magic",
+    "puremagic",
+    "filetype",
+    "dotenv",
+    "humanize",
+    "termcolor",
+    "sqlite3",
+    "concurrent.futures",
+]
+BLOCK_DJANGO: str = """
+import sys
+
+
+class BlockDjango:
+    @staticmethod
+    def find_spec(name, path=None, target=None):
+        if name.split(".")[0] == "django":
+            raise ImportError(name)
+
+
+sys.meta_path.insert(0, BlockDjango())
+"""
+
+
+def run_python(code: str) -> str:
+    """Runs the code in a new interpreter and returns what it prints."""
+    environment = dict(os.environ)
+    environment.pop("DJANGO_SETTINGS_MODULE", None)
+    completed_process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=PROJECT_DIRECTORY,
+        env=environment,
+        text=True,
+    )
+    return completed_process.stdout.strip()
+
+
+class TestLazyImports:
+    """Tests for the lazy imports."""
+
+    @staticmethod
+    def test_importing_the_validator_does_not_import_the_libraries():
+        """Test no detection library, django or termcolor is imported with the
+        validator."""
+        output = run_python(
+            "import sys\n"
+            "import file_validator.validators\n"
+            f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])\n",
+        )
+        assert output == "[]"
+
+    @staticmethod
+    def test_validator_works_without_django():
+        """Test the validator can validate a file when django can not be
+        imported."""
+        output = run_python(
+            BLOCK_DJANGO
+            + "from file_validator.exceptions import SizeValidationException\n"
+            + "from file_validator.validators import FileValidator\n"
+            + f"file_validator = FileValidator(file_path={PNG_FILE!r}, "
+            + "max_upload_file_size=10, libraries=['native'], "
+            + "acceptable_mimes=['image/png'])\n"
+            + "try:\n"
+            + "    file_validator.run_validation()\n"
+            + "except SizeValidationException as error:\n"
+            + "    print(type(error).__name__, 'magic' in sys.modules)\n",
+        )
+        assert output == "SizeValidationException False"
@@ -0,0 +1,86 @@
+"""Tests for magic_pool.py."""
+import os
+import threading
+from unittest import mock
+
+from file_validator.magic_pool import (
+    get_magic_pool,
+    get_path_magic_file,
+    MagicPool,
+    reset_magic_pool,
+)
+
+from tests.fixtures import (
+    JPEG_FILE,
+    JPEG_OBJECT,
+    MAGIC_FILE,
+    MIME,
+    PNG_FILE,
+    PNG_OBJECT,
+)
+
+
+class TestMagicPool:
+    """Tests for MagicPool."""
+
+    @staticmethod
+    def test_magic_pool_reuses_the_handle_in_the_same_thread():
+        """Test the handle is opened once for a thread and then reused."""
+        magic_pool = MagicPool()
+        assert magic_pool.get_handle() is magic_pool.get_handle()
+        assert magic_pool.handles_created == 1
+
+    @staticmethod
+    def test_magic_pool_gives_each_thread_its_own_handle():
+        """Test every thread gets its own handle and the mimes guessed in
+        parallel are correct."""
+        magic_pool = MagicPool()
+        with open(PNG_FILE, "rb") as file:
+            png_header = file.read(2048)
+        with open(JPEG_FILE, "rb") as file:
+            jpeg_header = file.read(2048)
+        handles = []
+        mimes = []
+
+        def guess(header):
+            handles.append(magic_pool.get_handle())
+            mimes.append(magic_pool.from_buffer(header))
+
+        threads = [
+            threading.Thread(target=guess, args=(header,))
+            for header in (png_header, jpeg_header, png_header, jpeg_header)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(handle) for handle in handles}) == len(threads)
+        assert magic_pool.handles_created == len(threads)
+        assert sorted(mimes) == sorted([PNG_OBJECT[MIME], JPEG_OBJECT[MIME]] * 2)
+
+    @staticmethod
+    def test_get_magic_pool_returns_the_same_pool_until_reset():
+        """Test the shared pool is configured once and replaced after
+        reset."""
+        magic_pool = get_magic_pool()
+        assert get_magic_pool() is magic_pool
+        reset_magic_pool()
+        assert get_magic_pool() is not magic_pool
+
+
+class TestGetPathMagicFile:
+    """Tests for get_path_magic_file function."""
+
+    @staticmethod
+    @mock.patch.dict(os.environ, {"path_magic_file": MAGIC_FILE}, clear=True)
+    @mock.patch("file_validator.magic_pool.platform.system", return_value="Linux")
+    def test_get_path_magic_file_when_operating_system_is_not_windows(_system):
+        """Test the magic file is ignored outside Windows."""
+        assert get_path_magic_file() is None
+
+    @staticmethod
+    @mock.patch.dict(os.environ, {"path_magic_file": MAGIC_FILE}, clear=True)
+    @mock.patch("file_validator.magic_pool.platform.system", return_value="Windows")
+    def test_get_path_magic_file_when_operating_system_is_windows(_system):
+        """Test the magic file is read from the environment on Windows."""
+        assert get_path_magic_file() == MAGIC_FILE
@@ -0,0 +1,165 @@
+"""Tests for metrics.py."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from file_validator.constants import FILETYPE, PROMETHEUS_CONTENT_TYPE
+from file_validator.exceptions import FileValidationException
+from file_validator.metrics import (
+    disable_metrics,
+    enable_metrics,
+    get_policy_label,
+    MultiprocessMetricsCollector,
+    render_metrics,
+)
+from file_validator.observers import get_observers
+from file_validator.policy import get_validation_policy
+from file_validator.validators import FileValidator
+from file_validator.views import metrics_view
+
+from tests.fixtures import JPEG_FILE, MIME, PNG_FILE, PNG_OBJECT
+
+# A worker that validates two files and exits long before the flush interval.
+VALIDATION_IN_WORKER: str = textwrap.dedent(
+    """
+    import sys
+
+    from file_validator.metrics import enable_metrics
+    from tests.test_metrics import validate_files
+
+    enable_metrics(directory=sys.argv[1], flush_interval=60)
+    validate_files()
+    """,
+)
+
+
+def get_validations_on_disk(directory: str) -> int:
+    """Returns the validations in the files of the directory, without
+    flushing the metrics of the current process."""
+    validations = 0
+    for file_name in os.listdir(directory):
+        with open(os.path.join(directory, file_name), encoding="utf-8") as file:
+            snapshot = json.load(file)
+        validations += sum(
+            value
+            for name, _labels, value in snapshot["counters"]
+            if name == "validations_total"
+        )
+    return validations
+
+
+def validate_files():
+    """Validates a valid file and a file that is not valid."""
+    FileValidator(
+        file_path=PNG_FILE,
+        libraries=[FILETYPE],
+        acceptable_mimes=[PNG_OBJECT[MIME]],
+    ).run_validation()
+    with pytest.raises(FileValidationException):
+        FileValidator(
+            file_path=JPEG_FILE,
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        ).run_validation()
+
+
+class TestMetrics:
+    """Tests for the metrics collector."""
+
+    @staticmethod
+    def test_metrics_are_rendered_in_prometheus_format():
+        """Test the stages, the validations and the time of the stages are
+        rendered in the text format."""
+        collector = enable_metrics()
+        try:
+            validate_files()
+            metrics = render_metrics()
+        finally:
+            disable_metrics()
+        assert "# TYPE file_validator_stages_total counter" in metrics
+        assert "# TYPE file_validator_stage_duration_seconds histogram" in metrics
+        assert 'stage="filetype"' in metrics
+        assert 'outcome="rejected"' in metrics
+        policy = get_policy_label(
+            get_validation_policy(
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            ),
+        )
+        assert f'stage="filetype",policy="{policy}",le="+Inf"}} 2' in metrics
+        assert 'file_validator_bytes_read_total{stage="filetype"' in metrics
+        assert collector not in get_observers()
+
+    @staticmethod
+    def test_metrics_are_not_collected_when_disabled():
+        """Test nothing is rendered if the metrics are not enabled."""
+        disable_metrics()
+        validate_files()
+        assert render_metrics() == ""
+
+    @staticmethod
+    def test_metrics_of_processes_are_aggregated(tmp_path):
+        """Test the files of all the processes in the directory are added
+        together."""
+        collector = enable_metrics(directory=str(tmp_path), flush_interval=0)
+        try:
+            validate_files()
+            assert isinstance(collector, MultiprocessMetricsCollector)
+            # The file of another worker with the same metrics.
+            shutil.copy(collector.path, os.path.join(tmp_path, "metrics-1.json"))
+            metrics = collector.render()
+        finally:
+            disable_metrics()
+        validations = [
+            line
+            for line in metrics.splitlines()
+            if line.startswith("file_validator_validations_total")
+        ]
+        assert len(validations) == 2
+        assert all(line.endswith(" 2") for line in validations)
+
+    @staticmethod
+    def test_metrics_of_idle_worker_are_written(tmp_path):
+        """Test the metrics that arrived after the last write are written by
+        the timer when the worker goes idle."""
+        enable_metrics(directory=str(tmp_path), flush_interval=0.2)
+        try:
+            validate_files()
+            deadline = time.monotonic() + 5
+            while get_validations_on_disk(tmp_path) < 2:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+        finally:
+            disable_metrics()
+
+    @staticmethod
+    def test_metrics_are_written_when_worker_exits(tmp_path):
+        """Test the metrics of a worker that exits before the flush interval
+        are written at exit."""
+        subprocess.run(
+            [sys.executable, "-c", VALIDATION_IN_WORKER, str(tmp_path)],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            check=True,
+            timeout=60,
+        )
+        assert get_validations_on_disk(tmp_path) == 2
+
+    @staticmethod
+    def test_metrics_view():
+        """Test the view returns the metrics with the content type of
+        Prometheus."""
+        enable_metrics()
+        try:
+            validate_files()
+            response = metrics_view(None)
+        finally:
+            disable_metrics()
+        assert response["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+        assert b"file_validator_validations_total" in response.content
@@ -0,0 +1,167 @@
+"""Tests for observers.py and signals.py."""
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from file_validator.cache import VerdictCache
+from file_validator.constants import (
+    CACHE,
+    FILETYPE,
+    HIT,
+    MISS,
+    OK,
+    REJECTED,
+    SIZE,
+    TYPE,
+    VALIDATION,
+)
+from file_validator.exceptions import FileValidationException
+from file_validator.models import DjangoFileValidator
+from file_validator.observers import (
+    get_observers,
+    register_observer,
+    unregister_observer,
+)
+from file_validator.signals import file_validated
+from file_validator.validators import FileValidator
+
+from tests.fixtures import (
+    get_tmp_file,
+    JPEG_FILE,
+    JPEG_OBJECT,
+    MIME,
+    NAME,
+    PNG_FILE,
+    PNG_OBJECT,
+    TYPE as FIXTURE_TYPE,
+)
+from tests.project.app.models import ModelWithDjangoFileValidator
+
+
+@pytest.fixture(name="events")
+def fixture_events():
+    """Registers an observer that keeps the events."""
+    events = []
+    register_observer(events.append)
+    yield events
+    unregister_observer(events.append)
+
+
+class TestObservers:
+    """Tests for the observers of the stages."""
+
+    @staticmethod
+    def test_every_stage_is_observed(events, png=PNG_FILE):
+        """Test the observers are called after every stage with its time,
+        bytes read, outcome and mime."""
+        FileValidator(
+            file_path=png,
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            acceptable_types=[PNG_OBJECT[FIXTURE_TYPE]],
+            max_upload_file_size=10485760,
+        ).run_validation()
+        assert [event.stage for event in events] == [FILETYPE, TYPE, SIZE, VALIDATION]
+        assert all(event.outcome == OK for event in events)
+        assert all(event.duration >= 0 for event in events)
+        assert events[0].file_mime == PNG_OBJECT[MIME]
+        assert events[0].file_name == PNG_OBJECT[NAME]
+        assert events[0].bytes_read > 0
+        assert events[1].bytes_read == 0
+
+    @staticmethod
+    def test_rejected_stage_is_observed(events, jpeg=JPEG_FILE):
+        """Test the stage that rejects the file is observed with its error."""
+        with pytest.raises(FileValidationException):
+            FileValidator(
+                file_path=jpeg,
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            ).run_validation()
+        assert [event.outcome for event in events] == [REJECTED, REJECTED]
+        assert events[0].file_mime == JPEG_OBJECT[MIME]
+        assert isinstance(events[0].error, FileValidationException)
+
+    @staticmethod
+    def test_verdict_cache_is_observed(events, png=PNG_FILE):
+        """Test the lookups of the verdict cache are observed as hits and
+        misses."""
+        verdict_cache = VerdictCache()
+        for _ in range(2):
+            FileValidator(
+                file_path=png,
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                verdict_cache=verdict_cache,
+            ).run_validation()
+        cache_events = [event.outcome for event in events if event.stage == CACHE]
+        assert cache_events == [MISS, HIT]
+
+    @staticmethod
+    def test_error_of_observer_does_not_stop_validation(png=PNG_FILE):
+        """Test an observer that raises an error does not stop the
+        validation."""
+
+        def broken_observer(event):
+            raise RuntimeError(event)
+
+        register_observer(broken_observer)
+        try:
+            FileValidator(
+                file_path=png,
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            ).run_validation()
+        finally:
+            unregister_observer(broken_observer)
+        assert broken_observer not in get_observers()
+
+    @staticmethod
+    def test_no_event_without_observers(png=PNG_FILE):
+        """Test no event is created if no observer is registered."""
+        with mock.patch("file_validator.observers.notify_observers") as notify:
+            FileValidator(
+                file_path=png,
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                max_upload_file_size=10485760,
+            ).run_validation()
+        notify.assert_not_called()
+
+
+class TestSignals:
+    """Tests for the signals of the django entry points."""
+
+    @staticmethod
+    def test_file_validated_is_sent():
+        """Test file_validated is sent for a valid and an invalid file."""
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append((sender, kwargs))
+
+        file_validated.connect(receiver)
+        try:
+            ModelWithDjangoFileValidator(
+                test_file=get_tmp_file(
+                    file_name=PNG_OBJECT[NAME],
+                    file_path=PNG_FILE,
+                    file_mime_type=PNG_OBJECT[MIME],
+                ),
+            ).full_clean()
+            with pytest.raises(ValidationError):
+                ModelWithDjangoFileValidator(
+                    test_file=get_tmp_file(
+                        file_name=JPEG_OBJECT[NAME],
+                        file_path=JPEG_FILE,
+                        file_mime_type=JPEG_OBJECT[MIME],
+                    ),
+                ).full_clean()
+        finally:
+            file_validated.disconnect(receiver)
+        assert [sender for sender, _ in received] == [DjangoFileValidator] * 2
+        assert received[0][1]["outcome"] == OK
+        assert received[0][1]["result_of_validation"] is not None
+        assert received[1][1]["outcome"] == REJECTED
+        assert received[1][1]["duration"] >= 0
@@ -0,0 +1,158 @@
+"""Tests for policy.py."""
+import pickle
+from unittest import mock
+
+import pytest
+
+from file_validator.constants import ALL, FILETYPE, IMAGE, NATIVE, PYTHON_MAGIC
+from file_validator.exceptions import (
+    FileValidationException,
+    LibraryNotSupportedException,
+    QuorumNotValidException,
+    TypeNotSupportedException,
+)
+from file_validator.models import DjangoFileValidator, ValidatedFileField
+from file_validator.policy import compile_validation_policy, get_validation_policy
+from file_validator.validators import FileValidator
+
+from tests.fixtures import (
+    BAD_OBJECT,
+    JPEG_OBJECT,
+    MIME,
+    MP3_OBJECT,
+    NAME,
+    PNG_FILE,
+    PNG_OBJECT,
+)
+
+
+class TestValidationPolicy:
+    """Tests for ValidationPolicy."""
+
+    @staticmethod
+    def test_identical_settings_share_one_policy():
+        """Test the same settings return the same instance, even if they are
+        given as lists or tuples."""
+        policy = get_validation_policy(
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME], MP3_OBJECT[MIME]],
+        )
+        assert policy is get_validation_policy(
+            libraries=(FILETYPE,),
+            acceptable_mimes=(PNG_OBJECT[MIME], MP3_OBJECT[MIME]),
+        )
+        assert policy is not get_validation_policy(
+            libraries=[PYTHON_MAGIC],
+            acceptable_mimes=[PNG_OBJECT[MIME], MP3_OBJECT[MIME]],
+        )
+
+    @staticmethod
+    def test_policy_is_compiled():
+        """Test the settings are kept as frozensets and the plan is
+        resolved."""
+        policy = get_validation_policy(
+            libraries=[FILETYPE, NATIVE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            acceptable_types=[IMAGE],
+            acceptable_extensions=[".png"],
+            max_upload_file_size=1000,
+        )
+        assert policy.mimes == frozenset([PNG_OBJECT[MIME]])
+        assert policy.types == frozenset([IMAGE])
+        assert policy.extensions == frozenset([".png"])
+        assert policy.plan == (
+            "filetype",
+            "native",
+            "validate_type",
+            "validate_extension",
+            "validate_size",
+        )
+
+    @staticmethod
+    def test_policy_without_libraries_uses_all_libraries():
+        """Test all the libraries are used if libraries is not set, and no
+        library runs if acceptable_mimes is not set."""
+        policy = get_validation_policy(acceptable_mimes=[PNG_OBJECT[MIME]])
+        assert policy.libraries == (ALL,)
+        assert policy.plan == ("validate",)
+        assert get_validation_policy(max_upload_file_size=10).plan == ("validate_size",)
+
+    @staticmethod
+    def test_policy_is_interned_after_pickle():
+        """Test a pickled policy is the shared instance when it is loaded,
+        so it can be sent to a process pool."""
+        policy = get_validation_policy(acceptable_mimes=[PNG_OBJECT[MIME]])
+        assert pickle.loads(pickle.dumps(policy)) is policy
+
+    @staticmethod
+    def test_compile_validation_policy_checks_the_settings():
+        """Test the settings of a field are checked when the policy is
+        compiled."""
+        with pytest.raises(LibraryNotSupportedException):
+            compile_validation_policy(
+                libraries=[BAD_OBJECT[NAME]],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            )
+        with pytest.raises(TypeNotSupportedException):
+            compile_validation_policy(acceptable_types=[BAD_OBJECT[NAME]])
+        with pytest.raises(QuorumNotValidException):
+            compile_validation_policy(
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                quorum_weights={ALL: 1},
+            )
+        with pytest.raises(QuorumNotValidException):
+            compile_validation_policy(
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                quorum_threshold=1,
+            )
+
+    @staticmethod
+    def test_quorum_weights_are_sorted_by_cost():
+        """Test the cheapest libraries of the quorum come first."""
+        policy = get_validation_policy(
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            quorum_weights={PYTHON_MAGIC: 2, NATIVE: 1},
+        )
+        assert policy.quorum_weights == ((NATIVE, 1), (PYTHON_MAGIC, 2))
+
+
+class TestFileValidatorWithPolicy:
+    """Tests for FileValidator with a policy."""
+
+    @staticmethod
+    def test_file_validator_uses_the_policy():
+        """Test the policy is used for the validation."""
+        policy = get_validation_policy(
+            libraries=[FILETYPE],
+            acceptable_mimes=[JPEG_OBJECT[MIME]],
+        )
+        with pytest.raises(FileValidationException):
+            FileValidator(file_path=PNG_FILE, policy=policy).run_validation()
+
+    @staticmethod
+    def test_fields_share_the_policy():
+        """Test fields and validators with the same settings share one
+        policy."""
+        field = ValidatedFileField(
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME], MP3_OBJECT[MIME]],
+        )
+        validator = DjangoFileValidator(
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME], MP3_OBJECT[MIME]],
+        )
+        assert field.policy is validator.policy
+
+    @staticmethod
+    def test_file_validator_with_policy_does_no_configuration_work():
+        """Test the settings are not checked again for every file."""
+        policy = compile_validation_policy(
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME], MP3_OBJECT[MIME]],
+        )
+        with mock.patch(
+            "file_validator.policy.intern_validation_policy",
+        ) as intern_validation_policy:
+            file_validator = FileValidator(file_path=PNG_FILE, policy=policy)
+            file_validator.run_validation()
+        intern_validation_policy.assert_not_called()
@@ -0,0 +1,177 @@
+"""Tests for the revalidate_files command."""
+import io
+import json
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import override_settings
+
+from file_validator.constants import REVALIDATION_REPORT_SIZE
+from file_validator.management.commands.revalidate_files import get_validated_fields
+
+from tests.fixtures import PNG_FILE
+from tests.project.app.models import (
+    ModelWithDjangoFileValidator,
+    ModelWithValidatedFileField,
+)
+
+FILES_DIRECTORY: str = os.path.dirname(PNG_FILE)
+
+
+@pytest.fixture(name="database", scope="module")
+def fixture_database():
+    """Creates a test database in memory with the tables of the models, the
+    app of the tests has no migrations, so its tables are created here."""
+    old_name = connection.creation.create_test_db(
+        verbosity=0,
+        autoclobber=True,
+        serialize=False,
+    )
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(ModelWithValidatedFileField)
+        schema_editor.create_model(ModelWithDjangoFileValidator)
+    yield
+    connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@pytest.fixture(name="stored_files")
+def fixture_stored_files(database):  # pylint: disable=unused-argument
+    """Stores rows whose files are the test files, the media root is the
+    directory of the test files."""
+    with override_settings(MEDIA_ROOT=FILES_DIRECTORY):
+        for file_name in ("test.png", "test.jpg", "test.png", "missing.png"):
+            ModelWithValidatedFileField.objects.create(test_file=file_name)
+        ModelWithDjangoFileValidator.objects.create(test_file="test.jpg")
+        yield
+    ModelWithValidatedFileField.objects.all().delete()
+    ModelWithDjangoFileValidator.objects.all().delete()
+
+
+def read_report(path) -> list:
+    """Returns the lines of the report."""
+    with open(path, encoding="utf-8") as report_file:
+        return [json.loads(line) for line in report_file]
+
+
+class TestRevalidateFiles:
+    """Tests for the revalidate_files command."""
+
+    @staticmethod
+    def test_fields_with_validators_are_found():
+        """Test the fields with ValidatedFileField and DjangoFileValidator are
+        found with the policy of the field."""
+        validated_fields = {
+            key: policy for key, _model, _field_name, policy in get_validated_fields()
+        }
+        field = ModelWithValidatedFileField._meta.get_field("test_file")
+        assert validated_fields["app.ModelWithValidatedFileField.test_file"] is (
+            field.policy
+        )
+        assert "app.ModelWithDjangoFileValidator.test_file" in validated_fields
+
+    @staticmethod
+    def test_files_that_are_not_valid_are_reported(stored_files, tmp_path):
+        """Test the files that are not valid are written to the report and the
+        progress is kept in the checkpoint."""
+        report_path = tmp_path / "report.jsonl"
+        checkpoint_path = tmp_path / "checkpoint.json"
+        call_command(
+            "revalidate_files",
+            "app.ModelWithValidatedFileField",
+            "app.ModelWithDjangoFileValidator",
+            report=str(report_path),
+            checkpoint=str(checkpoint_path),
+            chunk_size=2,
+            workers=2,
+            stdout=io.StringIO(),
+        )
+        report = read_report(report_path)
+        assert {(line["field"], line["status"]) for line in report} == {
+            ("app.ModelWithValidatedFileField.test_file", "rejected"),
+            ("app.ModelWithValidatedFileField.test_file", "error"),
+            ("app.ModelWithDjangoFileValidator.test_file", "rejected"),
+        }
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        progress = checkpoint["app.ModelWithValidatedFileField.test_file"]
+        assert progress["files"] == 4
+        assert progress["rejected"] == 1
+        assert progress["errors"] == 1
+        assert progress["done"]
+
+    @staticmethod
+    def test_command_continues_from_the_checkpoint(stored_files, tmp_path):
+        """Test only the rows after the checkpoint are validated when the
+        command runs again."""
+        report_path = tmp_path / "report.jsonl"
+        checkpoint_path = tmp_path / "checkpoint.json"
+        rows = list(ModelWithValidatedFileField.objects.order_by("pk"))
+        with open(checkpoint_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(
+                {
+                    "app.ModelWithValidatedFileField.test_file": {
+                        "last_pk": rows[1].pk,
+                        "files": 2,
+                        "rejected": 1,
+                        "errors": 0,
+                        "done": False,
+                    },
+                },
+                checkpoint_file,
+            )
+        call_command(
+            "revalidate_files",
+            "app.ModelWithValidatedFileField",
+            report=str(report_path),
+            checkpoint=str(checkpoint_path),
+            stdout=io.StringIO(),
+        )
+        report = read_report(report_path)
+        assert [line["pk"] for line in report] == [rows[3].pk]
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            progress = json.load(checkpoint_file)[
+                "app.ModelWithValidatedFileField.test_file"
+            ]
+        assert progress["files"] == 4
+        assert progress["last_pk"] == rows[3].pk
+
+    @staticmethod
+    def test_rows_after_the_checkpoint_are_not_reported_twice(stored_files, tmp_path):
+        """Test the rows that were written after the last checkpoint of a
+        command that was stopped are removed before they are written again."""
+        report_path = tmp_path / "report.jsonl"
+        checkpoint_path = tmp_path / "checkpoint.json"
+        rows = list(ModelWithValidatedFileField.objects.order_by("pk"))
+        reported_row = json.dumps({"pk": rows[1].pk}) + "\n"
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            report_file.write(reported_row)
+            # The row of the chunk that was not finished.
+            report_file.write(json.dumps({"pk": rows[3].pk}) + "\n")
+        with open(checkpoint_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(
+                {
+                    "app.ModelWithValidatedFileField.test_file": {
+                        "last_pk": rows[1].pk,
+                        "files": 2,
+                        "rejected": 1,
+                        "errors": 0,
+                        "done": False,
+                    },
+                    REVALIDATION_REPORT_SIZE: len(reported_row),
+                },
+                checkpoint_file,
+            )
+        call_command(
+            "revalidate_files",
+            "app.ModelWithValidatedFileField",
+            report=str(report_path),
+            checkpoint=str(checkpoint_path),
+            stdout=io.StringIO(),
+        )
+        report = read_report(report_path)
+        assert [line["pk"] for line in report] == [rows[1].pk, rows[3].pk]
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        assert checkpoint[REVALIDATION_REPORT_SIZE] == os.path.getsize(report_path)
@@ -0,0 +1,415 @@
+"""Tests for sample.py."""
+import hashlib
+import io
+import mmap
+import os
+from array import array
+from tempfile import NamedTemporaryFile
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+
+from file_validator.constants import FILETYPE, PURE_MAGIC
+from file_validator.exceptions import ReadBudgetException
+from file_validator.sample import (
+    AccountingReader,
+    BytesSample,
+    FileSample,
+    MappedSample,
+    StorageSample,
+    StreamSample,
+)
+from file_validator.validators import FileValidator
+
+from tests.fixtures import MIME, PNG_FILE, PNG_OBJECT, ZIP_FILE
+
+
+class TestFileSample:
+    """Tests for FileSample."""
+
+    @staticmethod
+    def test_file_sample_when_file_is_smaller_than_head():
+        """Test the head of a small file is the whole file and the tail is
+        empty."""
+        sample = FileSample(PNG_FILE)
+        with open(PNG_FILE, "rb") as file:
+            content = file.read()
+        assert sample.head == content
+        assert sample.tail == b""
+        assert sample.size == len(content)
+        assert sample.bytes_read == len(content)
+        assert sample.seek_count == 0
+
+    @staticmethod
+    def test_file_sample_when_file_is_larger_than_head_and_tail():
+        """Test the head and the tail are read from the start and the end of
+        the file and the middle of the file is not read."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        with NamedTemporaryFile(delete=False) as file:
+            file.write(content)
+        try:
+            sample = FileSample(file.name, head_size=10, tail_size=10)
+            assert sample.head == b"a" * 10
+            assert sample.tail == b"c" * 10
+            assert sample.size == len(content)
+            assert sample.bytes_read == 20
+            assert sample.content == b"a" * 10 + b"c" * 10
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def test_file_sample_when_tail_overlaps_the_head():
+        """Test the tail starts after the head when the file is smaller than
+        the head and the tail together."""
+        content = b"0123456789"
+        with NamedTemporaryFile(delete=False) as file:
+            file.write(content)
+        try:
+            sample = FileSample(file.name, head_size=6, tail_size=6)
+            assert sample.head == b"012345"
+            assert sample.tail == b"6789"
+            assert sample.content == content
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def test_file_sample_opens_the_file_only_once():
+        """Test the file is opened only once however many times the sample is
+        used."""
+        sample = FileSample(PNG_FILE)
+        for _ in range(3):
+            assert sample.head
+            assert sample.content
+        assert sample.open_count == 1
+
+    @staticmethod
+    def test_file_sample_size_does_not_open_the_file():
+        """Test the size of the file is taken without opening the file."""
+        sample = FileSample(PNG_FILE)
+        assert sample.size == os.path.getsize(PNG_FILE)
+        assert sample.open_count == 0
+
+
+class NonSeekableStream(io.RawIOBase):
+    """A stream that can only be read, such as a pipe or a socket."""
+
+    def __init__(self, content: bytes, chunk_size: int):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        size = min(size, self.chunk_size) if size >= 0 else self.chunk_size
+        chunk = self.content[self.position : self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+class InMemoryStorage(Storage):
+    """A storage of an object store in memory, with ranged reads if
+    ranged is True."""
+
+    def __init__(self, files: dict, ranged: bool = True):
+        self.files = files
+        self.ranges = []
+        if not ranged:
+            self.read_range = None
+
+    def read_range(self, name, offset, size):
+        """Returns size bytes of the file from offset."""
+        self.ranges.append((offset, size))
+        return self.files[name][offset : offset + size]
+
+    def _open(self, name, mode="rb"):
+        return ContentFile(self.files[name], name=name)
+
+    def size(self, name):
+        return len(self.files[name])
+
+    def exists(self, name):
+        return name in self.files
+
+
+class TestBytesSample:
+    """Tests for BytesSample."""
+
+    @staticmethod
+    def test_bytes_sample_when_data_is_bytes():
+        """Test the head and the tail are sliced from the bytes."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        sample = BytesSample(content, head_size=10, tail_size=10)
+        assert sample.head == b"a" * 10
+        assert sample.tail == b"c" * 10
+        assert sample.size == len(content)
+        assert sample.open_count == 0
+
+    @staticmethod
+    def test_bytes_sample_when_data_is_memoryview():
+        """Test a memoryview gives bytes that libraries can use."""
+        content = bytearray(b"0123456789")
+        sample = BytesSample(memoryview(content), head_size=4, tail_size=4)
+        assert isinstance(sample.head, bytes)
+        assert sample.head == b"0123"
+        assert sample.tail == b"6789"
+
+    @staticmethod
+    def test_bytes_sample_when_items_are_not_bytes():
+        """Test a buffer of items larger than a byte is sized and sliced by
+        bytes."""
+        content = array("I", range(10))
+        sample = BytesSample(memoryview(content), head_size=6, tail_size=6)
+        assert sample.size == 40
+        assert sample.head == content.tobytes()[:6]
+        assert sample.tail == content.tobytes()[-6:]
+
+
+class TestStreamSample:
+    """Tests for StreamSample."""
+
+    @staticmethod
+    def test_stream_sample_when_stream_is_seekable():
+        """Test only the head and the tail are read and the position of the
+        stream is restored."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        stream = io.BytesIO(content)
+        stream.seek(5)
+        sample = StreamSample(stream, head_size=10, tail_size=10)
+        assert sample.size == len(content)
+        assert sample.head == b"a" * 10
+        assert sample.tail == b"c" * 10
+        assert sample.bytes_read == 20
+        assert stream.tell() == 5
+
+    @staticmethod
+    def test_stream_sample_when_stream_is_not_seekable():
+        """Test the stream is read to the end and only the last bytes are
+        kept."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        stream = NonSeekableStream(content, chunk_size=3)
+        sample = StreamSample(stream, head_size=10, tail_size=10)
+        assert sample.head == b"a" * 10
+        assert sample.tail == b"c" * 10
+        assert sample.size == len(content)
+        assert sample.bytes_read == len(content)
+
+    @staticmethod
+    def test_stream_sample_when_stream_is_smaller_than_head():
+        """Test a small stream that can not be seeked is kept whole."""
+        stream = NonSeekableStream(b"0123", chunk_size=3)
+        sample = StreamSample(stream, head_size=10, tail_size=10)
+        assert sample.content == b"0123"
+        assert sample.size == 4
+
+
+class TestContentDigest:
+    """Tests for content_digest method."""
+
+    @staticmethod
+    def test_content_digest_is_the_same_for_every_source():
+        """Test the digest of a path, bytes and streams are the same."""
+        with open(PNG_FILE, "rb") as file:
+            content = file.read()
+        expected_digest = hashlib.sha256(content).hexdigest()
+        samples = [
+            FileSample(PNG_FILE),
+            BytesSample(content),
+            StreamSample(io.BytesIO(content)),
+            StreamSample(NonSeekableStream(content, chunk_size=100)),
+        ]
+        for sample in samples:
+            assert sample.content_digest() == expected_digest
+
+
+class TestAccountingReader:
+    """Tests for AccountingReader."""
+
+    @staticmethod
+    def test_reads_and_seeks_are_counted():
+        """Test the bytes read and the seeks are counted."""
+        reader = AccountingReader(io.BytesIO(b"0123456789"))
+        assert reader.read(4) == b"0123"
+        reader.seek(8)
+        assert reader.read() == b"89"
+        assert reader.bytes_read == 6
+        assert reader.seek_count == 1
+
+    @staticmethod
+    def test_read_over_the_budget_is_refused():
+        """Test a read that goes over the budget raises an error."""
+        reader = AccountingReader(io.BytesIO(b"0123456789"), budget=5)
+        assert reader.read(3) == b"012"
+        with pytest.raises(ReadBudgetException):
+            reader.read(3)
+        with pytest.raises(ReadBudgetException):
+            reader.read()
+
+    @staticmethod
+    def test_file_validator_reads_only_the_head_and_the_tail():
+        """Test a large file is read only up to head_size and tail_size, with
+        one seek to the tail."""
+        with open(PNG_FILE, "rb") as file:
+            header = file.read()
+        with NamedTemporaryFile(delete=False, suffix=".png") as file:
+            file.write(header)
+            file.truncate(64 * 1024 * 1024)
+        try:
+            file_validator = FileValidator(
+                file_path=file.name,
+                libraries=[FILETYPE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+                head_size=4096,
+                tail_size=512,
+            )
+            file_validator.run_validation()
+            assert file_validator.sample.bytes_read == 4096 + 512
+            assert file_validator.sample.seek_count == 1
+        finally:
+            os.remove(file.name)
+
+
+class TestMappedSample:
+    """Tests for MappedSample."""
+
+    @staticmethod
+    def test_mapped_sample_has_the_same_head_and_tail():
+        """Test the head and the tail are the same as the head and the tail
+        of FileSample."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        with NamedTemporaryFile(delete=False) as file:
+            file.write(content)
+        try:
+            with MappedSample(file.name, head_size=10, tail_size=10) as sample:
+                assert sample.head == b"a" * 10
+                assert sample.tail == b"c" * 10
+                assert sample.bytes_read == 20
+                assert sample.head.readonly
+                assert isinstance(sample.head.obj, mmap.mmap)
+                assert sample.content_digest() == hashlib.sha256(content).hexdigest()
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def test_view_of_the_end_of_the_file_is_not_copied():
+        """Test a view at the end of a large file is a slice of the map and
+        only the viewed bytes are counted."""
+        with NamedTemporaryFile(delete=False) as file:
+            file.truncate(64 * 1024 * 1024)
+            file.seek(-4, os.SEEK_END)
+            file.write(b"moov")
+        try:
+            with MappedSample(file.name) as sample:
+                view = sample.view(-4)
+                assert view == b"moov"
+                assert isinstance(view.obj, mmap.mmap)
+                view.release()
+                assert sample.bytes_read == 4
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def test_end_of_central_directory_of_zip_is_found():
+        """Test the end of central directory of a zip is found from the end of
+        the file."""
+        with MappedSample(ZIP_FILE) as sample:
+            offset = sample.rfind(b"PK\x05\x06")
+            view = sample.view(offset, 4)
+            assert view == b"PK\x05\x06"
+            view.release()
+
+    @staticmethod
+    def test_mapped_sample_of_empty_file():
+        """Test an empty file, which can not be mapped, has an empty sample
+        and is opened only once."""
+        with NamedTemporaryFile(delete=False) as file:
+            pass
+        try:
+            with MappedSample(file.name) as sample:
+                assert sample.view(0) == b""
+                assert sample.rfind(b"PK") == -1
+                assert sample.content == b""
+                assert sample.open_count == 1
+        finally:
+            os.remove(file.name)
+
+    @staticmethod
+    def test_file_validator_from_mapped_file(png=PNG_FILE):
+        """Test a mapped file is validated like a file on disk."""
+        file_validator = FileValidator.from_mapped_file(
+            png,
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        )
+        assert file_validator.run_validation()[FILETYPE]["status"] == "ok"
+        file_validator.sample.close()
+
+    @staticmethod
+    @pytest.mark.skipif(
+        not os.path.isdir("/proc/self/fd"),
+        reason="the open files are listed in /proc/self/fd",
+    )
+    def test_run_validation_closes_the_map(png=PNG_FILE):
+        """Test the map of the file is closed when the validation ends, so
+        validating many mapped files does not keep their files open."""
+        open_files = len(os.listdir("/proc/self/fd"))
+        for _ in range(10):
+            file_validator = FileValidator.from_mapped_file(
+                png,
+                libraries=[FILETYPE, PURE_MAGIC],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            )
+            file_validator.run_validation()
+        assert len(os.listdir("/proc/self/fd")) == open_files
+
+
+class TestStorageSample:
+    """Tests for StorageSample and FileValidator.from_storage."""
+
+    @staticmethod
+    def test_file_system_storage_is_read_from_its_path(png=PNG_FILE):
+        """Test a file of the local disk is read from its path, without a
+        tail if the libraries only read the head."""
+        storage = FileSystemStorage(location=os.path.dirname(png))
+        file_validator = FileValidator.from_storage(
+            storage,
+            os.path.basename(png),
+            libraries=[FILETYPE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        )
+        assert file_validator.run_validation()[FILETYPE]["status"] == "ok"
+        assert file_validator.tail_size == 0
+
+    @staticmethod
+    def test_only_the_head_and_the_tail_are_fetched(png=PNG_FILE):
+        """Test a storage with ranged reads is asked only for the head and the
+        tail of a large file."""
+        with open(png, "rb") as file:
+            content = file.read().ljust(8 * 1024 * 1024, b"\0")
+        storage = InMemoryStorage({"media/large.png": content})
+        file_validator = FileValidator.from_storage(
+            storage,
+            "media/large.png",
+            libraries=[FILETYPE, PURE_MAGIC],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+            head_size=4096,
+            tail_size=512,
+        )
+        file_validator.run_validation()
+        assert storage.ranges == [(0, 4096), (len(content) - 512, 512)]
+        assert file_validator.sample.bytes_read == 4096 + 512
+        assert file_validator.file_path == "media/large.png"
+
+    @staticmethod
+    def test_storage_without_ranged_reads_is_streamed():
+        """Test the file of a storage without ranged reads is opened with the
+        storage and read as a stream."""
+        content = b"a" * 10 + b"b" * 100 + b"c" * 10
+        storage = InMemoryStorage({"file.bin": content}, ranged=False)
+        sample = StorageSample(storage, "file.bin", head_size=10, tail_size=10)
+        assert sample.head == b"a" * 10
+        assert sample.tail == b"c" * 10
+        assert sample.open_count == 1
+        assert sample.content_digest() == hashlib.sha256(content).hexdigest()
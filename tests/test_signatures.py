@@ -0,0 +1,170 @@
+"""Tests for signatures.py."""
+import pytest
+
+from file_validator.constants import NATIVE, OK
+from file_validator.exceptions import FileValidationException
+from file_validator.signatures import (
+    get_signature_trie,
+    register_signature,
+    Signature,
+    SignatureTrie,
+)
+from file_validator.utils import set_the_library
+from file_validator.validators import FileValidator
+
+from tests.fixtures import (
+    BAD_FILE,
+    JPEG_FILE,
+    JPEG_OBJECT,
+    MIME,
+    MP3_FILE,
+    MP3_OBJECT,
+    MP4_FILE,
+    MP4_OBJECT,
+    PNG_FILE,
+    PNG_OBJECT,
+    TTF_FILE,
+    TTF_OBJECT,
+    ZIP_FILE,
+    ZIP_OBJECT,
+)
+
+
+def read_header(file_path) -> bytes:
+    """Returns the first bytes of a test file."""
+    with open(file_path, "rb") as file:
+        return file.read(4096)
+
+
+class TestSignatureTrie:
+    """Tests for SignatureTrie."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "file_path, file_object",
+        [
+            (PNG_FILE, PNG_OBJECT),
+            (JPEG_FILE, JPEG_OBJECT),
+            (MP3_FILE, MP3_OBJECT),
+            (MP4_FILE, MP4_OBJECT),
+            (ZIP_FILE, ZIP_OBJECT),
+            (TTF_FILE, TTF_OBJECT),
+        ],
+    )
+    def test_match_the_test_files(file_path, file_object):
+        """Test the built-in signatures find the mime of the test files."""
+        assert SignatureTrie().match(read_header(file_path)).mime == file_object[MIME]
+
+    @staticmethod
+    def test_match_returns_none_for_unknown_file():
+        """Test None is returned when no signature matches."""
+        assert SignatureTrie().match(read_header(BAD_FILE)) is None
+        assert SignatureTrie().match(b"") is None
+
+    @staticmethod
+    def test_match_checks_the_extra_parts():
+        """Test signatures with the same first part are told apart by their
+        other parts."""
+        signature_trie = SignatureTrie()
+        assert signature_trie.match(b"RIFF\x00\x00\x00\x00WEBPVP8 ").mime == (
+            "image/webp"
+        )
+        assert signature_trie.match(b"RIFF\x00\x00\x00\x00WAVEfmt ").mime == (
+            "audio/x-wav"
+        )
+        assert signature_trie.match(b"RIFF\x00\x00\x00\x00NONE") is None
+
+    @staticmethod
+    def test_match_signature_at_offset():
+        """Test a signature that does not start at the first byte."""
+        header = bytes(257) + b"ustar\x0000"
+        assert SignatureTrie().match(header).mime == "application/x-tar"
+
+    @staticmethod
+    def test_the_longest_signature_wins():
+        """Test the signature with more known bytes is chosen."""
+        signature_trie = SignatureTrie(
+            [
+                Signature("application/x-short", ".a", "application", b"AB"),
+                Signature("application/x-long", ".b", "application", b"ABCD"),
+            ],
+        )
+        assert signature_trie.match(b"ABCDEF").mime == "application/x-long"
+        assert signature_trie.match(b"ABCX").mime == "application/x-short"
+
+    @staticmethod
+    def test_signature_added_during_match():
+        """Test a signature at a new offset that is added while a header is
+        matched does not break the match."""
+        signature_trie = SignatureTrie(
+            [
+                Signature("application/x-first", ".a", "application", b"AB"),
+                Signature("application/x-second", ".b", "application", b"CD", offset=2),
+            ],
+        )
+
+        class Header(bytes):
+            """A header that adds a signature when it is read."""
+
+            def __getitem__(self, key):
+                signature_trie.add(
+                    Signature(
+                        "application/x-added",
+                        ".c",
+                        "application",
+                        b"EF",
+                        offset=4,
+                    ),
+                )
+                return super().__getitem__(key)
+
+        assert signature_trie.match(Header(b"ABCD")).mime == "application/x-first"
+
+    @staticmethod
+    def test_register_signature():
+        """Test a registered signature is used by the native library."""
+        signature = register_signature(
+            "application/x-file-validator-test",
+            b"FVTEST\x00",
+            extension=".fvt",
+        )
+        assert signature.file_type == "application"
+        assert get_signature_trie().match(b"FVTEST\x00data") is signature
+
+
+class TestFileValidatorByNative:
+    """Tests for the native method of FileValidator."""
+
+    @staticmethod
+    def test_native_when_file_is_valid():
+        """Test the native library accepts a valid file."""
+        file_validator = FileValidator(
+            file_path=PNG_FILE,
+            libraries=[NATIVE],
+            acceptable_mimes=[PNG_OBJECT[MIME]],
+        )
+        result_of_validation = file_validator.run_validation()
+        assert result_of_validation[NATIVE]["status"] == OK
+        assert result_of_validation[NATIVE]["file_mime"] == PNG_OBJECT[MIME]
+
+    @staticmethod
+    def test_native_when_file_is_not_valid():
+        """Test the native library rejects a file with another mime and a file
+        that has no signature."""
+        with pytest.raises(FileValidationException):
+            FileValidator(
+                file_path=PNG_FILE,
+                libraries=[NATIVE],
+                acceptable_mimes=[JPEG_OBJECT[MIME]],
+            ).run_validation()
+        with pytest.raises(FileValidationException):
+            FileValidator(
+                file_path=BAD_FILE,
+                libraries=[NATIVE],
+                acceptable_mimes=[PNG_OBJECT[MIME]],
+            ).run_validation()
+
+    @staticmethod
+    def test_native_is_a_supported_library():
+        """Test native can be selected like the other libraries."""
+        assert set_the_library([NATIVE]) == [NATIVE]
@@ -0,0 +1,181 @@
+"""Tests for ValidatedFileUploadHandler."""
+import io
+import os
+import zipfile
+
+import pytest
+from django.core.files.uploadhandler import MemoryFileUploadHandler, StopUpload
+from django.http.multipartparser import MultiPartParser
+from django.test.client import BOUNDARY, encode_multipart, MULTIPART_CONTENT
+
+from file_validator.constants import (
+    ALL,
+    FILETYPE,
+    MIMETYPES,
+    NATIVE,
+    PURE_MAGIC,
+    SAMPLE_HEAD_SIZE,
+)
+from file_validator.handlers import (
+    get_header_only_libraries,
+    ValidatedFileUploadHandler,
+)
+from file_validator.models import ValidatedFileField
+
+from tests.fixtures import JPEG_FILE, JPEG_OBJECT, MIME, NAME, PNG_FILE, PNG_OBJECT
+from tests.project.app.models import (
+    ModelWithDjangoFileValidator,
+    ModelWithValidatedFileField,
+)
+
+FIELD_NAME: str = "test_file"
+DOCX_MIME: str = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+
+
+def upload(handler, file_name, file_mime_type, content):
+    """Sends the content to the handler chunk by chunk like django does."""
+    handler.new_file(FIELD_NAME, file_name, file_mime_type, None)
+    for start in range(0, len(content), handler.chunk_size):
+        handler.receive_data_chunk(content[start : start + handler.chunk_size], start)
+    handler.file_complete(len(content))
+
+
+def read_file(file_path) -> bytes:
+    """Returns the content of the test file."""
+    with open(file_path, "rb") as file:
+        return file.read()
+
+
+def get_docx(size: int) -> bytes:
+    """Returns a docx of at least size bytes."""
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w", zipfile.ZIP_STORED) as docx:
+        docx.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0"?><Types xmlns="http://schemas.openxmlformats.org/'
+            'package/2006/content-types"><Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.'
+            'wordprocessingml.document.main+xml"/></Types>',
+        )
+        docx.writestr("_rels/.rels", "<Relationships/>")
+        docx.writestr("word/document.xml", "<w:document/>")
+        docx.writestr("word/media/image1.bin", os.urandom(size))
+    return content.getvalue()
+
+
+class TestValidatedFileUploadHandler:
+    """Test ValidatedFileUploadHandler."""
+
+    @staticmethod
+    def test_upload_handler_for_model_finds_the_fields():
+        """Test the handler takes the validation settings from the model."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        assert FIELD_NAME in handler.fields
+        handler = ValidatedFileUploadHandler.for_model(ModelWithDjangoFileValidator)
+        assert FIELD_NAME in handler.fields
+
+    @staticmethod
+    def test_upload_handler_when_file_is_valid():
+        """Test a valid file passes through the handler."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        upload(handler, PNG_OBJECT[NAME], PNG_OBJECT[MIME], read_file(PNG_FILE))
+        assert not handler.errors
+
+    @staticmethod
+    def test_upload_handler_when_small_file_is_not_valid():
+        """Test a small file that is not valid is rejected when it is
+        complete."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        with pytest.raises(StopUpload):
+            upload(handler, JPEG_OBJECT[NAME], JPEG_OBJECT[MIME], read_file(JPEG_FILE))
+        assert FIELD_NAME in handler.errors
+
+    @staticmethod
+    def test_upload_handler_stops_on_the_first_chunk_when_file_is_not_valid():
+        """Test a large disguised file is rejected on its first chunk."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        content = read_file(JPEG_FILE).ljust(SAMPLE_HEAD_SIZE * 4, b"\0")
+        handler.new_file(FIELD_NAME, PNG_OBJECT[NAME], PNG_OBJECT[MIME], None)
+        with pytest.raises(StopUpload):
+            handler.receive_data_chunk(content[:SAMPLE_HEAD_SIZE], 0)
+
+    @staticmethod
+    def test_upload_handler_when_large_docx_is_valid():
+        """Test a valid docx that is larger than the head is not stopped by
+        the libraries of all that only read the head."""
+        handler = ValidatedFileUploadHandler(
+            fields={
+                FIELD_NAME: ValidatedFileField(
+                    libraries=[ALL],
+                    acceptable_mimes=[DOCX_MIME],
+                ),
+            },
+        )
+        content = get_docx(SAMPLE_HEAD_SIZE * 4)
+        upload(handler, "test.docx", DOCX_MIME, content)
+        assert not handler.errors
+
+    @staticmethod
+    def test_upload_handler_stops_when_file_is_larger_than_max_size():
+        """Test the upload stops as soon as the bytes received are more than
+        max upload file size."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        content = read_file(PNG_FILE).ljust(2000000, b"\0")
+        received = []
+        handler.new_file(FIELD_NAME, PNG_OBJECT[NAME], PNG_OBJECT[MIME], None)
+        with pytest.raises(StopUpload):
+            for start in range(0, len(content), handler.chunk_size):
+                chunk = content[start : start + handler.chunk_size]
+                received.append(handler.receive_data_chunk(chunk, start))
+        assert sum(len(chunk) for chunk in received) <= 1000000
+
+    @staticmethod
+    def test_upload_handler_ignores_other_fields():
+        """Test the files of fields that are not configured are not
+        validated."""
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        handler.new_file("other_file", JPEG_OBJECT[NAME], JPEG_OBJECT[MIME], None)
+        assert handler.receive_data_chunk(b"data", 0) == b"data"
+        handler.file_complete(4)
+
+    @staticmethod
+    def test_upload_handler_with_multipart_parser():
+        """Test django does not keep a file that the handler rejects."""
+        body = encode_multipart(
+            BOUNDARY,
+            {
+                FIELD_NAME: io.BytesIO(read_file(JPEG_FILE)),
+            },
+        ).replace(b'filename=""', b'filename="test.png"')
+        handler = ValidatedFileUploadHandler.for_model(ModelWithValidatedFileField)
+        parser = MultiPartParser(
+            {
+                "CONTENT_TYPE": MULTIPART_CONTENT,
+                "CONTENT_LENGTH": len(body),
+            },
+            io.BytesIO(body),
+            [handler, MemoryFileUploadHandler()],
+        )
+        _post, files = parser.parse()
+        assert FIELD_NAME not in files
+        assert FIELD_NAME in handler.errors
+
+
+class TestGetHeaderOnlyLibraries:
+    """Tests for get_header_only_libraries function."""
+
+    @staticmethod
+    def test_get_header_only_libraries_skips_pure_magic():
+        """Test pure_magic waits for the whole file."""
+        assert get_header_only_libraries([PURE_MAGIC, FILETYPE, MIMETYPES]) == [
+            FILETYPE,
+            MIMETYPES,
+        ]
+
+    @staticmethod
+    def test_get_header_only_libraries_of_all_skips_native():
+        """Test all only expands to the libraries that all runs."""
+        assert NATIVE not in get_header_only_libraries([ALL])
+        assert get_header_only_libraries([NATIVE]) == [NATIVE]
@@ -9,6 +9,7 @@ from file_validator.exceptions import (
 )
 from file_validator.utils import (
     all_mimes_is_equal,
+    classify_the_type,
     generate_information_about_file,
     guess_the_type,
     is_type_supported,
@@ -72,6 +73,30 @@ class TestGuessTheType:
         assert file_type is FONT
 
 
+class TestClassifyTheType:
+    """Tests for classify_the_type function."""
+
+    @staticmethod
+    def test_classify_the_type_returns_the_type_and_the_mime():
+        """Test the type and the mime are returned together."""
+        with open(PNG_FILE, "rb") as file:
+            header = file.read()
+        assert classify_the_type(header) == (IMAGE, PNG_OBJECT[MIME])
+
+    @staticmethod
+    def test_classify_the_type_uses_filetype_when_no_signature_matches():
+        """Test a file that is not in the signatures of the native engine is
+        classified by the matchers of filetype."""
+        header = b"II\xbc\x01" + bytes(32)
+        assert classify_the_type(header) == (IMAGE, "image/vnd.ms-photo")
+
+    @staticmethod
+    def test_classify_the_type_when_file_is_unknown():
+        """Test None is returned for the type and the mime of an unknown
+        file."""
+        assert classify_the_type(b"unknown content") == (None, None)
+
+
 class TestAllMimesIsEqual:
     """Tests for all_mimes_is_equal function."""
 
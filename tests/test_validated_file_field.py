@@ -14,6 +14,7 @@ from file_validator.models import ValidatedFileField
 
 from tests.fixtures import (
     BAD_OBJECT,
+    get_in_memory_file,
     get_tmp_file,
     JPEG_FILE,
     JPEG_OBJECT,
@@ -299,3 +300,35 @@ class TestValidatedFileFieldForm:
         """Test css class attribute in form."""
         form = FormWithCssClassAttribute()
         assert form.fields["test_file"].custom_css_class == "test-class"
+
+
+class TestValidatedFileFieldInMemory:
+    """Test ValidatedFileField with files that are kept in memory."""
+
+    @staticmethod
+    def test_validated_file_field_when_in_memory_file_is_valid():
+        """Test an in memory upload is validated without a temporary file."""
+        new_instance = ModelWithValidatedFileField(
+            test_file=get_in_memory_file(
+                file_name=PNG_OBJECT[NAME],
+                file_path=PNG_FILE,
+                file_mime_type=PNG_OBJECT[MIME],
+            ),
+        )
+
+        new_instance.full_clean()
+
+    @staticmethod
+    def test_validated_file_field_when_in_memory_file_is_not_valid():
+        """Test an in memory upload that is not valid raises validation
+        error."""
+        new_instance = ModelWithValidatedFileField(
+            test_file=get_in_memory_file(
+                file_name=JPEG_OBJECT[NAME],
+                file_path=JPEG_FILE,
+                file_mime_type=JPEG_OBJECT[MIME],
+            ),
+        )
+
+        with pytest.raises(ValidationError):
+            new_instance.full_clean()